@@ -0,0 +1,59 @@
+"""Benchmark absorption models specialized to a fixed photon energy grid.
+
+Compare the evaluation of absorbed models with the photon cross-sections
+interpolated in every call, and with the cross-sections precomputed on the
+fixed energy grid by :meth:`CompiledModel.at_egrid`, which is used in the
+likelihood. Run with ``python benchmarks/bench_absorption_egrid.py``.
+"""
+
+from __future__ import annotations
+
+import timeit
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from elisa.models import CutoffPL, PhAbs, TBAbs
+
+jax.config.update('jax_enable_x64', True)
+
+
+def timing(fn, x, number: int = 500) -> float:
+    fn(x).block_until_ready()
+    return timeit.timeit(lambda: fn(x).block_until_ready(), number=number)
+
+
+def main():
+    cases = [
+        ('PhAbs*CutoffPL', lambda m: PhAbs(method=m) * CutoffPL()),
+        (
+            'PhAbs*TBAbs*CutoffPL',
+            lambda m: PhAbs(method=m) * TBAbs(method=m) * CutoffPL(),
+        ),
+    ]
+    for nbins in (1000, 4000):
+        egrid = np.geomspace(0.3, 10.0, nbins + 1)
+        for name, make_model in cases:
+            for method in ('trapz', 'simpson'):
+                model = make_model(method).compile()
+                fixed = model.at_egrid(egrid)
+                params = jnp.full(len(model.params_name), 1.0)
+                print(f'{name} ({method}), {nbins} bins')
+                ref = model.eval(egrid, params)
+                for label, m in [('interp', model), ('at_egrid', fixed)]:
+                    fwd = jax.jit(lambda p, m=m, e=egrid: m.eval(e, p))
+                    grad = jax.jit(
+                        jax.grad(lambda p, m=m, e=egrid: jnp.sum(m.eval(e, p)))
+                    )
+                    assert np.allclose(fwd(params), ref, rtol=1e-12)
+                    t_fwd = timing(fwd, params) / 500 * 1e6
+                    t_grad = timing(grad, params) / 500 * 1e6
+                    print(
+                        f'    {label:>8}: forward {t_fwd:8.1f} us, '
+                        f'grad {t_grad:8.1f} us'
+                    )
+
+
+if __name__ == '__main__':
+    main()
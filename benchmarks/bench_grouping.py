@@ -0,0 +1,65 @@
+"""Benchmark the optimal grouping methods over the number of channels.
+
+Time :func:`group_opt`, :func:`group_optsig_normal`,
+:func:`group_optsig_lima` and :func:`group_optsig_gv` on simulated spectra
+of 256 to 32768 channels, with a constant FWHM of a few channels. Run with
+``python benchmarks/bench_grouping.py``.
+"""
+
+from __future__ import annotations
+
+import timeit
+from functools import partial
+
+import numpy as np
+
+from elisa.data.grouping import (
+    _group_scale_data,
+    group_opt,
+    group_optsig_gv,
+    group_optsig_lima,
+    group_optsig_normal,
+)
+
+
+def timing(fn, number: int = 3) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=number))
+
+
+def main():
+    rng = np.random.default_rng(42)
+    print(f'{"nchan":>6} {"opt":>9} {"optmin":>9} {"optsig":>9} ', end='')
+    print(f'{"lima":>9} {"gv":>9}')
+    for nchan in 2 ** np.arange(8, 16):
+        fwhm = np.full(nchan, 4.0)
+        spec = rng.poisson(2.0, nchan).astype(float)
+        back = rng.poisson(2.0, nchan).astype(float)
+        net = spec - 0.5 * back
+        error = np.sqrt(spec + 0.25 * back)
+        back_error = np.sqrt(back) + 0.1
+        ones = np.ones(nchan)
+        scale = _group_scale_data(ones, ones, ones.astype(int), net=False)
+        kwargs = {
+            'spec_exposure': 1.0,
+            'back_exposure': 2.0,
+            'spec_area': scale,
+            'spec_back': scale,
+            'back_area': scale,
+            'back_back': scale,
+            'sig': 3.0,
+        }
+        cases = [
+            partial(group_opt, fwhm, net),
+            partial(group_opt, fwhm, net, spec, 20),
+            partial(group_optsig_normal, fwhm, net, net, error, 3.0),
+            partial(group_optsig_lima, fwhm, net, spec, back, **kwargs),
+            partial(
+                group_optsig_gv, fwhm, net, spec, back, back_error, **kwargs
+            ),
+        ]
+        times = [timing(fn) * 1e3 for fn in cases]
+        print(f'{nchan:>6} ' + ' '.join(f'{t:7.2f}ms' for t in times))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark the import time of elisa with lazy cross-section tables.
+
+The photon cross-section tables used by :class:`~elisa.models.mul.PhAbs`,
+:class:`~elisa.models.mul.TBAbs` and :class:`~elisa.models.mul.WAbs` are
+read on first use of each combination of cross-section and abundance table,
+instead of being read when importing :mod:`elisa.models.mul`. This script
+compares the import time of elisa with the cost of the previous eager
+loading of all tables, and the cost of loading one table on first use.
+Run with ``python benchmarks/bench_import_xsect.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import statistics
+import subprocess
+import sys
+
+IMPORT_SCRIPT = """
+import json, time
+t0 = time.perf_counter()
+import elisa
+t1 = time.perf_counter()
+print(json.dumps({'import': t1 - t0}))
+"""
+
+TABLE_SCRIPT = """
+import json, time
+from elisa.models import mul
+t0 = time.perf_counter()
+import h5py
+with h5py.File(mul._XSECT_FILE) as f:
+    interp = {
+        mabs: {
+            xsect: {
+                abund: mul._make_interp(
+                    f['energy'][:], f[f'{mabs}/{xsect}/{abund}'][:]
+                )
+                for abund in f[f'{mabs}/{xsect}'].keys()
+            }
+            for xsect in f[mabs].keys()
+        }
+        for mabs in [k for k in f.keys() if k != 'energy']
+    }
+t1 = time.perf_counter()
+mul._xsect_interp('phabs', 'vern', 'angr')
+t2 = time.perf_counter()
+print(json.dumps({'eager': t1 - t0, 'lazy': t2 - t1}))
+"""
+
+
+def run(script: str) -> dict[str, float]:
+    out = subprocess.run(
+        [sys.executable, '-c', script],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def main(repeat: int = 5):
+    imports = [run(IMPORT_SCRIPT)['import'] for _ in range(repeat)]
+    tables = [run(TABLE_SCRIPT) for _ in range(repeat)]
+    eager = statistics.median(i['eager'] for i in tables)
+    lazy = statistics.median(i['lazy'] for i in tables)
+    t_import = statistics.median(imports)
+    print(f'import elisa with lazy tables:  {t_import:.3f} s')
+    print(f'import elisa with eager tables: {t_import + eager:.3f} s')
+    print(f'eager loading of all tables:    {eager * 1e3:.1f} ms')
+    print(f'lazy loading of one table:      {lazy * 1e3:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark Minuit fit with the exact Hessian from JAX.
+
+Compare the wall time of Migrad with strategy 2 followed by Hesse, when
+Minuit is given only the gradient of deviance and computes the Hessian by
+finite differences of gradient, and when Minuit is also given the exact
+Hessian of deviance computed by JAX. The model is a power law plus several
+Gaussian lines, with 11 to 23 free parameters. Run with
+``python benchmarks/bench_minuit_hessian.py``.
+"""
+
+from __future__ import annotations
+
+import time
+
+import jax
+import numpy as np
+from iminuit import Minuit
+
+from elisa import MaxLikeFit
+from elisa.infer.helper import get_minuit
+from elisa.models import Gauss, PowerLaw
+from elisa.models.parameter import UniformParameter
+
+jax.config.update('jax_enable_x64', True)
+
+
+def make_fit(nlines: int) -> MaxLikeFit:
+    egrid = np.geomspace(1.0, 10.0, 1025)
+    emid = 0.5 * (egrid[:-1] + egrid[1:])
+    sigma = 0.02 * emid[:, None]
+    resp = np.exp(-0.5 * ((emid[None, :] - emid[:, None]) / sigma) ** 2)
+    resp /= resp.sum(axis=1, keepdims=True)
+
+    lines = np.linspace(2.0, 8.0, nlines)
+    model = PowerLaw()
+    for el in lines:
+        model += Gauss(
+            El=UniformParameter('El', el, el - 0.5, el + 0.5),
+            sigma=UniformParameter('sigma', 0.1, 0.01, 0.5),
+            K=UniformParameter('K', 0.5, 1e-3, 10.0, log=True),
+        )
+    params = [1.5, 10.0] + [p for el in lines for p in (el, 0.1, 0.5)]
+    data = model.compile().simulate(
+        photon_egrid=egrid,
+        channel_emin=egrid[:-1],
+        channel_emax=egrid[1:],
+        response_matrix=resp,
+        spec_exposure=100.0,
+        params=params,
+        spec_poisson=True,
+        seed=42,
+    )
+    return MaxLikeFit(data, model)
+
+
+def run_minuit(fit: MaxLikeFit, use_hessian: bool) -> tuple[float, Minuit]:
+    helper = fit._helper
+    init = np.array(helper.free_default['unconstr_arr'])
+    t0 = time.perf_counter()
+    if use_hessian:
+        minuit = get_minuit(helper, init)
+    else:
+        deviance, grad, _ = helper.deviance_fns
+        minuit = Minuit(
+            deviance, init, grad=grad, name=helper.params_names['free']
+        )
+    minuit.strategy = 2
+    minuit.migrad(iterate=10)
+    minuit.hesse()
+    return time.perf_counter() - t0, minuit
+
+
+def main():
+    for nlines in (3, 5, 7):
+        fit = make_fit(nlines)
+        # compile deviance, gradient and Hessian
+        fit.mle()
+        print(f'{fit._helper.nparam} free parameters')
+        hess = fit._helper.deviance_fns[2]
+        for label, use_hessian in [('gradient', False), ('hessian', True)]:
+            t, m = min(
+                (run_minuit(fit, use_hessian) for _ in range(3)),
+                key=lambda x: x[0],
+            )
+            print(
+                f'    {label:>8}: {t:6.2f} s, nfcn {m.nfcn:5d}, '
+                f'ngrad {m.ngrad:4d}, nhessian {m.nhessian:2d}, '
+                f'fval {m.fval:.6f}'
+            )
+            # compare with errors from the exact Hessian at the minimum
+            x = np.array(m.values)
+            exact = np.sqrt(np.diag(2.0 * np.linalg.inv(hess(x))))
+            err = np.max(np.abs(np.array(m.errors) / exact - 1.0))
+            print(f'{"":14}max rel. error of parameter errors {err:.1e}')
+
+
+if __name__ == '__main__':
+    main()
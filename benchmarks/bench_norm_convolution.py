@@ -0,0 +1,58 @@
+"""Benchmark flux normalization computed from the photon energy grid of data.
+
+Compare the accuracy and speed of :class:`PhFlux` and :class:`EnFlux`
+calculating the flux over the auxiliary energy grid of 1000 points, and over
+the photon energy grid of data with sub-bins at the band edges. The reference
+flux is calculated over an auxiliary grid of 10⁶ points. Run with
+``python benchmarks/bench_norm_convolution.py``.
+"""
+
+from __future__ import annotations
+
+import timeit
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from elisa.models import CutoffPL, EnFlux, PhAbs, PhFlux, PowerLaw
+
+jax.config.update('jax_enable_x64', True)
+
+
+def timing(fn, x, number: int = 500) -> float:
+    fn(x).block_until_ready()
+    return timeit.timeit(lambda: fn(x).block_until_ready(), number=number)
+
+
+def main():
+    emin = 1.0
+    emax = 10.0
+    models = {
+        'PowerLaw': PowerLaw,
+        'CutoffPL': CutoffPL,
+        'PhAbs*CutoffPL': lambda: PhAbs() * CutoffPL(),
+    }
+    for nbins in (100, 1000, 4000):
+        egrid = np.geomspace(0.5, 20.0, nbins + 1)
+        print(f'{nbins} bins in [0.5, 20] keV, band [{emin}, {emax}] keV')
+        for norm in (PhFlux, EnFlux):
+            for name, model in models.items():
+                ref = norm(emin, emax, ngrid=1000000)(model()).compile()
+                ref = ref.eval(egrid)
+                print(f'    {norm.__name__}({name})')
+                for label, reuse in [('aux grid', False), ('egrid', True)]:
+                    conv = norm(emin, emax, reuse_egrid=reuse)(model())
+                    compiled = conv.compile().at_egrid(egrid)
+                    params = jnp.full(len(compiled.params_name), 1.0)
+                    fwd = jax.jit(lambda p, m=compiled, e=egrid: m.eval(e, p))
+                    err = np.max(np.abs(compiled.eval(egrid) / ref - 1.0))
+                    t_fwd = timing(fwd, params) / 500 * 1e6
+                    print(
+                        f'        {label:>8}: max rel. error {err:.1e}, '
+                        f'forward {t_fwd:7.1f} us'
+                    )
+
+
+if __name__ == '__main__':
+    main()
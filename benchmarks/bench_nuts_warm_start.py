@@ -0,0 +1,91 @@
+"""Benchmark NUTS warm-started from the MLE.
+
+Compare the effective samples per second of NUTS with the default setup,
+where the chains start from the parameter defaults and the step size and
+mass matrix are adapted during 2000 warmup steps, and with ``warm_start``,
+where the chains start around the MLE, the inverse mass matrix is seeded
+with the covariance matrix of the MLE, and the step size and mass matrix,
+or only the step size, are adapted during 200 warmup steps. The model is a
+power law plus several Gaussian lines, with 2 to 8 free parameters. The
+wall time is the best of two runs, and includes the MLE search and the
+compilation of the sampler. Run with
+``python benchmarks/bench_nuts_warm_start.py``.
+"""
+
+from __future__ import annotations
+
+import time
+
+import jax
+import numpy as np
+
+from elisa import BayesFit
+from elisa.models import Gauss, PowerLaw
+from elisa.models.parameter import UniformParameter
+
+jax.config.update('jax_enable_x64', True)
+
+
+def make_fit(nlines: int) -> BayesFit:
+    egrid = np.geomspace(1.0, 10.0, 257)
+    emid = 0.5 * (egrid[:-1] + egrid[1:])
+    sigma = 0.02 * emid[:, None]
+    resp = np.exp(-0.5 * ((emid[None, :] - emid[:, None]) / sigma) ** 2)
+    resp /= resp.sum(axis=1, keepdims=True)
+
+    lines = np.linspace(2.0, 8.0, nlines)
+    model = PowerLaw()
+    for el in lines:
+        model += Gauss(
+            El=UniformParameter('El', el, el - 0.5, el + 0.5),
+            sigma=UniformParameter('sigma', 0.1, 0.01, 0.5),
+            K=UniformParameter('K', 0.5, 1e-3, 10.0, log=True),
+        )
+    params = [1.5, 10.0] + [p for el in lines for p in (el, 0.1, 0.5)]
+    data = model.compile().simulate(
+        photon_egrid=egrid,
+        channel_emin=egrid[:-1],
+        channel_emax=egrid[1:],
+        response_matrix=resp,
+        spec_exposure=100.0,
+        params=params,
+        spec_poisson=True,
+        seed=42,
+    )
+    return BayesFit(data, model)
+
+
+def run_nuts(fit: BayesFit, **kwargs) -> tuple[float, float, int]:
+    t0 = time.perf_counter()
+    result = fit.nuts(steps=2000, progress=False, **kwargs)
+    t = time.perf_counter() - t0
+    ess = min(result.ess.values())
+    n_steps = int(result.idata['sample_stats']['n_steps'].values.sum())
+    return t, ess, n_steps
+
+
+def main():
+    setups = [
+        ('default', {'warmup': 2000}),
+        ('warm start', {'warmup': 200, 'warm_start': True}),
+        (
+            'step size',
+            {'warmup': 200, 'warm_start': True, 'adapt_mass_matrix': False},
+        ),
+    ]
+    for nlines in (0, 1, 2):
+        fit = make_fit(nlines)
+        print(f'{fit._helper.nparam} free parameters')
+        for label, kwargs in setups:
+            t, ess, n_steps = min(
+                (run_nuts(fit, **kwargs) for _ in range(2)),
+                key=lambda x: x[0],
+            )
+            print(
+                f'    {label:>10}: {t:6.2f} s, min ESS {ess:6d}, '
+                f'{ess / t:7.1f} ESS/s, {n_steps:8d} leapfrog steps'
+            )
+
+
+if __name__ == '__main__':
+    main()
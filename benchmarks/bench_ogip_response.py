@@ -0,0 +1,89 @@
+"""Benchmark the expansion of compressed OGIP response matrix.
+
+Compare the vectorized expansion used by :class:`elisa.data.ogip.Response`
+with the previous row-by-row loop, for a banded response with multiple
+channel groups per row. Run with ``python benchmarks/bench_ogip_response.py``.
+"""
+
+from __future__ import annotations
+
+import functools
+import timeit
+
+import numpy as np
+from scipy.sparse import coo_array
+
+from elisa.data.ogip import _expand_response_matrix
+from elisa.util.misc import to_native_byteorder
+
+
+def expand_loop(n_grp, f_chan, n_chan, matrix, first_chan):
+    """The previous row-by-row expansion."""
+    f_chan = f_chan - first_chan
+    rows = []
+    cols = []
+    reduced_matrix = []
+    for i in range(len(n_grp)):
+        n = int(n_grp[i])
+        if n <= 0:
+            continue
+        f = np.asarray(np.atleast_1d(f_chan[i]), dtype=int).ravel()[:n]
+        widths = np.asarray(np.atleast_1d(n_chan[i]), dtype=int).ravel()[:n]
+        n_elem = int(widths.sum())
+        if n_elem <= 0:
+            continue
+        values = np.asarray(np.atleast_1d(matrix[i])).ravel()[:n_elem]
+        rows.append(np.full(n_elem, i, dtype=int))
+        cols.extend(
+            np.arange(start, start + width)
+            for start, width in zip(f, widths, strict=True)
+        )
+        reduced_matrix.append(values)
+    return np.hstack(rows), np.hstack(cols), np.hstack(reduced_matrix)
+
+
+def make_response(nrows: int, nchan: int, band: int, seed: int = 42):
+    """Make a banded response with two channel groups per row."""
+    rng = np.random.default_rng(seed)
+    center = np.linspace(0, nchan - 1, nrows).astype(np.int64)
+    lo = np.clip(center - band // 2, 0, nchan - 2)
+    gap = rng.integers(1, 4, nrows)
+    w1 = np.clip(band // 2, 1, None) * np.ones(nrows, np.int64)
+    w1 = np.minimum(w1, nchan - 1 - lo)
+    f2 = np.minimum(lo + w1 + gap, nchan - 1)
+    w2 = np.minimum(band // 2, nchan - f2)
+    n_grp = np.full(nrows, 2, dtype=np.int16)
+    f_chan = np.column_stack([lo, f2]).astype(np.int16) + 1
+    n_chan = np.column_stack([w1, w2]).astype(np.int16)
+    width = int((w1 + w2).max())
+    matrix = rng.uniform(size=(nrows, width)).astype('>f4')
+    return n_grp, f_chan, n_chan, matrix
+
+
+def main():
+    for nrows, nchan, band in [(2000, 1024, 64), (30000, 4096, 256)]:
+        args = make_response(nrows, nchan, band)
+        shape = (nrows, nchan)
+        r1, c1, v1 = expand_loop(*args, first_chan=1)
+        r2, c2, v2 = _expand_response_matrix(*args, first_chan=1, respfile='')
+        v1 = to_native_byteorder(v1)
+        v2 = to_native_byteorder(v2)
+        m1 = coo_array((v1, (r1, c1)), shape=shape)
+        m2 = coo_array((v2, (r2, c2)), shape=shape)
+        assert (m1 != m2).nnz == 0
+
+        n = 3
+        loop = functools.partial(expand_loop, *args, 1)
+        vectorized = functools.partial(_expand_response_matrix, *args, 1, '')
+        t_loop = timeit.timeit(loop, number=n) / n
+        t_vec = timeit.timeit(vectorized, number=n) / n
+        print(
+            f'{nrows:>6d} x {nchan:<5d} (nnz={m1.nnz:>8d}): '
+            f'loop {t_loop * 1e3:8.2f} ms, '
+            f'vectorized {t_vec * 1e3:8.2f} ms, '
+            f'speedup {t_loop / t_vec:6.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
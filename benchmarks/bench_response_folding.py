@@ -0,0 +1,76 @@
+"""Benchmark folding model through response in different formats.
+
+Compare the dense, BCSR and banded representations of the response matrix
+for the forward matrix-vector product and its gradient, which are evaluated
+in every likelihood evaluation. Run with
+``python benchmarks/bench_response_folding.py``.
+"""
+
+from __future__ import annotations
+
+import timeit
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+from jax.experimental.sparse import BCSR
+from scipy.sparse import csr_array
+
+from elisa.infer.likelihood import _resp_matrix_format
+from elisa.util.banded import BandedMatrix
+
+jax.config.update('jax_enable_x64', True)
+
+
+def make_response(nphoton: int, nchan: int, fwhm: float) -> csr_array:
+    """Make a Gaussian-like banded response with FWHM given in channels."""
+    e = np.linspace(0, nchan, nphoton)[:, None]
+    c = np.arange(nchan)[None, :] + 0.5
+    sigma = fwhm / 2.3548
+    mat = np.exp(-0.5 * ((c - e) / sigma) ** 2)
+    mat[mat < 1e-6] = 0.0
+    return csr_array(mat)
+
+
+def timing(fn, x, number: int = 200) -> float:
+    fn(x).block_until_ready()
+    return timeit.timeit(lambda: fn(x).block_until_ready(), number=number)
+
+
+def main():
+    cases = [
+        ('CCD', 1500, 1024, 30.0),
+        ('CCD (wide)', 4096, 4096, 100.0),
+        ('grating', 4000, 4000, 5.0),
+        ('scintillator', 500, 256, 60.0),
+    ]
+    for name, nphoton, nchan, fwhm in cases:
+        resp = make_response(nphoton, nchan, fwhm)
+        x = jnp.asarray(np.random.default_rng(42).uniform(size=nphoton))
+        matrices = {
+            'dense': jnp.asarray(resp.T.toarray()),
+            'bcsr': BCSR.from_scipy_sparse(resp.T),
+            'banded': BandedMatrix.from_scipy_sparse(resp.T),
+        }
+        ref = matrices['dense'] @ x
+        fill = resp.nnz / np.prod(resp.shape)
+        print(
+            f'{name} {nphoton}x{nchan}, fill {fill:.3f}, '
+            f'band width {matrices["banded"].width}, '
+            f'auto format: {_resp_matrix_format(resp.T)}'
+        )
+        for fmt, m in matrices.items():
+            fwd = jax.jit(lambda x, m=m: m @ x)
+            grad = jax.jit(
+                jax.grad(lambda x, m=m: jnp.sum(jnp.log(m @ x + 1)))
+            )
+            assert np.allclose(fwd(x), ref)
+            t_fwd = timing(fwd, x) / 200 * 1e6
+            t_grad = timing(grad, x) / 200 * 1e6
+            print(
+                f'    {fmt:>6}: forward {t_fwd:9.1f} us, grad {t_grad:9.1f} us'
+            )
+
+
+if __name__ == '__main__':
+    main()
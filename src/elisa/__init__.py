@@ -28,6 +28,7 @@ from .models.parameter import (
 from .util import (
     jax_debug_nans as jax_debug_nans,
     jax_enable_x64,
+    set_compilation_cache as set_compilation_cache,
     set_cpu_cores,
     set_jax_platform as set_jax_platform,
 )
@@ -2,6 +2,11 @@ from .base import (
     ObservationData as ObservationData,
     ResponseData as ResponseData,
     SpectrumData as SpectrumData,
+    group_spectra as group_spectra,
+)
+from .cache import (
+    ResponseCache as ResponseCache,
+    set_response_cache as set_response_cache,
 )
 from .ogip import (
     Data as Data,
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+import copy
 import warnings
 from typing import TYPE_CHECKING, NamedTuple
 
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.sparse import coo_array, csc_array, sparray
+from scipy.sparse import coo_array, csc_array, csr_array, sparray
 
 from elisa.data.grouping import (
     _group_back_ratio,
@@ -28,8 +29,13 @@ from elisa.plot.misc import get_colors
 from elisa.util.misc import to_native_byteorder
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
     NDArray = np.ndarray
 
+# number of grouped responses cached in each ResponseData
+_GROUP_CACHE_SIZE = 8
+
 
 # TODO: support multiple response in a single data object
 class ObservationData:
@@ -299,7 +305,7 @@ class ObservationData:
 
         ch = self.resp_data.channel_type
         prefix = f'{self.name}_{ch}'
-        groups_channel = np.array([f'{prefix}_{i}' for i in channels])
+        groups_channel = np.char.add(f'{prefix}_', channels)
         channel_mask = self._get_channel_mask(channel_emin, channel_emax)
         channel_mask = np.any(channel_mask, axis=0)
         # mask groups with no good channels
@@ -430,6 +436,26 @@ class ObservationData:
         if method != 'opt' and scale is None:
             raise ValueError(f'scale must be given for {method} grouping')
 
+        grouping_fn = self._grouping_fn(method, preserve_data_group)
+        grouping, success = grouping_fn(scale)
+
+        if not success:
+            warnings.warn(
+                f'"{method}" grouping failed in some {self._name} channels',
+                GroupingWarning,
+            )
+
+        self.set_grouping(grouping)
+
+    def _grouping_fn(
+        self, method: str, preserve_data_group: bool
+    ) -> Callable[[float | None], tuple[NDArray, bool]]:
+        """Get the function calculating grouping flags given a scale.
+
+        The channel groups and masks derived from the pre-grouping, the
+        energy range and the response are computed once, so that the
+        returned function can be evaluated for many scales.
+        """
         if method.startswith('opt'):
             if preserve_data_group:
                 raise ValueError(
@@ -509,15 +535,15 @@ class ObservationData:
             counts_opt = channel_masked(counts_opt)
 
         if method == 'const':
-            fn = lambda a: group_const(*a, c=scale)
+            fn = lambda a, scale: group_const(*a, c=scale)
             data = [list(map(len, spec_counts))]
         elif method == 'min':
-            fn = lambda a: group_min(*a, n=scale)
+            fn = lambda a, scale: group_min(*a, n=scale)
             data = [spec_counts]
         elif method == 'sig':
             if self.spec_data.poisson and self.has_back:
                 if self.back_data.poisson:
-                    fn = lambda a: group_sig_lima(
+                    fn = lambda a, scale: group_sig_lima(
                         a[0],
                         a[1],
                         spec_exposure=self.spec_data.exposure,
@@ -537,7 +563,7 @@ class ObservationData:
                         back_back_data,
                     ]
                 else:
-                    fn = lambda a: group_sig_gv(
+                    fn = lambda a, scale: group_sig_gv(
                         a[0],
                         a[1],
                         a[2],
@@ -559,32 +585,32 @@ class ObservationData:
                         back_back_data,
                     ]
             else:
-                fn = lambda a: group_sig_normal(*a, sig=scale)
+                fn = lambda a, scale: group_sig_normal(*a, sig=scale)
                 data = [net_counts, net_errors]
         elif method == 'bmin':
             if not (self.has_back and self.back_data.poisson):
                 raise ValueError(
                     'Poisson background is required for "bmin" method'
                 )
-            fn = lambda a: group_min(*a, n=scale)
+            fn = lambda a, scale: group_min(*a, n=scale)
             data = [back_counts]
         elif method == 'bsig':
             if not self.has_back:
                 raise ValueError(
                     'background data is required for "bsig" method'
                 )
-            fn = lambda a: group_sig_normal(*a, sig=scale)
+            fn = lambda a, scale: group_sig_normal(*a, sig=scale)
             data = [back_counts, back_errors]
         elif method == 'opt':
-            fn = lambda a: group_opt(*a)
+            fn = lambda a, scale: group_opt(*a)
             data = [fwhm, counts_opt]
         elif method == 'optmin':
-            fn = lambda a: group_opt(*a, n=scale)
+            fn = lambda a, scale: group_opt(*a, n=scale)
             data = [fwhm, counts_opt, spec_counts]
         elif method == 'optsig':
             if self.spec_data.poisson and self.has_back:
                 if self.back_data.poisson:
-                    fn = lambda a: group_optsig_lima(
+                    fn = lambda a, scale: group_optsig_lima(
                         a[0],
                         a[1],
                         a[2],
@@ -608,7 +634,7 @@ class ObservationData:
                         back_back_data,
                     ]
                 else:
-                    fn = lambda a: group_optsig_gv(
+                    fn = lambda a, scale: group_optsig_gv(
                         a[0],
                         a[1],
                         a[2],
@@ -634,21 +660,21 @@ class ObservationData:
                         back_back_data,
                     ]
             else:
-                fn = lambda a: group_optsig_normal(*a, sig=scale)
+                fn = lambda a, scale: group_optsig_normal(*a, sig=scale)
                 data = [fwhm, counts_opt, net_counts, net_errors]
         elif method == 'optbmin':
             if not (self.has_back and self.back_data.poisson):
                 raise ValueError(
                     'Poisson background is required for "optbmin" method'
                 )
-            fn = lambda a: group_opt(*a, n=scale)
+            fn = lambda a, scale: group_opt(*a, n=scale)
             data = [fwhm, counts_opt, back_counts]
         elif method == 'optbsig':
             if not self.has_back:
                 raise ValueError(
                     'background data is required for "optbsig" method'
                 )
-            fn = lambda a: group_optsig_normal(*a, sig=scale)
+            fn = lambda a, scale: group_optsig_normal(*a, sig=scale)
             data = [fwhm, counts_opt, back_counts, back_errors]
         else:
             supported = (
@@ -667,31 +693,29 @@ class ObservationData:
                 f'supported grouping method are: {", ".join(supported)}'
             )
 
-        # Group the channel segaments derived from user-specified erange,
-        # e.g., for erange=[(0.1, 10), (20, 30)], there are two segaments.
-        # Here, the number of channel_mask's rows is equal to the number
-        # of the segaments.
-        results = list(map(fn, zip(*data, strict=True)))
-        grouping = np.hstack([r[0] for r in results])
-        success = all(r[1] for r in results)
-
-        if not success:
-            warnings.warn(
-                f'"{method}" grouping failed in some {self._name} channels',
-                GroupingWarning,
-            )
-
         channel_mask_union = channel_mask.any(axis=0)
         channel_mask_no_group = np.repeat(channel_mask_union, n_chan)
         n_chan_per_group = n_chan[channel_mask_union]
         n_chan_all_group = n_chan_per_group.sum()
-        grouping_flag = np.full(n_chan_all_group, -1, dtype=int)
         idx = np.append(0, n_chan_per_group[:-1].cumsum())
-        grouping_flag[idx] = grouping
-        final_grouping = np.full(n_chan.sum(), -1, dtype=int)
-        final_grouping[~channel_mask_no_group] = 1
-        final_grouping[channel_mask_no_group] = grouping_flag
-        self.set_grouping(final_grouping)
+
+        def grouping_fn(scale: float | None) -> tuple[NDArray, bool]:
+            # Group the channel segaments derived from user-specified erange,
+            # e.g., for erange=[(0.1, 10), (20, 30)], there are two segaments.
+            # Here, the number of channel_mask's rows is equal to the number
+            # of the segaments.
+            results = [fn(a, scale) for a in zip(*data, strict=True)]
+            grouping = np.hstack([r[0] for r in results])
+            success = all(r[1] for r in results)
+
+            grouping_flag = np.full(n_chan_all_group, -1, dtype=int)
+            grouping_flag[idx] = grouping
+            final_grouping = np.full(n_chan.sum(), -1, dtype=int)
+            final_grouping[~channel_mask_no_group] = 1
+            final_grouping[channel_mask_no_group] = grouping_flag
+            return final_grouping, success
+
+        return grouping_fn
 
     def plot_spec(
         self,
@@ -879,38 +903,50 @@ class ObservationData:
         )
 
     def get_fixed_data(self) -> FixedData:
-        """Return a fixed data object."""
+        """Return a fixed data object.
 
-        def copy(x: NDArray) -> NDArray:
-            return np.copy(x, order='C')
+        The arrays of the fixed data are read-only views of the current
+        arrays, which are never modified in place by this object. The
+        response matrix is stored in CSR format if the response is sparse,
+        otherwise in dense format.
+        """
+
+        def view(x: NDArray) -> NDArray:
+            x = np.asarray(x).view()
+            x.flags.writeable = False
+            return x
+
+        if self.resp_data.sparse:
+            resp_matrix = self.sparse_matrix.tocsr()
+        else:
+            resp_matrix = view(self.response_matrix)
 
         return FixedData(
             name=self.name,
-            spec_counts=copy(self.spec_counts),
-            spec_errors=copy(self.spec_errors),
+            spec_counts=view(self.spec_counts),
+            spec_errors=view(self.spec_errors),
             spec_poisson=self.spec_data.poisson,
             spec_exposure=self.spec_data.exposure,
-            area_scale=copy(self.area_scale),
+            area_scale=view(self.area_scale),
             has_back=self.has_back,
-            back_counts=copy(self.back_counts) if self.has_back else None,
-            back_errors=copy(self.back_errors) if self.has_back else None,
+            back_counts=view(self.back_counts) if self.has_back else None,
+            back_errors=view(self.back_errors) if self.has_back else None,
             back_poisson=self.back_data.poisson if self.has_back else None,
             back_exposure=self.back_data.exposure if self.has_back else None,
-            back_ratio=copy(self.back_ratio) if self.has_back else None,
-            net_counts=copy(self.net_counts),
-            net_errors=copy(self.net_errors),
-            ce=copy(self.ce),
-            ce_errors=copy(self.ce_errors),
-            photon_egrid=copy(self.resp_data.photon_egrid),
-            channel=copy(self.channel),
-            channel_emin=copy(self.channel_emin),
-            channel_emax=copy(self.channel_emax),
-            channel_emid=copy(self.channel_emid),
-            channel_width=copy(self.channel_width),
-            channel_emean=copy(self.channel_emean),
-            channel_errors=copy(self.channel_errors),
-            response_matrix=copy(self.response_matrix),
-            sparse_matrix=self.sparse_matrix.tocoo(copy=True),
+            back_ratio=view(self.back_ratio) if self.has_back else None,
+            net_counts=view(self.net_counts),
+            net_errors=view(self.net_errors),
+            ce=view(self.ce),
+            ce_errors=view(self.ce_errors),
+            photon_egrid=view(self.resp_data.photon_egrid),
+            channel=view(self.channel),
+            channel_emin=view(self.channel_emin),
+            channel_emax=view(self.channel_emax),
+            channel_emid=view(self.channel_emid),
+            channel_width=view(self.channel_width),
+            channel_emean=view(self.channel_emean),
+            channel_errors=view(self.channel_errors),
+            resp_matrix=resp_matrix,
             response_sparse=self.resp_data.sparse,
         )
 
@@ -1079,6 +1115,179 @@ class ObservationData:
         return self._resp_matrix.todense()
 
 
+def _same_response(r1: ResponseData, r2: ResponseData) -> bool:
+    """Check if two response data are identical."""
+    if r1 is r2:
+        return True
+    m1 = r1.sparse_matrix
+    m2 = r2.sparse_matrix
+    return (
+        m1.shape == m2.shape
+        and m1.nnz == m2.nnz
+        and np.array_equal(r1.photon_egrid, r2.photon_egrid)
+        and np.array_equal(r1._channel_egrid, r2._channel_egrid)
+        and np.array_equal(m1.row, m2.row)
+        and np.array_equal(m1.col, m2.col)
+        and np.array_equal(m1.data, m2.data)
+    )
+
+
+def _replace_spec_counts(
+    data: ObservationData, counts: NDArray, errors: NDArray
+) -> ObservationData:
+    """Copy the observation data with the spectrum counts replaced."""
+    spec = data.spec_data
+    spec_data = SpectrumData(
+        counts=counts,
+        errors=errors,
+        poisson=spec.poisson,
+        exposure=spec.exposure,
+        quality=spec.quality,
+        grouping=spec.grouping,
+        area_scale=spec.area_scale,
+        back_scale=spec.back_scale,
+        net=spec._net,
+        zero_errors_warning=False,
+    )
+    new = copy.copy(data)
+    new._spec_data = spec_data
+    return new
+
+
+def group_spectra(
+    data: ObservationData | Sequence[ObservationData],
+    method: str,
+    scale: float | Sequence[float] | None = None,
+    preserve_data_group: bool = False,
+    counts: NDArray | None = None,
+    errors: NDArray | None = None,
+) -> list[ObservationData]:
+    """Group many spectra at once.
+
+    This is equivalent to calling :meth:`ObservationData.group` on a copy of
+    each observation data, but the channel FWHM and the grouped response
+    matrices are shared between spectra with identical responses, and the
+    pre-grouping products of each spectrum are shared across scales.
+
+    Parameters
+    ----------
+    data : ObservationData or sequence of ObservationData
+        The observation data to group. If `counts` is given, this must be a
+        single observation data used as the template of the spectra.
+    method : str
+        Grouping method, see :meth:`ObservationData.group`.
+    scale : float, sequence of float or None, optional
+        Grouping scale. A sequence of scales is either paired with the
+        sequence of observation data, or applied to a single observation
+        data, in which case the observation data is grouped with each scale.
+    preserve_data_group : bool, optional
+        Whether to preserve the grouping flags stored in the spectrum data.
+        The default is False.
+    counts : ndarray, optional
+        Stacked spectrum counts of shape ``(nspec, nchan)``. Each row replaces
+        the spectrum counts of the template observation data.
+    errors : ndarray, optional
+        Uncertainty of `counts`. The default is the square root of `counts`,
+        which is only available for Poisson spectrum.
+
+    Returns
+    -------
+    list of ObservationData
+        The grouped copies of observation data. The input data are not
+        modified.
+
+    Warns
+    -----
+    GroupingWarning
+        Warn if grouping scale is not met for any channel.
+    """
+    if isinstance(data, ObservationData):
+        data = [data]
+    else:
+        data = list(data)
+
+    if not data:
+        raise ValueError('data must not be empty')
+
+    if not all(isinstance(d, ObservationData) for d in data):
+        raise TypeError('data must be ObservationData instances')
+
+    if counts is not None:
+        if len(data) != 1:
+            raise ValueError(
+                'a single ObservationData must be given as the template when '
+                'counts is given'
+            )
+        template = data[0]
+        counts = np.array(counts, dtype=np.float64, ndmin=2)
+        nchan = template.resp_data.channel_number
+        if counts.ndim != 2 or counts.shape[1] != nchan:
+            raise ValueError(
+                f'counts must be of shape (nspec, {nchan}), got {counts.shape}'
+            )
+        if errors is None:
+            if not template.spec_data.poisson:
+                raise ValueError(
+                    'errors must be given for non-Poisson spectrum'
+                )
+            errors = np.sqrt(counts)
+        else:
+            errors = np.broadcast_to(errors, counts.shape)
+        data = [
+            _replace_spec_counts(template, c, e)
+            for c, e in zip(counts, errors, strict=True)
+        ]
+
+    method = str(method)
+    if scale is None:
+        if method != 'opt':
+            raise ValueError(f'scale must be given for {method} grouping')
+        scales = [None]
+    else:
+        scales = np.array(scale, dtype=np.float64, ndmin=1)
+        if scales.ndim != 1:
+            raise ValueError('scale must be a scalar or 1D sequence')
+        scales = scales.tolist()
+
+    if len(data) == 1:
+        data = data * len(scales)
+    elif len(scales) == 1:
+        scales = scales * len(data)
+    elif len(scales) != len(data):
+        raise ValueError(
+            f'number of scales ({len(scales)}) and data ({len(data)}) are '
+            'not matched'
+        )
+
+    # identical responses share the FWHM and grouped response matrices
+    resp_data = {id(d.resp_data): d.resp_data for d in data}
+    unique = []
+    for k, v in resp_data.items():
+        resp_data[k] = next((u for u in unique if _same_response(u, v)), v)
+        if resp_data[k] is v:
+            unique.append(v)
+
+    grouping_fns = {}
+    grouped = []
+    for d, s in zip(data, scales, strict=True):
+        new = copy.copy(d)
+        new._resp_data = resp_data[id(d.resp_data)]
+        if id(d) not in grouping_fns:
+            grouping_fns[id(d)] = new._grouping_fn(method, preserve_data_group)
+        grouping, success = grouping_fns[id(d)](s)
+
+        if not success:
+            warnings.warn(
+                f'"{method}" grouping failed in some {new.name} channels',
+                GroupingWarning,
+            )
+
+        new.set_grouping(grouping)
+        grouped.append(new)
+
+    return grouped
+
+
 class SpectrumData:
     """Spectrum data.
 
@@ -1488,6 +1697,7 @@ class ResponseData:
         self._sparse = bool(sparse)
         self._fwhm: NDArray | None = None
         self._channel_fwhm: NDArray | None = None
+        self._group_cache: dict[tuple, tuple] = {}
 
     def group(
         self,
@@ -1519,6 +1729,16 @@ class ResponseData:
         channel : ndarray
             Grouped channel information.
         """
+        # the grouped response is cached since spectra with the same response
+        # are often grouped the same way
+        key = (
+            np.asarray(grouping, dtype=np.int64).tobytes(),
+            None if quality is None else np.asarray(quality, bool).tobytes(),
+            bool(keep_channel_info),
+        )
+        if key in self._group_cache:
+            return self._group_cache[key]
+
         group_channels, group_emin, group_emax = self.group_energy(
             grouping=grouping,
             quality=quality,
@@ -1535,7 +1755,11 @@ class ResponseData:
             grouping_matrix = csc_array((a, idx, ptr))
             matrix = self.sparse_matrix.dot(grouping_matrix)
 
-        return group_channels, group_emin, coo_array(matrix), group_emax
+        result = (group_channels, group_emin, coo_array(matrix), group_emax)
+        if len(self._group_cache) >= _GROUP_CACHE_SIZE:
+            self._group_cache.pop(next(iter(self._group_cache)))
+        self._group_cache[key] = result
+        return result
 
     def group_energy(
         self,
@@ -1575,35 +1799,22 @@ class ResponseData:
         if np.shape(quality) != (channel_number,):
             raise ValueError('quality must have the same size as channel')
 
-        group_channels = np.array(self.channel, dtype=str)
-        group_emin = self.channel_emin
-        group_emax = self.channel_emax
-
         group_idx = np.flatnonzero(grouping != -1)  # transform to seg sum idx
 
-        if len(group_idx) != channel_number:
-            edge_indices = np.append(group_idx, channel_number)
-            raw_channel = self.channel.tolist()
-            emin = self.channel_emin
-            emax = self.channel_emax
-            group_channels = []
-            group_emin = []
-            group_emax = []
-
-            for i in range(len(group_idx)):
-                slice_i = slice(edge_indices[i], edge_indices[i + 1])
-                quality_slice = quality[slice_i]
-                channel_slice = np.array(raw_channel[slice_i])[quality_slice]
-                if keep_channel_info:
-                    group_channels.append(np.array('+'.join(channel_slice)))
-                else:
-                    group_channels.append(str(i))
-                group_emin.append(min(emin[slice_i]))
-                group_emax.append(max(emax[slice_i]))
+        if len(group_idx) == channel_number:
+            channel = np.array(self.channel, dtype=str)
+            return self.channel_emin, self.channel_emax, channel
 
-            group_channels = np.array(group_channels)
-            group_emin = np.array(group_emin)
-            group_emax = np.array(group_emax)
+        group_emin = np.minimum.reduceat(self.channel_emin, group_idx)
+        group_emax = np.maximum.reduceat(self.channel_emax, group_idx)
+
+        if keep_channel_info:
+            quality = np.asarray(quality, dtype=bool)
+            good_idx = np.cumsum(quality)[group_idx] - quality[group_idx]
+            channels = np.split(self.channel[quality], good_idx[1:])
+            group_channels = np.array(['+'.join(c) for c in channels])
+        else:
+            group_channels = np.arange(len(group_idx)).astype(str)
 
         return group_emin, group_emax, group_channels
 
@@ -1827,36 +2038,57 @@ class ResponseData:
         if self._fwhm is not None:
             return self._fwhm
 
-        matrix = self.sparse_matrix
-        csr_matrix = matrix.tocsr()
+        matrix = csr_array(self.sparse_matrix)
+        matrix.sum_duplicates()
         nE, nC = matrix.shape
-        row_idx = np.arange(nE)
-        argmax = np.squeeze(matrix.argmax(axis=1))
-        max_value = csr_matrix[row_idx, argmax]
+        nnz_row = np.diff(matrix.indptr)
+        row = np.repeat(np.arange(nE), nnz_row)
+        col = matrix.indices
+        data = matrix.data
+
+        # The maximum of each row, including the implicit zeros
+        max_value = np.zeros(nE)
+        nonempty = nnz_row > 0
+        max_value[nonempty] = np.maximum.reduceat(
+            data, matrix.indptr[:-1][nonempty]
+        )
+        max_value[nnz_row < nC] = np.clip(max_value[nnz_row < nC], 0.0, None)
         half_max = 0.5 * max_value
-
-        # Initialize left and right index arrays
-        idx_low_high = np.column_stack([argmax - 1, argmax + 1])
-
-        # Now find the left and right indices where the response falls below
-        # half_max
-        dense_matrix = matrix.todense()
-        for iE in range(nE):
-            # elements of iE row and idx cols are <= half_max
-            idx = np.flatnonzero(dense_matrix[iE] <= half_max[iE])
-            if idx.size:
-                k = np.searchsorted(idx, argmax[iE])
-                if k > 0:
-                    idx_low_high[iE][0] = idx[k - 1]
-                if k < idx.size:
-                    idx_low_high[iE][1] = idx[k]
-        ilow, ihigh = np.clip(idx_low_high, 0, nC - 1).T
-
-        good_low = csr_matrix[row_idx, [0] * nE] <= half_max
-        good_high = csr_matrix[row_idx, [-1] * nE] <= half_max
+        peaked = max_value > 0.0
+
+        # Stored elements above half_max, sorted by row and column. The peak
+        # lies in a run of consecutive columns above half_max, and the left
+        # and right indices where the response falls below half_max are next
+        # to the run.
+        above = data > half_max[row]
+        row = row[above]
+        col = col[above]
+        run_start = np.ones(len(col), dtype=bool)
+        run_start[1:] = (row[1:] != row[:-1]) | (col[1:] != col[:-1] + 1)
+        run_id = np.cumsum(run_start) - 1
+        run_low = col[run_start] - 1
+        run_high = np.maximum.reduceat(col, np.flatnonzero(run_start)) + 1
+
+        # The first column of the maximum of each row
+        is_max = data[above] == max_value[row]
+        first_max = np.unique(row[is_max], return_index=True)[1]
+        argmax = np.zeros(nE, dtype=np.int64)
+        argmax[peaked] = col[is_max][first_max]
+        peak_run = run_id[is_max][first_max]
+        ilow = np.zeros(nE, dtype=np.int64)
+        ilow[peaked] = np.clip(run_low[peak_run], 0, nC - 1)
+        ihigh = np.zeros(nE, dtype=np.int64)
+        ihigh[peaked] = np.clip(run_high[peak_run], 0, nC - 1)
+
+        good_low = np.ones(nE, dtype=bool)
+        good_low[row[col == 0]] = False
+        good_high = np.ones(nE, dtype=bool)
+        good_high[row[col == nC - 1]] = False
         fwhm = np.full(nE, 0)
-        fwhm[good_high] += ihigh[good_high] - argmax[good_high]
-        fwhm[good_low] += argmax[good_low] - ilow[good_low]
+        mask = good_high & peaked
+        fwhm[mask] += ihigh[mask] - argmax[mask]
+        mask = good_low & peaked
+        fwhm[mask] += argmax[mask] - ilow[mask]
         fwhm[(good_high & (~good_low)) | ((~good_high) & good_low)] *= 2
 
         # Ensure minimum FWHM of 1
@@ -1965,15 +2197,28 @@ class FixedData(NamedTuple):
     channel_errors: NDArray
     """Width between left/right and geometric mean of channel grid."""
 
-    response_matrix: NDArray
-    """Response matrix."""
-
-    sparse_matrix: coo_array
-    """Sparse response matrix."""
+    resp_matrix: NDArray | csr_array
+    """Response matrix, in CSR format if `response_sparse` is True."""
 
     response_sparse: bool
     """Whether the response matrix is sparse."""
 
+    @property
+    def response_matrix(self) -> NDArray:
+        """Response matrix in dense format, which is created on demand."""
+        if self.response_sparse:
+            return self.resp_matrix.toarray()
+        else:
+            return self.resp_matrix
+
+    @property
+    def sparse_matrix(self) -> csr_array:
+        """Response matrix in CSR format, which is created on demand."""
+        if self.response_sparse:
+            return self.resp_matrix
+        else:
+            return csr_array(self.resp_matrix)
+
 
 class GroupingWarning(Warning):
     """Issued by grouping scale not being met for all channel groups."""
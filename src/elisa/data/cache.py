@@ -0,0 +1,307 @@
+"""On-disk cache of parsed response data."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import warnings
+from pathlib import Path
+
+import numpy as np
+from scipy.sparse import csr_array
+
+_CACHE_FORMAT_VERSION = 1
+_ARRAY_NAMES = (
+    'photon_egrid',
+    'channel_emin',
+    'channel_emax',
+    'channel',
+    'data',
+    'indices',
+    'indptr',
+)
+_RESPONSE_CACHE: ResponseCache | None = None
+_RESPONSE_CACHE_CONFIGURED = False
+
+
+class ResponseCache:
+    """Persistent cache of parsed response data.
+
+    Each entry stores the photon energy grid, the channel energy bounds and
+    the CSR arrays of the response matrix as ``.npy`` files, which are
+    memory-mapped when loaded. Entries are keyed by the absolute path, size
+    and modification time of the response and ancillary response files, and
+    the response extension number, so that a modified file invalidates its
+    entries automatically.
+
+    Parameters
+    ----------
+    directory : str or path-like
+        Directory to store the cache entries.
+    max_size : int or None, optional
+        Maximum total size of the cache in bytes. The least recently used
+        entries are evicted when the cache exceeds this size. No limit is
+        applied if None. The default is 1 GiB.
+    """
+
+    def __init__(
+        self, directory: str | os.PathLike, max_size: int | None = 2**30
+    ):
+        if max_size is not None:
+            max_size = int(max_size)
+            if max_size <= 0:
+                raise ValueError('max_size must be positive')
+
+        self._directory = Path(directory).expanduser().resolve()
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_size = max_size
+
+    @staticmethod
+    def _file_signature(file: str) -> list:
+        path = os.path.abspath(file)
+        stat = os.stat(path)
+        return [path, stat.st_size, stat.st_mtime_ns]
+
+    def key(self, respfile: str, response_id: int, ancrfile: str = '') -> str:
+        """Get the cache key of the response.
+
+        Parameters
+        ----------
+        respfile : str
+            Response file path, without the row specifier.
+        response_id : int
+            Extension number of the response matrix.
+        ancrfile : str, optional
+            Ancillary response file path. The default is ``''``.
+
+        Returns
+        -------
+        str
+            The cache key.
+        """
+        signature = [
+            _CACHE_FORMAT_VERSION,
+            self._file_signature(respfile),
+            int(response_id),
+            self._file_signature(ancrfile) if ancrfile else None,
+        ]
+        encoded = json.dumps(signature).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def load(self, key: str) -> dict | None:
+        """Load the response data of the key from the cache.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+
+        Returns
+        -------
+        dict or None
+            The response data, or None if the key is not cached.
+        """
+        entry = self._directory / key
+        meta_file = entry / 'meta.json'
+        if not meta_file.exists():
+            return None
+
+        try:
+            with open(meta_file) as f:
+                meta = json.load(f)
+            arrays = {
+                name: np.load(entry / f'{name}.npy', mmap_mode='c')
+                for name in _ARRAY_NAMES
+            }
+        except (OSError, ValueError) as err:
+            warnings.warn(
+                f'failed to load cached response ({err}), the cache entry is '
+                'removed',
+                Warning,
+            )
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+
+        # mark the entry as recently used
+        os.utime(meta_file)
+
+        matrix = csr_array(
+            (arrays['data'], arrays['indices'], arrays['indptr']),
+            shape=tuple(meta['shape']),
+            copy=False,
+        )
+        return {
+            'photon_egrid': arrays['photon_egrid'],
+            'channel_emin': arrays['channel_emin'],
+            'channel_emax': arrays['channel_emax'],
+            'channel': arrays['channel'],
+            'channel_type': meta['channel_type'],
+            'response_matrix': matrix.tocoo(copy=False),
+        }
+
+    def save(
+        self,
+        key: str,
+        response_data: dict,
+        files: tuple[str, ...] = (),
+    ) -> None:
+        """Save the response data of the key to the cache.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        response_data : dict
+            The response data to save.
+        files : tuple of str, optional
+            Files from which the response data is read, used to invalidate
+            the entry by :meth:`invalidate`.
+        """
+        matrix = csr_array(response_data['response_matrix'])
+        matrix.sort_indices()
+        arrays = {
+            'photon_egrid': response_data['photon_egrid'],
+            'channel_emin': response_data['channel_emin'],
+            'channel_emax': response_data['channel_emax'],
+            'channel': np.asarray(response_data['channel'], dtype=str),
+            'data': matrix.data,
+            'indices': matrix.indices,
+            'indptr': matrix.indptr,
+        }
+        meta = {
+            'version': _CACHE_FORMAT_VERSION,
+            'shape': list(matrix.shape),
+            'channel_type': str(response_data['channel_type']),
+            'files': [os.path.abspath(f) for f in files if f],
+        }
+
+        entry = self._directory / key
+        tmp = Path(tempfile.mkdtemp(prefix=f'.{key}.', dir=self._directory))
+        try:
+            for name, array in arrays.items():
+                np.save(tmp / f'{name}.npy', np.ascontiguousarray(array))
+            # write metadata in the end, which marks the entry as complete
+            with open(tmp / 'meta.json', 'w') as f:
+                json.dump(meta, f)
+            os.replace(tmp, entry)
+        except OSError:
+            # another process may have saved the same entry
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Evict the least recently used entries exceeding the size limit."""
+        if self._max_size is None:
+            return
+
+        entries = []
+        total_size = 0
+        for entry in self._directory.iterdir():
+            meta_file = entry / 'meta.json'
+            if entry.name.startswith('.') or not meta_file.exists():
+                continue
+            size = sum(f.stat().st_size for f in entry.iterdir())
+            entries.append((meta_file.stat().st_mtime_ns, size, entry))
+            total_size += size
+
+        for _, size, entry in sorted(entries, key=lambda x: x[0]):
+            if total_size <= self._max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
+
+    def invalidate(self, file: str) -> None:
+        """Remove the entries read from the file.
+
+        Parameters
+        ----------
+        file : str
+            Response or ancillary response file path.
+        """
+        file = os.path.abspath(file)
+        for meta_file in self._directory.glob('*/meta.json'):
+            try:
+                with open(meta_file) as f:
+                    files = json.load(f).get('files', [])
+            except (OSError, ValueError):
+                files = [file]
+            if file in files:
+                shutil.rmtree(meta_file.parent, ignore_errors=True)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        for entry in self._directory.iterdir():
+            if entry.is_dir():
+                shutil.rmtree(entry, ignore_errors=True)
+
+    @property
+    def directory(self) -> Path:
+        """Directory of the cache."""
+        return self._directory
+
+    @property
+    def max_size(self) -> int | None:
+        """Maximum total size of the cache in bytes."""
+        return self._max_size
+
+    @property
+    def size(self) -> int:
+        """Total size of the cache in bytes."""
+        return sum(
+            f.stat().st_size for f in self._directory.rglob('*') if f.is_file()
+        )
+
+
+def set_response_cache(
+    directory: str | os.PathLike | None,
+    max_size: int | None = 2**30,
+) -> ResponseCache | None:
+    """Enable or disable the on-disk cache of parsed response data.
+
+    When enabled, :class:`~elisa.data.ogip.Response` stores the parsed
+    response in the cache, and memory-maps it back on later loads of the same
+    response file.
+
+    Parameters
+    ----------
+    directory : str, path-like or None
+        Directory to store the cache entries. If None, disable the cache.
+    max_size : int or None, optional
+        Maximum total size of the cache in bytes. The least recently used
+        entries are evicted when the cache exceeds this size. No limit is
+        applied if None. The default is 1 GiB.
+
+    Returns
+    -------
+    ResponseCache or None
+        The response cache.
+    """
+    global _RESPONSE_CACHE, _RESPONSE_CACHE_CONFIGURED
+    _RESPONSE_CACHE_CONFIGURED = True
+    if directory is None:
+        _RESPONSE_CACHE = None
+    else:
+        _RESPONSE_CACHE = ResponseCache(directory, max_size)
+    return _RESPONSE_CACHE
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Get the response cache in use.
+
+    If :func:`set_response_cache` is never called, the cache is enabled when
+    the environment variable ``ELISA_RESPONSE_CACHE`` is set to the cache
+    directory.
+
+    Returns
+    -------
+    ResponseCache or None
+        The response cache, or None if the cache is disabled.
+    """
+    if not _RESPONSE_CACHE_CONFIGURED:
+        directory = os.getenv('ELISA_RESPONSE_CACHE', '')
+        set_response_cache(directory or None)
+    return _RESPONSE_CACHE
@@ -8,6 +8,8 @@ import numpy as np
 from scipy.special import xlogy
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     NDArray = np.ndarray
 
 
@@ -110,6 +112,7 @@ def _calc_optimal_binning(fwhm: NDArray, counts: NDArray) -> NDArray:
     #    x = ln[N_r(1 + 0.2 ln R)]
     # and N_r is the number of counts per resolution element and R is the total
     # number of resolution elements.
+    fwhm = np.asarray(fwhm, dtype=np.float64)
     Nchan = len(fwhm)
 
     # Estimate the total number of resolution elements. Since this enters
@@ -121,12 +124,11 @@ def _calc_optimal_binning(fwhm: NDArray, counts: NDArray) -> NDArray:
     # This assumes the response is gaussian - I could improve this by also
     # including a vector with the fraction within the FWHM for each channel
     # but this is probably not going to make a significant difference
-    Nr = np.zeros(Nchan)
-    for i in range(Nchan):
-        fwhm_i = fwhm[i]
-        low = max(0, int(np.round(i - 0.5 * fwhm_i)))
-        high = min(Nchan, int(np.round(i + 0.5 * fwhm_i)))
-        Nr[i] = 1.314 * counts[low : high + 1].sum()
+    i = np.arange(Nchan)
+    low = np.maximum(0, np.round(i - 0.5 * fwhm).astype(np.int64))
+    high = np.minimum(Nchan, np.round(i + 0.5 * fwhm).astype(np.int64))
+    prefix = _prefix_sum(counts)
+    Nr = 1.314 * (prefix[np.minimum(high + 1, Nchan)] - prefix[low])
 
     # Calculate the optimal bin size at each channel
     b = np.array(fwhm, dtype=np.float64)
@@ -138,6 +140,66 @@ def _calc_optimal_binning(fwhm: NDArray, counts: NDArray) -> NDArray:
     return bint
 
 
+def _first_true(
+    cond: Callable[[NDArray], NDArray],
+    start: int,
+    stop: int,
+) -> int | None:
+    """Find the first index in ``[start, stop)`` satisfying the condition.
+
+    The condition is evaluated on index windows of doubling width, so the
+    cost is linear in the distance from `start` to the index found.
+    """
+    width = 16
+    while start < stop:
+        end = min(stop, start + width)
+        mask = cond(np.arange(start, end))
+        if np.any(mask):
+            return start + int(np.argmax(mask))
+        start = end
+        width *= 2
+    return None
+
+
+def _optimal_group_idx(
+    bint: NDArray,
+    extend: Callable[[int, int], int | None] | None = None,
+) -> NDArray:
+    """Get the first channel of each group of the optimal binning.
+
+    The group starting from channel ``i`` ends at the channel ``j`` within
+    the optimal bin size of all its channels. If `extend` is given,
+    ``extend(i, j)`` returns the last channel of the group extended to meet
+    the grouping scale, or None if the remaining channels cannot meet the
+    scale, in which case they are combined with the previous group.
+    """
+    nchan = len(bint)
+    imax = nchan - 1
+    # the last channel of the optimal bin starting from each channel
+    bin_stop = np.arange(nchan) + bint - 1
+    idx = []
+    i = 0
+    while i <= imax:
+        idx.append(i)
+
+        j = min(imax, int(bin_stop[i]))
+        if j > i:
+            j = min(j, int(bin_stop[i + 1 : j + 1].min()))
+
+        if extend is not None:
+            j = extend(i, j)
+            if j is None:
+                # if the last group does not meet the scale, then combine
+                # the last two groups to ensure all groups meet the scale
+                if len(idx) > 1:
+                    idx.pop()
+                break
+
+        i = j + 1
+
+    return np.array(idx, dtype=np.int64)
+
+
 def group_opt(
     fwhm: NDArray,
     net_counts: NDArray,
@@ -183,47 +245,22 @@ def group_opt(
     if bin_counts is not None:
         bin_counts = np.array(bin_counts)
     min_flag = (n > 0) and (bin_counts is not None)
-    idx = np.empty(nchan, dtype=np.int64)
-    ng = 0
 
-    i = 0
-    imax = nchan - 1
-    while i <= imax:
-        idx[ng] = i
-        ng += 1
-
-        j = min(imax, i + bint[i] - 1)
-        k = np.arange(i + 1, j + 1)
-        if k.size:
-            j = np.minimum(j, np.min(k + bint[k] - 1))
-
-        # Ensure minimum number of counts and extend the bin
-        # if necessary to abide that constraint
-        if min_flag:
-            cts = bin_counts[i : j + 1].sum()
-            if cts < n:
-                mask = bin_counts[j + 1 :].cumsum() >= n - cts
-                if np.any(mask):
-                    # the smallest j for bin_counts[i:j + 1].sum() >= n
-                    j += np.flatnonzero(mask)[0] + 1
-                else:
-                    # if the last group does not have enough counts,
-                    # then combine the last two groups to ensure all
-                    # groups meet the count requirement
-                    if ng > 1:
-                        ng -= 1
-                    break
-
-        if j > imax:
-            # If the left channels are not enough, then group them with
-            # the previous channels group.
-            if (j - imax) / (j - i) > 1 / 3 and ng > 1:
-                ng -= 1
-            break
+    if min_flag:
+        # The prefix sum of counts is non-decreasing, so the smallest j for
+        # bin_counts[i:j + 1].sum() >= n is found by binary search.
+        prefix = _prefix_sum(bin_counts)
 
-        i = j + 1
+        def extend(i: int, j: int) -> int | None:
+            stop = int(np.searchsorted(prefix, prefix[i] + n, side='left'))
+            if stop > nchan:
+                return None
+            return max(j, stop - 1)
 
-    idx = idx[:ng]
+    else:
+        extend = None
+
+    idx = _optimal_group_idx(bint, extend)
     flag = np.full(nchan, -1, dtype=int)
     flag[idx] = 1
 
@@ -281,34 +318,39 @@ def _build_scale_prefix(data: _ScaleGroupData, net: bool) -> _ScalePrefixData:
 
 
 def _scale_from_interval(
-    prefix: _ScalePrefixData, start: int, stop: int
-) -> np.float64:
-    """Evaluate a grouped scale value on ``[start, stop)``.
+    prefix: _ScalePrefixData,
+    start: int | NDArray,
+    stop: int | NDArray,
+) -> np.float64 | NDArray:
+    """Evaluate grouped scale values on ``[start, stop)``.
 
     NET spectra use an arithmetic mean. Non-NET spectra use the
     count-weighted harmonic mean with a plain harmonic fallback when the
-    weighted denominator is zero.
+    weighted denominator is zero. The interval bounds can be arrays, in
+    which case the scale is evaluated for each interval.
     """
     counts = prefix.counts[stop] - prefix.counts[start]
     n_chan = prefix.n_chan[stop] - prefix.n_chan[start]
-    if n_chan == 0.0:
-        return np.float64(1.0)
-
-    if prefix.net:
-        scale_sum = prefix.scale_sum[stop] - prefix.scale_sum[start]
-        return np.float64(scale_sum / n_chan)
-
-    weighted_inv_sum = (
-        prefix.weighted_inv_sum[stop] - prefix.weighted_inv_sum[start]
-    )
-    if weighted_inv_sum != 0.0:
-        return np.float64(counts / weighted_inv_sum)
 
-    reciprocal_sum = prefix.reciprocal_sum[stop] - prefix.reciprocal_sum[start]
-    if reciprocal_sum == 0.0:
-        return np.float64(1.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if prefix.net:
+            scale_sum = prefix.scale_sum[stop] - prefix.scale_sum[start]
+            scale = scale_sum / n_chan
+        else:
+            weighted_inv_sum = (
+                prefix.weighted_inv_sum[stop] - prefix.weighted_inv_sum[start]
+            )
+            reciprocal_sum = (
+                prefix.reciprocal_sum[stop] - prefix.reciprocal_sum[start]
+            )
+            scale = np.where(
+                weighted_inv_sum != 0.0,
+                counts / weighted_inv_sum,
+                np.where(reciprocal_sum != 0.0, n_chan / reciprocal_sum, 1.0),
+            )
 
-    return np.float64(n_chan / reciprocal_sum)
+    scale = np.where(n_chan == 0.0, 1.0, scale)
+    return np.asarray(scale, dtype=np.float64)[()]
 
 
 def _group_scale_data(
@@ -462,22 +504,22 @@ def _group_back_ratio(
 
 
 def _interval_back_ratio(
-    start: int,
-    stop: int,
+    start: int | NDArray,
+    stop: int | NDArray,
     spec_exposure: float,
     back_exposure: float,
     spec_area: _ScalePrefixData,
     spec_back: _ScalePrefixData,
     back_area: _ScalePrefixData,
     back_back: _ScalePrefixData,
-) -> np.float64:
-    """Return the background ratio for one grouped interval."""
+) -> np.float64 | NDArray:
+    """Return the background ratio for grouped intervals."""
     ratio = spec_exposure / back_exposure
     ratio *= _scale_from_interval(spec_area, start, stop)
     ratio *= _scale_from_interval(spec_back, start, stop)
     ratio /= _scale_from_interval(back_area, start, stop)
     ratio /= _scale_from_interval(back_back, start, stop)
-    return np.float64(ratio)
+    return np.asarray(ratio, dtype=np.float64)[()]
 
 
 def _interval_ratios(
@@ -492,19 +534,17 @@ def _interval_ratios(
 ) -> NDArray:
     """Return grouped background ratios for all bins defined by ``idx``."""
     edge = np.append(idx, size)
-    ratios = np.empty(len(idx), dtype=np.float64)
-    for i, (start, stop) in enumerate(zip(edge[:-1], edge[1:], strict=True)):
-        ratios[i] = _interval_back_ratio(
-            start,
-            stop,
-            spec_exposure,
-            back_exposure,
-            spec_area,
-            spec_back,
-            back_area,
-            back_back,
-        )
-    return ratios
+    ratios = _interval_back_ratio(
+        edge[:-1],
+        edge[1:],
+        spec_exposure,
+        back_exposure,
+        spec_area,
+        spec_back,
+        back_area,
+        back_back,
+    )
+    return np.atleast_1d(ratios)
 
 
 def significance_lima(
@@ -608,50 +648,26 @@ def group_optsig_normal(
     # the FWHM and the counts.
     bint = _calc_optimal_binning(fwhm, net_counts)
 
-    # Initialize the grouping flag
-    idx = np.empty(nchan, dtype=np.int64)
-    ng = 0
+    count_prefix = _prefix_sum(counts)
+    var_prefix = _prefix_sum(np.square(errors))
 
-    i = 0
-    imax = nchan - 1
-    while i <= imax:
-        idx[ng] = i
-        ng += 1
-
-        j = min(imax, i + bint[i] - 1)
-        k = np.arange(i + 1, j + 1)
-        if k.size:
-            j = np.minimum(j, np.min(k + bint[k] - 1))
-
-        # Ensure minimum significance and extend the bin if necessary to abide
-        # that constraint
-        cts = counts[i : j + 1].sum()
-        err = np.sqrt(np.sum(np.square(errors[i : j + 1])))
-        if cts - sig * err < 0.0 or err == 0.0:
-            cts = cts + counts[j + 1 :].cumsum()
-            err = err + np.sqrt(np.cumsum(np.square(errors[j + 1 :])))
-            mask = (cts - sig * err >= 0.0) & (err > 0.0)
-            if np.any(mask):
-                # the smallest j for the significance threshold
-                j += np.flatnonzero(mask)[0] + 1
-            else:
-                # if the last group does not have a nominal significance,
-                # then combine the last two groups to ensure all
-                # groups meet the count requirement
-                if ng > 1:
-                    ng -= 1
-                break
+    def extend(i: int, j: int) -> int | None:
+        # Ensure minimum significance and extend the bin if necessary to
+        # abide that constraint
+        cts = count_prefix[j + 1] - count_prefix[i]
+        err = np.sqrt(var_prefix[j + 1] - var_prefix[i])
+        if cts - sig * err >= 0.0 and err > 0.0:
+            return j
 
-        if j > imax:
-            # If the left channels are not enough, then group them with
-            # the previous channels group.
-            if (j - imax) / (j - i) > 1 / 3 and ng > 1:
-                ng -= 1
-            break
+        def cond(k: NDArray) -> NDArray:
+            cts_k = count_prefix[k + 1] - count_prefix[i]
+            err_k = err + np.sqrt(var_prefix[k + 1] - var_prefix[j + 1])
+            return (cts_k - sig * err_k >= 0.0) & (err_k > 0.0)
 
-        i = j + 1
+        # the smallest j for the significance threshold
+        return _first_true(cond, j + 1, nchan)
 
-    idx = idx[:ng]
+    idx = _optimal_group_idx(bint, extend)
     flag = np.full(nchan, -1, dtype=int)
     flag[idx] = 1
 
@@ -865,25 +881,14 @@ def group_optsig_lima(
     off_prefix = _prefix_sum(n_off)
 
     bint = _calc_optimal_binning(fwhm, net_counts)
-    idx = np.empty(nchan, dtype=np.int64)
-    ng = 0
-    i = 0
-    imax = nchan - 1
-    while i <= imax:
-        idx[ng] = i
-        ng += 1
-
-        j = min(imax, i + bint[i] - 1)
-        k = np.arange(i + 1, j + 1)
-        if k.size:
-            j = np.minimum(j, np.min(k + bint[k] - 1))
 
-        while j <= imax:
-            group_on = _interval_sum(on_prefix, i, j + 1)
-            group_off = _interval_sum(off_prefix, i, j + 1)
+    def extend(i: int, j: int) -> int | None:
+        def cond(k: NDArray) -> NDArray:
+            group_on = on_prefix[k + 1] - on_prefix[i]
+            group_off = off_prefix[k + 1] - off_prefix[i]
             ratio = _interval_back_ratio(
                 i,
-                j + 1,
+                k + 1,
                 spec_exposure,
                 back_exposure,
                 spec_area_prefix,
@@ -891,18 +896,11 @@ def group_optsig_lima(
                 back_area_prefix,
                 back_back_prefix,
             )
-            if significance_lima(group_on, group_off, ratio) >= sig:
-                break
-            j += 1
+            return significance_lima(group_on, group_off, ratio) >= sig
 
-        if j > imax:
-            if ng > 1:
-                ng -= 1
-            break
+        return _first_true(cond, j, nchan)
 
-        i = j + 1
-
-    idx = idx[:ng]
+    idx = _optimal_group_idx(bint, extend)
     flag = np.full(nchan, -1, dtype=int)
     flag[idx] = 1
     ratios = _interval_ratios(
@@ -958,26 +956,15 @@ def group_optsig_gv(
     s2_prefix = _prefix_sum(s * s)
 
     bint = _calc_optimal_binning(fwhm, net_counts)
-    idx = np.empty(nchan, dtype=np.int64)
-    ng = 0
-    i = 0
-    imax = nchan - 1
-    while i <= imax:
-        idx[ng] = i
-        ng += 1
-
-        j = min(imax, i + bint[i] - 1)
-        k = np.arange(i + 1, j + 1)
-        if k.size:
-            j = np.minimum(j, np.min(k + bint[k] - 1))
-
-        while j <= imax:
-            group_n = _interval_sum(n_prefix, i, j + 1)
-            group_b = _interval_sum(b_prefix, i, j + 1)
-            group_s = np.sqrt(_interval_sum(s2_prefix, i, j + 1))
+
+    def extend(i: int, j: int) -> int | None:
+        def cond(k: NDArray) -> NDArray:
+            group_n = n_prefix[k + 1] - n_prefix[i]
+            group_b = b_prefix[k + 1] - b_prefix[i]
+            group_s = np.sqrt(s2_prefix[k + 1] - s2_prefix[i])
             ratio = _interval_back_ratio(
                 i,
-                j + 1,
+                k + 1,
                 spec_exposure,
                 back_exposure,
                 spec_area_prefix,
@@ -985,18 +972,11 @@ def group_optsig_gv(
                 back_area_prefix,
                 back_back_prefix,
             )
-            if significance_gv(group_n, group_b, group_s, ratio) >= sig:
-                break
-            j += 1
+            return significance_gv(group_n, group_b, group_s, ratio) >= sig
 
-        if j > imax:
-            if ng > 1:
-                ng -= 1
-            break
-
-        i = j + 1
+        return _first_true(cond, j, nchan)
 
-    idx = idx[:ng]
+    idx = _optimal_group_idx(bint, extend)
     flag = np.full(nchan, -1, dtype=int)
     flag[idx] = 1
     ratios = _interval_ratios(
@@ -10,6 +10,7 @@ from astropy.units import Unit
 from scipy.sparse import coo_array
 
 from elisa.data.base import ObservationData, ResponseData, SpectrumData
+from elisa.data.cache import get_response_cache
 from elisa.util.misc import to_native_byteorder
 
 if TYPE_CHECKING:
@@ -46,6 +47,127 @@ def _warn_on_spectrum_classification(
         )
 
 
+def _flatten_column(column: NDArray) -> tuple[NDArray, NDArray]:
+    """Flatten a FITS table column into its values and per-row lengths.
+
+    Scalar, fixed-width and variable-length array columns are supported.
+    """
+    nrows = len(column)
+    if nrows == 0:
+        return np.array([]), np.zeros(0, dtype=np.int64)
+
+    if column.dtype == object:  # variable-length array column
+        rows = [np.ravel(i) for i in column]
+        lengths = np.fromiter(map(len, rows), dtype=np.int64, count=nrows)
+        values = np.concatenate(rows)
+    else:
+        column = np.asarray(column)
+        width = int(np.prod(column.shape[1:], dtype=np.int64))
+        lengths = np.full(nrows, width, dtype=np.int64)
+        values = column.reshape(-1)
+
+    return values, lengths
+
+
+def _take_leading(
+    values: NDArray, lengths: NDArray, n: NDArray
+) -> tuple[NDArray, NDArray]:
+    """Take the first ``n[i]`` elements of each flattened row.
+
+    Returns the selected values and a mask of rows having fewer than
+    ``n[i]`` elements.
+    """
+    short = lengths < n
+    n = np.where(short, 0, n)
+    nrows = len(lengths)
+    if nrows and np.all(lengths == lengths[0]):  # fixed-width column
+        width = int(lengths[0])
+        mask = np.arange(width) < n[:, None]
+        return values.reshape(nrows, width)[mask], short
+
+    starts = np.cumsum(lengths) - lengths
+    offsets = np.arange(len(values)) - np.repeat(starts, lengths)
+    mask = offsets < np.repeat(n, lengths)
+    return values[mask], short
+
+
+def _expand_response_matrix(
+    n_grp: NDArray,
+    f_chan: NDArray,
+    n_chan: NDArray,
+    matrix: NDArray,
+    first_chan: int,
+    respfile: str,
+) -> tuple[NDArray, NDArray, NDArray]:
+    """Expand the compressed OGIP response matrix to COO format.
+
+    The expansion is vectorized over rows and channel groups using cumulative
+    offsets of the ``N_GRP``/``F_CHAN``/``N_CHAN`` columns.
+
+    Parameters
+    ----------
+    n_grp : ndarray
+        The ``N_GRP`` column.
+    f_chan : ndarray
+        The ``F_CHAN`` column.
+    n_chan : ndarray
+        The ``N_CHAN`` column.
+    matrix : ndarray
+        The ``MATRIX`` column.
+    first_chan : int
+        The first channel number.
+    respfile : str
+        Response file path, used in error messages.
+
+    Returns
+    -------
+    rows : ndarray
+        Row indices of matrix elements.
+    cols : ndarray
+        Column indices of matrix elements.
+    values : ndarray
+        Values of matrix elements.
+    """
+    n_grp = np.clip(np.asarray(n_grp, dtype=np.int64).ravel(), 0, None)
+    nrows = len(n_grp)
+
+    f_values, f_lengths = _flatten_column(f_chan)
+    w_values, w_lengths = _flatten_column(n_chan)
+    f, f_short = _take_leading(f_values.astype(np.int64), f_lengths, n_grp)
+    widths, w_short = _take_leading(
+        w_values.astype(np.int64), w_lengths, n_grp
+    )
+    if np.any(f_short | w_short):
+        raise ValueError(
+            f'cannot parse grouped channel ranges in "{respfile}"'
+        )
+    f = f - first_chan
+    widths = np.clip(widths, 0, None)
+
+    # number of matrix elements in each row
+    group_rows = np.repeat(np.arange(nrows), n_grp)
+    n_elem = np.bincount(group_rows, weights=widths, minlength=nrows)
+    n_elem = n_elem.astype(np.int64)
+
+    m_values, m_lengths = _flatten_column(matrix)
+    values, m_short = _take_leading(m_values, m_lengths, n_elem)
+    if np.any(m_short):
+        i = np.flatnonzero(m_short)[0]
+        raise ValueError(
+            f'cannot parse matrix values in "{respfile}" row {i + 1}'
+        )
+
+    group_starts = np.cumsum(widths) - widths
+    offsets = np.arange(int(widths.sum())) - np.repeat(group_starts, widths)
+    rows = np.repeat(group_rows, widths)
+    cols = np.repeat(f, widths) + offsets
+
+    if len(values) == 0:
+        values = np.array([], dtype=np.float64)
+
+    return rows, cols, values
+
+
 class Data(ObservationData):
     """Handle observation data in OGIP standards [1]_ [2]_.
 
@@ -542,6 +664,11 @@ class Response(ResponseData):
     sparse : bool, optional
         Whether the response matrix is sparse. The default is False.
 
+    Notes
+    -----
+    The parsed response is stored in and loaded from the on-disk cache if it
+    is enabled by :func:`~elisa.data.cache.set_response_cache`.
+
     References
     ----------
     .. [1] `The Calibration Requirements for Spectral Analysis (Definition of
@@ -570,15 +697,28 @@ class Response(ResponseData):
             file = respfile
             resp_id = 1
 
-        response_data = self._read_response(file, resp_id)
+        cache = get_response_cache()
+        if cache is not None:
+            cache_key = cache.key(file, resp_id, ancrfile)
+            response_data = cache.load(cache_key)
+        else:
+            cache_key = None
+            response_data = None
 
-        arf = self._read_arf()
-        if arf is not None:
-            if len(arf) != response_data['response_matrix'].shape[0]:
-                raise ValueError(
-                    f'rmf ({respfile}) and arf ({ancrfile}) are not matched'
-                )
-            response_data['response_matrix'] *= arf[:, None]
+        if response_data is None:
+            response_data = self._read_response(file, resp_id)
+
+            arf = self._read_arf()
+            if arf is not None:
+                if len(arf) != response_data['response_matrix'].shape[0]:
+                    raise ValueError(
+                        f'rmf ({respfile}) and arf ({ancrfile}) are not '
+                        'matched'
+                    )
+                response_data['response_matrix'] *= arf[:, None]
+
+            if cache is not None:
+                cache.save(cache_key, response_data, (file, ancrfile))
 
         # photon_egrid, sparse_matrix = self._drop_zeros(
         #     response_data['photon_egrid'],
@@ -592,9 +732,9 @@ class Response(ResponseData):
     def _read_response(self, file: str, response_id: int) -> dict:
         """Read one OGIP response matrix extension.
 
-        The compressed ``MATRIX`` column is expanded row by row using the
-        corresponding ``N_GRP``/``F_CHAN``/``N_CHAN`` metadata so that padded
-        fixed-width rows and placeholder values in empty groups are ignored.
+        The compressed ``MATRIX`` column is expanded using the corresponding
+        ``N_GRP``/``F_CHAN``/``N_CHAN`` metadata so that padded fixed-width
+        rows and placeholder values in empty groups are ignored.
         """
         respfile = self.respfile
         with fits.open(file) as response_hdul:
@@ -672,52 +812,13 @@ class Response(ResponseData):
             str(c) for c in range(first_chan, first_chan + channel_number)
         )
 
-        n_grp = response_data['N_GRP']
-        f_chan = response_data['F_CHAN'] - first_chan
-        n_chan = response_data['N_CHAN']
-        matrix = response_data['MATRIX']
-
-        rows = []
-        cols = []
-        reduced_matrix = []
-        for i in range(len(response_data)):
-            n = int(n_grp[i])
-            if n <= 0:
-                continue
-
-            f = np.asarray(np.atleast_1d(f_chan[i]), dtype=int).ravel()[:n]
-            widths = np.asarray(np.atleast_1d(n_chan[i]), dtype=int).ravel()[
-                :n
-            ]
-            if len(f) != n or len(widths) != n:
-                raise ValueError(
-                    f'cannot parse grouped channel ranges in "{respfile}"'
-                )
-
-            n_elem = int(widths.sum())
-            if n_elem <= 0:
-                continue
-
-            values = np.asarray(np.atleast_1d(matrix[i])).ravel()
-            if len(values) < n_elem:
-                raise ValueError(
-                    f'cannot parse matrix values in "{respfile}" row {i + 1}'
-                )
-            values = values[:n_elem]
-
-            rows.append(np.full(n_elem, i, dtype=int))
-            cols.extend(
-                np.arange(start, start + width)
-                for start, width in zip(f, widths, strict=True)
-            )
-            reduced_matrix.append(values)
-
-        rows = np.hstack(rows) if rows else np.array([], dtype=int)
-        cols = np.hstack(cols) if cols else np.array([], dtype=int)
-        reduced_matrix = (
-            np.hstack(reduced_matrix)
-            if reduced_matrix
-            else np.array([], dtype=np.float64)
+        rows, cols, reduced_matrix = _expand_response_matrix(
+            n_grp=response_data['N_GRP'],
+            f_chan=response_data['F_CHAN'],
+            n_chan=response_data['N_CHAN'],
+            matrix=response_data['MATRIX'],
+            first_chan=first_chan,
+            respfile=respfile,
         )
 
         # convert to native byteorder to be compatible with scipy.sparse
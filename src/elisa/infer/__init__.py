@@ -2,3 +2,4 @@ from .fit import (
     BayesFit as BayesFit,
     MaxLikeFit as MaxLikeFit,
 )
+from .helper import clear_shared_executables as clear_shared_executables
@@ -26,12 +26,14 @@ from numpyro.infer.ensemble import (
 from numpyro.infer.hmc import HMC, NUTS, HMCState
 from numpyro.infer.mcmc import MCMC, MCMCKernel
 from numpyro.infer.sa import SA, SAState
+from numpyro.infer.util import constrain_fn
+from scipy.stats import qmc
 
 from elisa import __version__ as elisa_version
 from elisa.data.base import FixedData, ObservationData
-from elisa.infer.helper import Helper, get_helper
-from elisa.infer.likelihood import _STATISTIC_OPTIONS
-from elisa.infer.results import MLEResult, PosteriorResult
+from elisa.infer.helper import Helper, get_helper, get_minuit
+from elisa.infer.likelihood import _STATISTIC_OPTIONS, _STATISTIC_WITH_BACK
+from elisa.infer.results import BatchMLEResult, MLEResult, PosteriorResult
 from elisa.infer.samplers.blackjax.nuts import BlackJAXNUTS, BlackJAXNUTSState
 from elisa.infer.samplers.ensemble.emcee import EmceeSampler
 from elisa.infer.samplers.ensemble.numpyro import (
@@ -42,7 +44,7 @@ from elisa.infer.samplers.ensemble.numpyro import (
 from elisa.infer.samplers.ensemble.zeus import ZeusSampler
 from elisa.infer.samplers.ns.jaxns import JAXNSSampler
 from elisa.models.model import Model, get_model_info
-from elisa.util.config import get_parallel_number
+from elisa.util.config import get_parallel_number, jax_pmap_shmap_merge
 from elisa.util.misc import (
     add_suffix,
     build_namespace,
@@ -51,9 +53,11 @@ from elisa.util.misc import (
 
 if TYPE_CHECKING:
     from collections.abc import Callable
+    from functools import partial
     from typing import Any, Literal
 
     from jaxlib.xla_client import Device
+    from numpy.typing import NDArray
     from prettytable import PrettyTable
 
     from elisa.infer.likelihood import Statistic
@@ -91,6 +95,7 @@ class Fit(ABC):
     #  - fit data background given response and model
 
     _lm: Callable[[JAXArray], JAXArray] | None = None
+    _lm_batch: Callable[[JAXArray], tuple[JAXArray, JAXArray]] | None = None
     _ns: JAXNSSampler | None = None
 
     def __init__(
@@ -182,11 +187,11 @@ class Fit(ABC):
             lm_solver = optx.LevenbergMarquardt(
                 rtol=0.0, atol=1e-6, verbose=verbose
             )
-            residual = jax.jit(lambda x, aux: self._helper.residual(x))
+            residual = self._helper.residual
 
             def lm(init):
                 res = optx.least_squares(
-                    fn=residual,
+                    fn=lambda x, aux: residual(x),
                     solver=lm_solver,
                     y0=init,
                     max_steps=max_steps,
@@ -195,10 +200,53 @@ class Fit(ABC):
                 grad_norm = jnp.linalg.norm(res.state.f_info.compute_grad())
                 return res.value, grad_norm
 
-            self._lm = jax.jit(lm)
+            self._lm = self._helper.jit_data(lm)
 
         return self._lm(jnp.asarray(unconstr_init, float))
 
+    def _optimize_lm_batch(
+        self,
+        unconstr_init: JAXArray,
+        max_steps: int = 1024,
+        verbose: bool = False,
+    ) -> tuple[JAXArray, JAXArray]:
+        """Search MLE from a batch of initial values by vectorized
+        Levenberg-Marquardt algorithm of :mod:`optimistix`.
+        """
+        if self._lm_batch is None:
+            lm_solver = optx.LevenbergMarquardt(
+                rtol=0.0, atol=1e-6, verbose=verbose
+            )
+            residual = self._helper.residual
+            deviance = self._helper.deviance_total
+
+            def lm(init):
+                res = optx.least_squares(
+                    fn=lambda x, aux: residual(x),
+                    solver=lm_solver,
+                    y0=init,
+                    max_steps=max_steps,
+                    throw=False,
+                )
+                return res.value, deviance(res.value)
+
+            self._lm_batch = self._helper.jit_data(jax.vmap(lm))
+
+        return self._lm_batch(jnp.asarray(unconstr_init, float))
+
+    def _multistart_init(self, unconstr_init: JAXArray, n: int) -> JAXArray:
+        """Get initial values in unconstrained space for multi-start search,
+        the first is the given one and the others are drawn from the priors
+        by a scrambled Sobol sequence.
+        """
+        helper = self._helper
+        sobol = qmc.Sobol(helper.nparam, seed=helper.seed['mcmc'])
+        cube = sobol.random_base2(max(int(np.ceil(np.log2(n))), 0))[: n - 1]
+        eps = np.finfo(float).eps
+        cube = np.clip(cube, eps, 1.0 - eps)
+        init = jax.vmap(helper.unit_cube_to_unconstr_arr)(jnp.asarray(cube))
+        return jnp.vstack([unconstr_init, init])
+
     def _optimize_ns(self, max_steps=131072, verbose=False) -> JAXArray:
         """Search MLE using nested sampling of :mod:`jaxns`."""
         if self._ns is None:
@@ -284,6 +332,73 @@ class Fit(ABC):
         rows = np.array(self._model_info.info)[:, ~mask].tolist()
         self._tab_params: PrettyTable = make_pretty_table(fields, rows)
 
+    @staticmethod
+    def _check_stat(d: FixedData, s: Statistic):
+        """Check if data type and likelihood are matched."""
+        name = d.name
+        if not d.spec_poisson and s != 'chi2':
+            raise ValueError(
+                f'{name} data has Gaussian uncertainties, '
+                'use Gaussian statistic (chi2) instead'
+            )
+
+        if s == 'chi2':
+            if np.any(d.net_errors == 0.0):
+                raise ValueError(
+                    f'{name} data has zero uncertainties, '
+                    'and Gaussian statistic (chi2) will be invalid; '
+                    'grouping the data may fix this error'
+                )
+
+        elif s == 'cstat':
+            if d.has_back:
+                back = 'Poisson' if d.back_poisson else 'Gaussian'
+                stat1 = 'W' if d.back_poisson else 'PG'
+                stat2 = 'w' if d.back_poisson else 'pg'
+                raise ValueError(
+                    f'{name} data has {back} background, '
+                    'and using C-statistic (cstat) is invalid; '
+                    f'use {stat1}-statistic ({stat2}stat) instead'
+                )
+
+        elif s == 'pstat':
+            if not d.has_back:
+                raise ValueError(
+                    f'{name} data has no background, '
+                    'and using P-statistic (pstat) is invalid; '
+                    'use C-statistic (cstat) instead'
+                )
+
+        elif s == 'pgstat':
+            if not d.has_back:
+                raise ValueError(
+                    f'{name} data has no background, '
+                    'and using PG-statistic (pgstat) is invalid; '
+                    'use C-statistic (cstat) instead'
+                )
+
+            if np.any(d.back_errors == 0.0):
+                raise ValueError(
+                    f'{name} data has zero background uncertainties, '
+                    'and PG-statistic (pgstat) will be invalid; '
+                    'grouping the data may fix this error'
+                )
+
+        elif s == 'wstat' and not (d.has_back and d.back_poisson):
+            if not d.has_back:
+                raise ValueError(
+                    f'{name} data has no background, '
+                    'and using W-statistic (wstat) is invalid; '
+                    'use C-statistic (cstat) instead'
+                )
+
+            if not d.back_poisson:
+                raise ValueError(
+                    f'{name} data has Gaussian background, '
+                    'and using W-statistic (wstat) is invalid; '
+                    'use PG-statistic (pgstat) instead'
+                )
+
     @staticmethod
     def _parse_input(
         data: ObservationData | Sequence[ObservationData],
@@ -322,72 +437,6 @@ class Fit(ABC):
             else:
                 return 'chi2'
 
-        def check_stat(d: FixedData, s: Statistic):
-            """Check if data type and likelihood are matched."""
-            name = d.name
-            if not d.spec_poisson and s != 'chi2':
-                raise ValueError(
-                    f'{name} data has Gaussian uncertainties, '
-                    'use Gaussian statistic (chi2) instead'
-                )
-
-            if s == 'chi2':
-                if np.any(d.net_errors == 0.0):
-                    raise ValueError(
-                        f'{name} data has zero uncertainties, '
-                        'and Gaussian statistic (chi2) will be invalid; '
-                        'grouping the data may fix this error'
-                    )
-
-            elif s == 'cstat':
-                if d.has_back:
-                    back = 'Poisson' if d.back_poisson else 'Gaussian'
-                    stat1 = 'W' if d.back_poisson else 'PG'
-                    stat2 = 'w' if d.back_poisson else 'pg'
-                    raise ValueError(
-                        f'{name} data has {back} background, '
-                        'and using C-statistic (cstat) is invalid; '
-                        f'use {stat1}-statistic ({stat2}stat) instead'
-                    )
-
-            elif s == 'pstat':
-                if not d.has_back:
-                    raise ValueError(
-                        f'{name} data has no background, '
-                        'and using P-statistic (pstat) is invalid; '
-                        'use C-statistic (cstat) instead'
-                    )
-
-            elif s == 'pgstat':
-                if not d.has_back:
-                    raise ValueError(
-                        f'{name} data has no background, '
-                        'and using PG-statistic (pgstat) is invalid; '
-                        'use C-statistic (cstat) instead'
-                    )
-
-                if np.any(d.back_errors == 0.0):
-                    raise ValueError(
-                        f'{name} data has zero background uncertainties, '
-                        'and PG-statistic (pgstat) will be invalid; '
-                        'grouping the data may fix this error'
-                    )
-
-            elif s == 'wstat' and not (d.has_back and d.back_poisson):
-                if not d.has_back:
-                    raise ValueError(
-                        f'{name} data has no background, '
-                        'and using W-statistic (wstat) is invalid; '
-                        'use C-statistic (cstat) instead'
-                    )
-
-                if not d.back_poisson:
-                    raise ValueError(
-                        f'{name} data has Gaussian background, '
-                        'and using W-statistic (wstat) is invalid; '
-                        'use PG-statistic (pgstat) instead'
-                    )
-
         # ====================== some helper functions ========================
 
         # get data
@@ -463,7 +512,7 @@ class Fit(ABC):
 
         # check if correctly using stat
         for d, s in zip(data_list, stat_list, strict=True):
-            check_stat(d, s)
+            Fit._check_stat(d, s)
 
         return data_list, model_list, stat_list
 
@@ -479,14 +528,9 @@ class MaxLikeFit(Fit):
         verbose: int | bool = False,
     ) -> Minuit:
         """Search MLE using Minuit algorithm of :mod:`iminuit`."""
-        deviance = jax.jit(self._helper.deviance_total)
-        deviance.ndata = self._helper.ndata['total']
-        minuit = Minuit(
-            deviance,
-            np.array(unconstr_init),
-            grad=jax.jit(jax.grad(deviance)),
-            name=self._helper.params_names['free'],
-        )
+        # the exact Hessian saves Minuit from the finite differences of
+        # gradient, when seeding Migrad and computing covariance
+        minuit = get_minuit(self._helper, unconstr_init)
 
         if throw:
             minuit.throw_nan = True
@@ -502,10 +546,12 @@ class MaxLikeFit(Fit):
     def mle(
         self,
         init: ArrayLike | dict | None = None,
-        method: Literal['minuit', 'lm', 'ns'] = 'minuit',
+        method: Literal['minuit', 'lm', 'ns', 'multistart'] = 'minuit',
         max_steps: int = None,
         throw: bool = True,
         verbose: int | bool = False,
+        n_start: int = 64,
+        n_polish: int = 4,
     ) -> MLEResult:
         """Search Maximum Likelihood Estimation (MLE) for the model.
 
@@ -513,7 +559,7 @@ class MaxLikeFit(Fit):
         ----------
         init : dict, optional
             Initial guess for the maximum likelihood estimation.
-        method : {'minuit', 'lm', 'ns'}, optional
+        method : {'minuit', 'lm', 'ns', 'multistart'}, optional
             Optimization algorithm used to find the MLE.
             Available options are:
 
@@ -521,6 +567,11 @@ class MaxLikeFit(Fit):
                 * ``'lm'``: Levenberg-Marquardt algorithm of :mod:`optimistix`.
                 * ``'ns'``: Nested sampling of :mod:`jaxns`. This option first
                   search MLE globally, then polish it with local minimization.
+                * ``'multistart'``: Levenberg-Marquardt algorithm started from
+                  `init` and points drawn from the priors by a Sobol
+                  sequence, which are solved together in a vectorized way.
+                  The best `n_polish` results are then polished with local
+                  minimization. This is useful for multimodal likelihood.
 
             The default is 'minuit'.
 
@@ -533,6 +584,12 @@ class MaxLikeFit(Fit):
             Whether to report any failures of the solver. Defaults to True.
         verbose : int or bool, optional
             Whether to print fit progress information. The default is False.
+        n_start : int, optional
+            Number of starting points of ``'multistart'`` method, including
+            `init`. The default is 64.
+        n_polish : int, optional
+            Number of best results of ``'multistart'`` method to be polished.
+            The default is 4.
 
         Returns
         -------
@@ -553,6 +610,28 @@ class MaxLikeFit(Fit):
             )
         elif method == 'ns':  # use nested sampling to find MLE
             init_unconstr = self._optimize_ns(max_steps, verbose)
+        elif method == 'multistart':  # use LM from multiple starting points
+            n_start = int(n_start)
+            n_polish = int(n_polish)
+            if n_start < 1:
+                raise ValueError('n_start must be positive')
+            if n_polish < 1:
+                raise ValueError('n_polish must be positive')
+            init_unconstr = self._multistart_init(init_unconstr, n_start)
+            # the batch runs until the slowest start stops, so the steps are
+            # limited here, and the best results are polished by Minuit later
+            fitted, deviance = self._optimize_lm_batch(
+                init_unconstr, min(max_steps, 1024), bool(verbose)
+            )
+            deviance = np.where(np.isnan(deviance), np.inf, deviance)
+            best = np.argsort(deviance, kind='stable')[:n_polish]
+            minuit = [
+                self._optimize_minuit(fitted[i], max_steps, throw, verbose)
+                for i in best
+                if np.isfinite(deviance[i]) or i == best[0]
+            ]
+            minuit = min(minuit, key=lambda m: m.fval)
+            return MLEResult(minuit, self._helper)
         else:
             if method != 'minuit':
                 raise ValueError(f'unsupported optimization method {method}')
@@ -563,6 +642,192 @@ class MaxLikeFit(Fit):
 
         return MLEResult(minuit, self._helper)
 
+    def _batch_data(
+        self, data: Sequence[ObservationData | Sequence[ObservationData]]
+    ) -> tuple[dict[str, JAXArray], dict[str, JAXArray]]:
+        """Check and stack a batch of data to replace the observation data."""
+        if isinstance(data, ObservationData) or not isinstance(data, Sequence):
+            raise ValueError('data must be a sequence of Data')
+        if not data:
+            raise ValueError('data list is empty')
+
+        names = list(self._data)
+        batch: list[list[FixedData]] = []
+        for obs in data:
+            if isinstance(obs, ObservationData):
+                obs = [obs]
+            if len(obs) != len(names):
+                raise ValueError(
+                    f'each element of data must have {len(names)} datasets, '
+                    f'got {len(obs)}'
+                )
+            batch.append([d.get_fixed_data() for d in obs])
+
+        def same_response(d1: FixedData, d2: FixedData) -> bool:
+            if d1.resp_matrix is d2.resp_matrix:
+                return True
+            if d1.resp_matrix.shape != d2.resp_matrix.shape:
+                return False
+            if d1.response_sparse and d2.response_sparse:
+                return (d1.resp_matrix != d2.resp_matrix).nnz == 0
+            return np.array_equal(d1.response_matrix, d2.response_matrix)
+
+        def stack(batch_i: list[FixedData], attr: str) -> JAXArray:
+            return jnp.array([getattr(d, attr) for d in batch_i], float)
+
+        stacked = {}
+        fixed = {}
+        for i, name in enumerate(names):
+            d0 = self._data[name]
+            stat = self._stat[name]
+            batch_i = [b[i] for b in batch]
+            for d in batch_i:
+                if d.channel.size != d0.channel.size:
+                    raise ValueError(
+                        f'{d.name} data has {d.channel.size} channels, '
+                        f'but {d0.channel.size} channels are expected'
+                    )
+                if d.photon_egrid.shape != d0.photon_egrid.shape or not (
+                    np.allclose(d.photon_egrid, d0.photon_egrid)
+                ):
+                    raise ValueError(
+                        f'photon energy grid of {d.name} data does not match '
+                        f'that of {name} data'
+                    )
+                self._check_stat(d, stat)
+
+            if stat == 'chi2':
+                stacked[f'{name}_Non'] = stack(batch_i, 'net_counts')
+                fixed[f'{name}_spec_error'] = stack(batch_i, 'net_errors')
+            else:
+                stacked[f'{name}_Non'] = stack(batch_i, 'spec_counts')
+            if stat in _STATISTIC_WITH_BACK:
+                stacked[f'{name}_Noff'] = stack(batch_i, 'back_counts')
+            stacked[name] = stack(batch_i, 'ce')
+
+            fixed[f'{name}_area_scale'] = stack(batch_i, 'area_scale')
+            fixed[f'{name}_exposure'] = stack(batch_i, 'spec_exposure')
+            if stat in {'pstat', 'pgstat', 'wstat'}:
+                fixed[f'{name}_back_ratio'] = stack(batch_i, 'back_ratio')
+            if stat == 'pstat':
+                fixed[f'{name}_back_counts'] = stack(batch_i, 'back_counts')
+            elif stat == 'pgstat':
+                fixed[f'{name}_back_error'] = stack(batch_i, 'back_errors')
+
+            # the response is folded in dense format if not shared by batch
+            if not all(same_response(d, d0) for d in batch_i):
+                fixed[f'{name}_resp'] = jnp.array(
+                    [d.response_matrix.T for d in batch_i], float
+                )
+
+        return stacked, fixed
+
+    def batch_mle(
+        self,
+        data: Sequence[ObservationData | Sequence[ObservationData]],
+        init: ArrayLike | dict | None = None,
+        parallel: bool = True,
+        n_parallel: int | None = None,
+        progress: bool = True,
+        update_rate: int = 50,
+    ) -> BatchMLEResult:
+        """Search MLE for each element of a batch of data.
+
+        The model, likelihood and optimizer are compiled once, and then used
+        to fit all elements of the batch with Levenberg-Marquardt algorithm.
+        This is much faster than creating a :class:`MaxLikeFit` for each
+        spectrum, e.g., when fitting time-resolved spectra.
+
+        Parameters
+        ----------
+        data : sequence of Data or sequence of sequence of Data
+            The batch of data. Each element of the batch replaces the
+            observation data of the fit, and must have the same number of
+            channels and photon energy grid as the observation data. If the
+            fit has multiple datasets, each element must be a sequence of data
+            in the same order as the observation data.
+        init : dict, optional
+            Initial guess for the maximum likelihood estimation. The values
+            can be scalars, or arrays with the same length as `data`.
+        parallel : bool, optional
+            Whether to fit in parallel. The default is True.
+        n_parallel : int, optional
+            Number of parallel processes to use when `parallel` is ``True``.
+            Defaults to ``jax.local_device_count()``.
+        progress : bool, optional
+            Whether to display progress bar. The default is True.
+        update_rate : int, optional
+            The update rate of progress bar. The default is 50.
+
+        Returns
+        -------
+        BatchMLEResult
+            The MLE results of the batch.
+
+        Notes
+        -----
+        The exposure, area scaling, background and response of each element
+        can differ from those of the observation data. When the response
+        matrices of the batch are not identical, they are stacked in the dense
+        format, which may require a large amount of memory.
+        """
+        helper = self._helper
+        data, fixed = self._batch_data(data)
+        n = len(data[helper.data_names[0]])
+
+        if init is None:
+            init = helper.free_default['constr_dic']
+        else:
+            init = helper.free_default['constr_dic'] | dict(init)
+        init = {k: jnp.broadcast_to(v, (n,)) for k, v in init.items()}
+
+        # pad the batch to be divided by the number of parallel processes
+        n_parallel = get_parallel_number(n_parallel)
+        npad = -n % n_parallel if parallel else 0
+        if npad:
+            pad = lambda x: jnp.concatenate([x, jnp.repeat(x[-1:], npad, 0)])
+            init, data, fixed = jax.tree.map(pad, (init, data, fixed))
+
+        with jax_pmap_shmap_merge(False):
+            result = helper.batch_fit(
+                init,
+                data,
+                parallel,
+                n_parallel,
+                progress,
+                update_rate,
+                'Fitting',
+                fixed,
+            )
+        result.pop('fixed', None)
+        result = jax.tree.map(lambda x: x[:n], result)
+        fixed = jax.tree.map(lambda x: x[:n], fixed)
+
+        params = result['params']
+        free = {k: params[k] for k in helper.params_names['free']}
+        covar = helper.batch_covar(free, result['data'], fixed)
+        error = jnp.sqrt(jnp.diagonal(covar, axis1=-2, axis2=-1))
+
+        k = helper.nparam
+        ndata = helper.ndata['total']
+        stat = result['deviance']['total']
+        deviance = {
+            'total': stat,
+            'group': result['deviance']['group'],
+        }
+        names = helper.params_names['all']
+        return BatchMLEResult(
+            mle={i: np.array(params[i]) for i in names},
+            error=dict(zip(names, np.array(error.T), strict=True)),
+            covar=np.array(covar),
+            models=jax.tree.map(np.array, result['models']),
+            deviance=jax.tree.map(np.array, deviance),
+            aic=np.array(stat + k * 2 * (1 + (k + 1) / (ndata - k - 1))),
+            bic=np.array(stat + k * np.log(ndata)),
+            dof=helper.dof,
+            valid=np.array(result['valid']),
+        )
+
 
 class BayesFit(Fit):
     _tab_config = ('Bayesian Fit', frozenset({'Bound'}))
@@ -599,14 +864,7 @@ class BayesFit(Fit):
 
         # coords and dims of arviz.InferenceData
         coords = dict(helper.channels)
-
-        dims = {'channels': ['channel']}
-        for i in helper.data_names:
-            dim = [f'{i}_channel']
-            dims[i] = dims[f'{i}_Non'] = dims[f'{i}_Non_model'] = dim
-
-            if f'{i}_Noff' in obs_data:
-                dims[f'{i}_Noff'] = dims[f'{i}_Noff_model'] = dim
+        dims = _get_idata_dims(helper)
 
         # additional attrs for each group of arviz.InferenceData
         if attrs is None:
@@ -722,13 +980,24 @@ class BayesFit(Fit):
 
         return ess, reff
 
-    def _generate_result_from_numpyro(
-        self,
-        sampler: MCMC,
-        kernel_library: str = 'numpyro',
-    ) -> PosteriorResult:
-        samples = sampler.get_samples(group_by_chain=True)
+    @staticmethod
+    def _get_sample_stats(sampler: MCMC) -> dict[str, NDArray]:
+        rename = {'num_steps': 'n_steps'}
+        sample_stats = {}
+        for k, v in sampler.get_extra_fields(group_by_chain=True).items():
+            name = rename.get(k, k)
+            value = jax.device_get(v).copy()
+            sample_stats[name] = value
+
+        if 'tree_depth' not in sample_stats and 'num_steps' in sample_stats:
+            num_steps = sample_stats['num_steps']
+            sample_stats['tree_depth'] = np.log2(num_steps).astype(int) + 1
+
+        return sample_stats
 
+    @staticmethod
+    def _reshape_numpyro_samples(sampler: MCMC, samples: dict) -> dict:
+        """Merge the walkers into the draws for numpyro ensemble samplers."""
         if isinstance(sampler.sampler, NumpyroEnsembleSampler):
             samples = jax.tree.map(lambda x: jnp.swapaxes(x, 1, 2), samples)
             samples = jax.tree.map(
@@ -738,19 +1007,21 @@ class BayesFit(Fit):
                 ),
                 samples,
             )
+        return samples
 
-        # sample stats
-        rename = {'num_steps': 'n_steps'}
-        sample_stats = {}
-        for k, v in sampler.get_extra_fields(group_by_chain=True).items():
-            name = rename.get(k, k)
-            value = jax.device_get(v).copy()
-            sample_stats[name] = value
-
-        if 'tree_depth' not in sample_stats and 'num_steps' in sample_stats:
-            num_steps = sample_stats['num_steps']
-            sample_stats['tree_depth'] = np.log2(num_steps).astype(int) + 1
+    def _generate_result_from_numpyro(
+        self,
+        sampler: MCMC,
+        kernel_library: str = 'numpyro',
+        samples: dict[str, Array] | None = None,
+        sample_stats: dict[str, Array] | None = None,
+    ) -> PosteriorResult:
+        if samples is None:
+            samples = sampler.get_samples(group_by_chain=True)
+        samples = self._reshape_numpyro_samples(sampler, samples)
 
+        if sample_stats is None:
+            sample_stats = self._get_sample_stats(sampler)
         ess, reff = self._get_ess(samples, sampler.num_chains)
 
         return self._generate_results(
@@ -775,12 +1046,27 @@ class BayesFit(Fit):
         post_warmup_state: Any = None,
         extra_fields: tuple[str, ...] = (),
         kernel_library: str = 'numpyro',
+        store: str | None = None,
+        sites: Sequence[str] | None = None,
+        sites_thinning: int = 1,
+        block_size: int = 1000,
+        ess_target: int | None = None,
+        rhat_target: float | None = None,
+        warm_start: bool = False,
         **kernel_kwargs: dict,
     ):
         """Run the regular sampler of numpyro."""
         if not issubclass(kernel, MCMCKernel):
             raise ValueError('kernel must be a subclass of numpyro MCMCKernel')
 
+        if store is not None and issubclass(kernel, NumpyroEnsembleSampler):
+            raise ValueError('store is not supported for ensemble samplers')
+
+        if warm_start and issubclass(kernel, NumpyroEnsembleSampler):
+            raise ValueError(
+                'warm_start is not supported for ensemble samplers'
+            )
+
         warmup = int(warmup)
         steps = int(steps)
         thinning = int(thinning)
@@ -793,7 +1079,6 @@ class BayesFit(Fit):
 
         rng_key = jax.random.PRNGKey(self._helper.seed['mcmc'])
 
-        # TODO: option to let sampler starting from MLE
         if issubclass(kernel, NumpyroEnsembleSampler):
             # set randomize_split to True to improve mixing
             kernel_kwargs.setdefault('randomize_split', True)
@@ -822,6 +1107,19 @@ class BayesFit(Fit):
             init = dict(
                 zip(self._helper.params_names['free'], init, strict=True)
             )
+        elif warm_start and post_warmup_state is None:
+            # the warmup is skipped if the sampler continues from a state
+            rng_key, init_key = jax.random.split(rng_key, 2)
+            init, inverse_mass_matrix = self._warm_start_from_mle(
+                init=init,
+                chains=chains,
+                rng_key=init_key,
+                dense_mass=kernel_kwargs.get('dense_mass', False),
+            )
+            if inverse_mass_matrix is not None:
+                kernel_kwargs.setdefault(
+                    'inverse_mass_matrix', inverse_mass_matrix
+                )
         else:
             init_strategy = init_to_value(values=self._check_init(init))
             if init is not None:
@@ -830,20 +1128,279 @@ class BayesFit(Fit):
             else:
                 kernel_kwargs.setdefault('init_strategy', init_strategy)
 
+        converged = _get_convergence_fn(ess_target, rhat_target)
+        blocked = store is not None or converged is not None
+        if blocked:
+            block_size = min(int(block_size), steps)
+            if block_size < 1:
+                raise ValueError('block_size and steps must be positive')
+
         sampler = MCMC(
             kernel(**kernel_kwargs),
             num_warmup=warmup,
-            num_samples=steps * thinning,
+            num_samples=(block_size if blocked else steps) * thinning,
             num_chains=chains,
             thinning=thinning,
             chain_method=chain_method,
             progress_bar=progress,
         )
         self._set_numpyro_mcmc_post_warmup_state(sampler, post_warmup_state)
-        sampler.run(rng_key, extra_fields=extra_fields, init_params=init)
+
+        # reuse the compiled sampling loop between blocks
+        if blocked and chains > 1 and sampler.chain_method == 'parallel':
+            sampler.chain_method = _get_cached_pmap(sampler)
+
+        if store is not None:
+            return self._stream_numpyro_mcmc(
+                sampler=sampler,
+                rng_key=rng_key,
+                init=init,
+                steps=steps,
+                extra_fields=extra_fields,
+                kernel_library=kernel_library,
+                store=store,
+                sites=sites,
+                sites_thinning=sites_thinning,
+                converged=converged,
+            )
+
+        if converged is None:
+            sampler.run(rng_key, extra_fields=extra_fields, init_params=init)
+            return self._generate_result_from_numpyro(
+                sampler=sampler,
+                kernel_library=kernel_library,
+            )
+
+        # run until convergence, and keep the samples of each block
+        samples = []
+        sample_stats = []
+        blocks = self._iter_numpyro_blocks(
+            sampler, rng_key, init, steps, extra_fields
+        )
+        for _ in blocks:
+            samples.append(
+                jax.device_get(sampler.get_samples(group_by_chain=True))
+            )
+            sample_stats.append(self._get_sample_stats(sampler))
+            samples = [_concat_draws(samples)]
+            if self._numpyro_converged(sampler, samples[0], converged):
+                break
+
         return self._generate_result_from_numpyro(
             sampler=sampler,
             kernel_library=kernel_library,
+            samples=samples[0],
+            sample_stats=_concat_draws(sample_stats),
+        )
+
+    def _warm_start_from_mle(
+        self,
+        init: dict[str, float] | None,
+        chains: int,
+        rng_key: JAXArray,
+        dense_mass: bool | list[tuple[str, ...]],
+    ) -> tuple[dict[str, JAXArray], JAXArray | dict | None]:
+        """Get the initial values of chains and the inverse mass matrix from
+        the MLE and its covariance matrix in unconstrained space.
+
+        The initial values are drawn from the normal approximation around the
+        MLE. If the covariance matrix is not positive definite, all chains
+        start from the MLE and the inverse mass matrix is None.
+        """
+        helper = self._helper
+        names = helper.params_names['free']
+        unconstr_init = helper.constr_dic_to_unconstr_arr(
+            self._check_init(init)
+        )
+        mle, _ = self._optimize_lm(unconstr_init, throw=False)
+        cov = helper.unconstr_covar(mle)
+
+        if not jnp.all(jnp.isfinite(jnp.linalg.cholesky(cov))):
+            init = jnp.broadcast_to(mle, (chains, len(mle)))
+            inverse_mass_matrix = None
+        else:
+            init = jax.random.multivariate_normal(
+                rng_key, mle, cov, shape=(chains,)
+            )
+            # numpyro and blackjax flatten the latent sites in sorted order
+            idx = {name: i for i, name in enumerate(names)}
+            if isinstance(dense_mass, list):
+                inverse_mass_matrix = {}
+                for block in dense_mass:
+                    i = [idx[name] for name in block]
+                    inverse_mass_matrix[tuple(block)] = cov[np.ix_(i, i)]
+                blocks = set().union(*dense_mass)
+                remaining = tuple(sorted(set(names) - blocks))
+                if remaining:
+                    i = np.array([idx[name] for name in remaining])
+                    inverse_mass_matrix[remaining] = jnp.diag(cov)[i]
+            else:
+                i = [idx[name] for name in sorted(names)]
+                # the kernel takes the diagonal if dense_mass is False
+                inverse_mass_matrix = cov[np.ix_(i, i)]
+
+        if chains == 1:  # remove the chains dim if run a single sampler
+            init = init[0]
+        init = dict(zip(names, init.T, strict=True))
+        return init, inverse_mass_matrix
+
+    @staticmethod
+    def _iter_numpyro_blocks(
+        sampler: MCMC,
+        rng_key: JAXArray,
+        init: dict[str, JAXArray] | None,
+        steps: int,
+        extra_fields: tuple[str, ...],
+    ):
+        """Advance the chains of numpyro sampler block by block.
+
+        The warmup is run only once if the sampler has no post warmup state,
+        and each block continues the chains from the last state, so that the
+        draws are the same as a single run. The block size is given by the
+        number of samples of the sampler.
+        """
+        if sampler.post_warmup_state is None:
+            sampler.warmup(
+                rng_key, extra_fields=extra_fields, init_params=init
+            )
+
+        block_size = sampler.num_samples // sampler.thinning
+        for start in range(0, steps, block_size):
+            n = min(block_size, steps - start)
+            sampler.num_samples = n * sampler.thinning
+            sampler.run(
+                sampler.post_warmup_state.rng_key,
+                extra_fields=extra_fields,
+            )
+            sampler.post_warmup_state = sampler.last_state
+            yield
+
+    def _numpyro_converged(
+        self,
+        sampler: MCMC,
+        samples: dict[str, Array],
+        converged: Callable[[dict[str, Array]], bool],
+    ) -> bool:
+        """Check the convergence of free parameters of numpyro sampler."""
+        free = {k: samples[k] for k in self._helper.params_names['free']}
+        return converged(self._reshape_numpyro_samples(sampler, free))
+
+    def _stream_numpyro_mcmc(
+        self,
+        sampler: MCMC,
+        rng_key: JAXArray,
+        init: dict[str, JAXArray] | None,
+        steps: int,
+        extra_fields: tuple[str, ...],
+        kernel_library: str,
+        store: str,
+        sites: Sequence[str] | None,
+        sites_thinning: int,
+        converged: Callable[[dict[str, Array]], bool] | None = None,
+    ) -> PosteriorResult:
+        """Run the sampler of numpyro in blocks and stream samples to store.
+
+        The draws of each block are written to the HDF5 file in the layout of
+        :meth:`arviz.InferenceData.to_netcdf`, and then discarded, so the
+        memory usage is bounded by the block size. The result reads the
+        samples lazily from the file.
+        """
+        helper = self._helper
+        sites = [] if sites is None else list(sites)
+        sites_thinning = int(sites_thinning)
+        if sites_thinning < 1:
+            raise ValueError('sites_thinning must be positive')
+
+        # check the names of sites of the model
+        free = helper.free_default['unconstr_arr']
+        model_sites = jax.eval_shape(
+            lambda arr: constrain_fn(
+                model=helper.numpyro_model,
+                model_args=(),
+                model_kwargs={},
+                params=dict(
+                    zip(helper.params_names['free'], arr, strict=True)
+                ),
+                return_deterministic=True,
+            ),
+            free,
+        )
+        invalid = set(sites) - set(model_sites)
+        if invalid:
+            raise ValueError(f'no site named {sorted(invalid)} in the model')
+
+        attrs = {
+            'elisa_version': elisa_version,
+            'inference_library': kernel_library,
+            'inference_library_version': metadata.version(kernel_library),
+        }
+        writer = _PosteriorWriter(
+            path=store,
+            chains=sampler.num_chains,
+            channels=helper.channels,
+            attrs=attrs,
+        )
+
+        # the free parameters are kept to check the convergence
+        free = []
+        blocks = self._iter_numpyro_blocks(
+            sampler, rng_key, init, steps, extra_fields
+        )
+        with writer:
+            for _ in blocks:
+                samples = jax.device_get(
+                    sampler.get_samples(group_by_chain=True)
+                )
+                loglike = helper.get_loglike(samples)
+                sample_stats = self._get_sample_stats(sampler)
+                writer.append(
+                    posterior=helper.get_params(samples),
+                    log_likelihood={
+                        f'{k}_total': v for k, v in loglike['group'].items()
+                    }
+                    | {'total': loglike['total']},
+                    sample_stats=sample_stats,
+                    deterministic={k: samples[k] for k in sites},
+                    thinning=sites_thinning,
+                )
+                if converged is not None:
+                    free_names = helper.params_names['free']
+                    free.append({k: samples[k] for k in free_names})
+                    free = [_concat_draws(free)]
+                    if self._numpyro_converged(sampler, free[0], converged):
+                        break
+                del samples, loglike, sample_stats
+
+        # the parameters are scalars for each draw, which are loaded to
+        # calculate the effective sample size
+        with xr.open_dataset(
+            store, group='posterior', engine='h5netcdf'
+        ) as posterior:
+            ess, reff = self._get_ess(posterior.load(), sampler.num_chains)
+
+        # write groups that are not associated with draws
+        idata = az.from_dict(
+            observed_data=helper.obs_data,
+            coords=dict(helper.channels),
+            dims=_get_idata_dims(helper),
+            observed_data_attrs=attrs,
+        )
+        idata.observed_data.to_netcdf(
+            store, mode='a', group='observed_data', engine='h5netcdf'
+        )
+        xr.Dataset(ess | {'reff': reff}, attrs=attrs).to_netcdf(
+            store, mode='a', group='ess', engine='h5netcdf'
+        )
+        evidence = {'lnZ': np.nan, 'lnZ_error': np.nan}
+        xr.Dataset(evidence, attrs=attrs).to_netcdf(
+            store, mode='a', group='evidence', engine='h5netcdf'
+        )
+
+        return PosteriorResult(
+            helper=helper,
+            idata=az.from_netcdf(store, engine='h5netcdf'),
+            ml_optimize=self._optimize_lm,
+            sampler_state=sampler.last_state,
         )
 
     def nuts(
@@ -856,6 +1413,13 @@ class BayesFit(Fit):
         chain_method: str = 'parallel',
         progress: bool = True,
         post_warmup_state: HMCState | None = None,
+        store: str | None = None,
+        sites: Sequence[str] | None = None,
+        sites_thinning: int = 1,
+        block_size: int = 1000,
+        ess_target: int | None = None,
+        rhat_target: float | None = None,
+        warm_start: bool = False,
         **kwargs: dict,
     ) -> PosteriorResult:
         """Run :mod:`numpyro`'s implementation of No-U-Turn Sampler (NUTS).
@@ -887,6 +1451,44 @@ class BayesFit(Fit):
         post_warmup_state : HMCState, optional
             The state before the sampling phase. The sampling will start from
             the given state if provided.
+        store : str, optional
+            Path of an HDF5 file to stream the samples to. If provided, the
+            samples are drawn in blocks of `block_size` steps, each block is
+            written to the file and then discarded, and the result reads the
+            samples lazily from the file, so the memory usage is bounded
+            regardless of `steps`. Only the parameters, the total and group
+            log likelihood and the sample statistics are recorded at each
+            step, so the point-wise quantities, e.g. LOO, WAIC and the
+            posterior models in plots, are not available in the result.
+        sites : sequence of str, optional
+            Names of the deterministic sites of the model to record in the
+            ``deterministic`` group of `store`, e.g. ``'<data>_Non_model'``
+            and ``'<data>_loglike'``.
+        sites_thinning : int, optional
+            Record `sites` every `sites_thinning` steps. The default is 1.
+        block_size : int, optional
+            Number of steps of each block when `store`, `ess_target` or
+            `rhat_target` is provided. The default is 1000.
+        ess_target : int, optional
+            If provided, the chains are run in blocks of `block_size` steps
+            until the bulk and tail effective sample sizes of all free
+            parameters reach `ess_target`, and `steps` is then the maximum
+            number of steps. The warmup is run only once.
+        rhat_target : float, optional
+            If provided, the chains are run in blocks of `block_size` steps
+            until the R-hat of all free parameters is less than
+            `rhat_target`, and `steps` is then the maximum number of steps.
+            The warmup is run only once.
+        warm_start : bool, optional
+            Whether to search the MLE by Levenberg-Marquardt algorithm before
+            sampling, start the chains around the MLE, and initialize the
+            inverse mass matrix with the covariance matrix of the MLE in
+            unconstrained space, so that a much shorter `warmup` may be used.
+            The search of MLE starts from `init` if provided. The mass matrix
+            is still adapted during warmup, which can be disabled by setting
+            `adapt_mass_matrix` to ``False`` to only adapt the step size, and
+            is efficient when the posterior is close to normal. This is
+            ignored if `post_warmup_state` is provided. The default is False.
         **kwargs : dict
             Extra parameters passed to :class:`numpyro.infer.NUTS`.
             The default for `dense_mass` is ``True``.
@@ -915,6 +1517,13 @@ class BayesFit(Fit):
             chain_method=chain_method,
             progress=progress,
             post_warmup_state=post_warmup_state,
+            store=store,
+            sites=sites,
+            sites_thinning=sites_thinning,
+            block_size=block_size,
+            ess_target=ess_target,
+            rhat_target=rhat_target,
+            warm_start=warm_start,
             extra_fields=('energy', 'num_steps'),
             **kwargs,
         )
@@ -929,6 +1538,12 @@ class BayesFit(Fit):
         chain_method: str = 'parallel',
         progress: bool = True,
         post_warmup_state: BarkerMHState | None = None,
+        store: str | None = None,
+        sites: Sequence[str] | None = None,
+        sites_thinning: int = 1,
+        block_size: int = 1000,
+        ess_target: int | None = None,
+        rhat_target: float | None = None,
         **kwargs: dict,
     ) -> PosteriorResult:
         """Run :mod:`numpyro`'s implementation of ``BarkerMH`` sampler.
@@ -965,6 +1580,34 @@ class BayesFit(Fit):
         post_warmup_state : BarkerMHState, optional
             The state before the sampling phase. The sampling will start from
             the given state if provided.
+        store : str, optional
+            Path of an HDF5 file to stream the samples to. If provided, the
+            samples are drawn in blocks of `block_size` steps, each block is
+            written to the file and then discarded, and the result reads the
+            samples lazily from the file, so the memory usage is bounded
+            regardless of `steps`. Only the parameters, the total and group
+            log likelihood and the sample statistics are recorded at each
+            step, so the point-wise quantities, e.g. LOO, WAIC and the
+            posterior models in plots, are not available in the result.
+        sites : sequence of str, optional
+            Names of the deterministic sites of the model to record in the
+            ``deterministic`` group of `store`, e.g. ``'<data>_Non_model'``
+            and ``'<data>_loglike'``.
+        sites_thinning : int, optional
+            Record `sites` every `sites_thinning` steps. The default is 1.
+        block_size : int, optional
+            Number of steps of each block when `store`, `ess_target` or
+            `rhat_target` is provided. The default is 1000.
+        ess_target : int, optional
+            If provided, the chains are run in blocks of `block_size` steps
+            until the bulk and tail effective sample sizes of all free
+            parameters reach `ess_target`, and `steps` is then the maximum
+            number of steps. The warmup is run only once.
+        rhat_target : float, optional
+            If provided, the chains are run in blocks of `block_size` steps
+            until the R-hat of all free parameters is less than
+            `rhat_target`, and `steps` is then the maximum number of steps.
+            The warmup is run only once.
         **kwargs : dict
             Extra parameters passed to :class:`numpyro.infer.BarkerMH`.
             The default for `dense_mass` is ``True``.
@@ -991,6 +1634,12 @@ class BayesFit(Fit):
             chain_method=chain_method,
             progress=progress,
             post_warmup_state=post_warmup_state,
+            store=store,
+            sites=sites,
+            sites_thinning=sites_thinning,
+            block_size=block_size,
+            ess_target=ess_target,
+            rhat_target=rhat_target,
             **kwargs,
         )
 
@@ -1004,6 +1653,12 @@ class BayesFit(Fit):
         chain_method: str = 'parallel',
         progress: bool = True,
         post_warmup_state: SAState | None = None,
+        store: str | None = None,
+        sites: Sequence[str] | None = None,
+        sites_thinning: int = 1,
+        block_size: int = 1000,
+        ess_target: int | None = None,
+        rhat_target: float | None = None,
         **kwargs: dict,
     ) -> PosteriorResult:
         """Run :mod:`numpyro`'s implementation of Sample Adaptive (SA) MCMC.
@@ -1039,6 +1694,34 @@ class BayesFit(Fit):
         post_warmup_state : SAState, optional
             The state before the sampling phase. The sampling will start from
             the given state if provided.
+        store : str, optional
+            Path of an HDF5 file to stream the samples to. If provided, the
+            samples are drawn in blocks of `block_size` steps, each block is
+            written to the file and then discarded, and the result reads the
+            samples lazily from the file, so the memory usage is bounded
+            regardless of `steps`. Only the parameters, the total and group
+            log likelihood and the sample statistics are recorded at each
+            step, so the point-wise quantities, e.g. LOO, WAIC and the
+            posterior models in plots, are not available in the result.
+        sites : sequence of str, optional
+            Names of the deterministic sites of the model to record in the
+            ``deterministic`` group of `store`, e.g. ``'<data>_Non_model'``
+            and ``'<data>_loglike'``.
+        sites_thinning : int, optional
+            Record `sites` every `sites_thinning` steps. The default is 1.
+        block_size : int, optional
+            Number of steps of each block when `store`, `ess_target` or
+            `rhat_target` is provided. The default is 1000.
+        ess_target : int, optional
+            If provided, the chains are run in blocks of `block_size` steps
+            until the bulk and tail effective sample sizes of all free
+            parameters reach `ess_target`, and `steps` is then the maximum
+            number of steps. The warmup is run only once.
+        rhat_target : float, optional
+            If provided, the chains are run in blocks of `block_size` steps
+            until the R-hat of all free parameters is less than
+            `rhat_target`, and `steps` is then the maximum number of steps.
+            The warmup is run only once.
         **kwargs : dict
             Extra parameters passed to :class:`numpyro.infer.SA`.
             The default for `adapt_state_size` is ``5 * D``, where `D` is the
@@ -1067,6 +1750,12 @@ class BayesFit(Fit):
             chain_method=chain_method,
             progress=progress,
             post_warmup_state=post_warmup_state,
+            store=store,
+            sites=sites,
+            sites_thinning=sites_thinning,
+            block_size=block_size,
+            ess_target=ess_target,
+            rhat_target=rhat_target,
             **kwargs,
         )
 
@@ -1080,6 +1769,13 @@ class BayesFit(Fit):
         chain_method: str = 'parallel',
         progress: bool = True,
         post_warmup_state: HMCState | None = None,
+        store: str | None = None,
+        sites: Sequence[str] | None = None,
+        sites_thinning: int = 1,
+        block_size: int = 1000,
+        ess_target: int | None = None,
+        rhat_target: float | None = None,
+        warm_start: bool = False,
         **kwargs: dict,
     ) -> PosteriorResult:
         """Run :mod:`blackjax`'s implementation of No-U-Turn Sampler (NUTS).
@@ -1111,6 +1807,44 @@ class BayesFit(Fit):
         post_warmup_state : HMCState, optional
             The state before the sampling phase. The sampling will start from
             the given state if provided.
+        store : str, optional
+            Path of an HDF5 file to stream the samples to. If provided, the
+            samples are drawn in blocks of `block_size` steps, each block is
+            written to the file and then discarded, and the result reads the
+            samples lazily from the file, so the memory usage is bounded
+            regardless of `steps`. Only the parameters, the total and group
+            log likelihood and the sample statistics are recorded at each
+            step, so the point-wise quantities, e.g. LOO, WAIC and the
+            posterior models in plots, are not available in the result.
+        sites : sequence of str, optional
+            Names of the deterministic sites of the model to record in the
+            ``deterministic`` group of `store`, e.g. ``'<data>_Non_model'``
+            and ``'<data>_loglike'``.
+        sites_thinning : int, optional
+            Record `sites` every `sites_thinning` steps. The default is 1.
+        block_size : int, optional
+            Number of steps of each block when `store`, `ess_target` or
+            `rhat_target` is provided. The default is 1000.
+        ess_target : int, optional
+            If provided, the chains are run in blocks of `block_size` steps
+            until the bulk and tail effective sample sizes of all free
+            parameters reach `ess_target`, and `steps` is then the maximum
+            number of steps. The warmup is run only once.
+        rhat_target : float, optional
+            If provided, the chains are run in blocks of `block_size` steps
+            until the R-hat of all free parameters is less than
+            `rhat_target`, and `steps` is then the maximum number of steps.
+            The warmup is run only once.
+        warm_start : bool, optional
+            Whether to search the MLE by Levenberg-Marquardt algorithm before
+            sampling, start the chains around the MLE, and initialize the
+            inverse mass matrix with the covariance matrix of the MLE in
+            unconstrained space, so that a much shorter `warmup` may be used.
+            The search of MLE starts from `init` if provided. The mass matrix
+            is still adapted during warmup, which can be disabled by setting
+            `adapt_mass_matrix` to ``False`` to only adapt the step size, and
+            is efficient when the posterior is close to normal. This is
+            ignored if `post_warmup_state` is provided. The default is False.
         **kwargs : dict
             Extra parameters passed to :class:`BlackJAXNUTS`.
             The default for `dense_mass` is ``True``.
@@ -1138,6 +1872,13 @@ class BayesFit(Fit):
             chain_method=chain_method,
             progress=progress,
             post_warmup_state=post_warmup_state,
+            store=store,
+            sites=sites,
+            sites_thinning=sites_thinning,
+            block_size=block_size,
+            ess_target=ess_target,
+            rhat_target=rhat_target,
+            warm_start=warm_start,
             extra_fields=('energy', 'num_steps'),
             kernel_library='blackjax',
             **kwargs,
@@ -1154,6 +1895,9 @@ class BayesFit(Fit):
         n_parallel: int | None = None,
         progress: bool = True,
         post_warmup_state: EnsembleSamplerState | None = None,
+        block_size: int = 1000,
+        ess_target: int | None = None,
+        rhat_target: float | None = None,
         **kwargs: dict,
     ) -> PosteriorResult:
         """Run :mod:`numpyro`'s Affine-Invariant Ensemble Sampling (AIES).
@@ -1193,6 +1937,19 @@ class BayesFit(Fit):
             The state before the sampling phase. The sampling will start from
             the given state if provided. This does not take effect when
             `n_parallel`>=2.
+        block_size : int, optional
+            Number of steps of each block when `ess_target` or
+            `rhat_target` is provided. The default is 1000.
+        ess_target : int, optional
+            If provided, the chains are run in blocks of `block_size` steps
+            until the bulk and tail effective sample sizes of all free
+            parameters reach `ess_target`, and `steps` is then the maximum
+            number of steps. The warmup is run only once.
+        rhat_target : float, optional
+            If provided, the chains are run in blocks of `block_size` steps
+            until the R-hat of all free parameters is less than
+            `rhat_target`, and `steps` is then the maximum number of steps.
+            The warmup is run only once.
         **kwargs : dict
             Extra parameters passed to :class:`numpyro.infer.AIES`.
             The default for `moves` is ``{AIES.StretchMove(): 1.0}``.
@@ -1222,6 +1979,9 @@ class BayesFit(Fit):
             chain_method=chain_method,
             progress=progress,
             post_warmup_state=post_warmup_state,
+            block_size=block_size,
+            ess_target=ess_target,
+            rhat_target=rhat_target,
             **kwargs,
         )
 
@@ -1236,6 +1996,9 @@ class BayesFit(Fit):
         n_parallel: int | None = None,
         progress: bool = True,
         post_warmup_state: EnsembleSamplerState | None = None,
+        block_size: int = 1000,
+        ess_target: int | None = None,
+        rhat_target: float | None = None,
         **kwargs: dict,
     ) -> PosteriorResult:
         """Run :mod:`numpyro`'s Ensemble Slice Sampling (ESS).
@@ -1275,6 +2038,19 @@ class BayesFit(Fit):
             The state before the sampling phase. The sampling will start from
             the given state if provided. This does not take effect when
             `n_parallel`>=2.
+        block_size : int, optional
+            Number of steps of each block when `ess_target` or
+            `rhat_target` is provided. The default is 1000.
+        ess_target : int, optional
+            If provided, the chains are run in blocks of `block_size` steps
+            until the bulk and tail effective sample sizes of all free
+            parameters reach `ess_target`, and `steps` is then the maximum
+            number of steps. The warmup is run only once.
+        rhat_target : float, optional
+            If provided, the chains are run in blocks of `block_size` steps
+            until the R-hat of all free parameters is less than
+            `rhat_target`, and `steps` is then the maximum number of steps.
+            The warmup is run only once.
         **kwargs : dict
             Extra parameters passed to :class:`numpyro.infer.ESS`.
 
@@ -1304,9 +2080,60 @@ class BayesFit(Fit):
             chain_method=chain_method,
             progress=progress,
             post_warmup_state=post_warmup_state,
+            block_size=block_size,
+            ess_target=ess_target,
+            rhat_target=rhat_target,
             **kwargs,
         )
 
+    def _run_ensemble_sampler(
+        self,
+        sampler: EmceeSampler | ZeusSampler,
+        warmup: int,
+        steps: int,
+        block_size: int,
+        converged: Callable[[dict[str, Array]], bool] | None,
+        states: Sequence | None,
+        **kwargs: Any,
+    ) -> tuple[dict[str, Array], tuple]:
+        """Run the ensemble sampler, in blocks if convergence is checked."""
+        if converged is None:
+            return sampler.run(
+                warmup=warmup, steps=steps, states=states, **kwargs
+            )
+
+        # the process backend would spawn the workers again for each block
+        if kwargs.get('backend', 'process') != 'jax':
+            raise ValueError(
+                "backend='jax' is required when ess_target or rhat_target "
+                'is provided'
+            )
+
+        steps = int(steps)
+        block_size = min(int(block_size), steps)
+        if block_size < 1:
+            raise ValueError('block_size and steps must be positive')
+
+        # the warmup is skipped once the states are given, and the tuned
+        # scale factor of moves is carried by the states
+        free = self._helper.params_names['free']
+        samples = []
+        for start in range(0, steps, block_size):
+            n = min(block_size, steps - start)
+            block, states = sampler.run(
+                warmup=warmup, steps=n, states=states, **kwargs
+            )
+            samples.append(block)
+            samples = [
+                {
+                    k: np.concatenate([b[k] for b in samples], axis=1)
+                    for k in block
+                }
+            ]
+            if converged({k: samples[0][k] for k in free}):
+                break
+        return samples[0], states
+
     def emcee(
         self,
         warmup: int = 5000,
@@ -1321,6 +2148,10 @@ class BayesFit(Fit):
         ignore_nan: bool = False,
         warmup_kwargs: dict | None = None,
         sampling_kwargs: dict | None = None,
+        backend: Literal['process', 'jax'] = 'process',
+        block_size: int = 1000,
+        ess_target: int | None = None,
+        rhat_target: float | None = None,
     ) -> PosteriorResult:
         """Run :mod:`emcee`'s affine-invariant ensemble sampling.
 
@@ -1371,6 +2202,30 @@ class BayesFit(Fit):
         sampling_kwargs: dict | None = None,
             Extra parameters passed to :class:`emcee.EnsembleSampler` for
             sampling phase.
+        backend : {'process', 'jax'}, optional
+            The backend to run samplers. ``'process'`` runs each sampler with
+            :mod:`emcee` in a spawned process. ``'jax'`` runs all samplers in
+            the current process, advancing all walkers in one vectorized JAX
+            call per step, with samplers sharded across devices. The JAX
+            backend supports the stretch and DE moves via ``moves`` in
+            `warmup_kwargs` and `sampling_kwargs`. The default is
+            ``'process'``.
+        block_size : int, optional
+            Number of steps of each block when `ess_target` or
+            `rhat_target` is provided. The default is 1000.
+        ess_target : int, optional
+            If provided, the chains are run in blocks of `block_size` steps
+            until the bulk and tail effective sample sizes of all free
+            parameters reach `ess_target`, and `steps` is then the maximum
+            number of steps. The warmup is run only once, and the tuned
+            parameters of moves are kept between blocks. This requires
+            ``backend='jax'``.
+        rhat_target : float, optional
+            If provided, the chains are run in blocks of `block_size` steps
+            until the R-hat of all free parameters is less than
+            `rhat_target`, and `steps` is then the maximum number of steps.
+            The warmup is run only once, and the tuned parameters of moves
+            are kept between blocks. This requires ``backend='jax'``.
 
         Returns
         -------
@@ -1392,9 +2247,12 @@ class BayesFit(Fit):
             ignore_nan=ignore_nan,
             seed=self._helper.seed['mcmc'],
         )
-        samples, states = sampler.run(
+        samples, states = self._run_ensemble_sampler(
+            sampler=sampler,
             warmup=warmup,
             steps=steps,
+            block_size=block_size,
+            converged=_get_convergence_fn(ess_target, rhat_target),
             chains=chains,
             thinning=thinning,
             n_parallel=n_parallel,
@@ -1403,6 +2261,7 @@ class BayesFit(Fit):
             states=post_warmup_state,
             warmup_kwargs=warmup_kwargs,
             sampling_kwargs=sampling_kwargs,
+            backend=backend,
         )
         ess, reff = self._get_ess(samples, n_parallel)
         return self._generate_results(
@@ -1427,6 +2286,10 @@ class BayesFit(Fit):
         ignore_nan: bool = False,
         warmup_kwargs: dict | None = None,
         sampling_kwargs: dict | None = None,
+        backend: Literal['process', 'jax'] = 'process',
+        block_size: int = 1000,
+        ess_target: int | None = None,
+        rhat_target: float | None = None,
     ) -> PosteriorResult:
         """Run :mod:`zeus`' ensemble slice sampling.
 
@@ -1477,6 +2340,30 @@ class BayesFit(Fit):
         sampling_kwargs: dict | None = None,
             Extra parameters passed to :class:`zeus.EnsembleSampler` for
             sampling phase.
+        backend : {'process', 'jax'}, optional
+            The backend to run samplers. ``'process'`` runs each sampler with
+            :mod:`zeus` in a spawned process. ``'jax'`` runs all samplers in
+            the current process, advancing all walkers in one vectorized JAX
+            call per step, with samplers sharded across devices. The JAX
+            backend supports the differential move via ``moves`` in
+            `warmup_kwargs` and `sampling_kwargs`. The default is
+            ``'process'``.
+        block_size : int, optional
+            Number of steps of each block when `ess_target` or
+            `rhat_target` is provided. The default is 1000.
+        ess_target : int, optional
+            If provided, the chains are run in blocks of `block_size` steps
+            until the bulk and tail effective sample sizes of all free
+            parameters reach `ess_target`, and `steps` is then the maximum
+            number of steps. The warmup is run only once, and the tuned
+            parameters of moves are kept between blocks. This requires
+            ``backend='jax'``.
+        rhat_target : float, optional
+            If provided, the chains are run in blocks of `block_size` steps
+            until the R-hat of all free parameters is less than
+            `rhat_target`, and `steps` is then the maximum number of steps.
+            The warmup is run only once, and the tuned parameters of moves
+            are kept between blocks. This requires ``backend='jax'``.
 
         Returns
         -------
@@ -1501,9 +2388,12 @@ class BayesFit(Fit):
             ignore_nan=ignore_nan,
             seed=self._helper.seed['mcmc'],
         )
-        samples, states = sampler.run(
+        samples, states = self._run_ensemble_sampler(
+            sampler=sampler,
             warmup=warmup,
             steps=steps,
+            block_size=block_size,
+            converged=_get_convergence_fn(ess_target, rhat_target),
             chains=chains,
             thinning=thinning,
             n_parallel=n_parallel,
@@ -1512,6 +2402,7 @@ class BayesFit(Fit):
             states=post_warmup_state,
             warmup_kwargs=warmup_kwargs,
             sampling_kwargs=sampling_kwargs,
+            backend=backend,
         )
         ess, reff = self._get_ess(samples, n_parallel)
         return self._generate_results(
@@ -1660,7 +2551,9 @@ class BayesFit(Fit):
                 with model computation.
         constructor_kwargs : dict, optional
             Extra parameters passed to
-            :class:`nautilus.Sampler`.
+            :class:`nautilus.Sampler`. The likelihood is evaluated in batches
+            across the local JAX devices, so ``pool`` is only used for the
+            sampler calculations.
         termination_kwargs : dict, optional
             Extra parameters passed to
             :class:`nautilus.Sampler.run()`.
@@ -1801,3 +2694,207 @@ class BayesFit(Fit):
             lnZ=lnZ,
             inference_library='ultranest',
         )
+
+
+def _concat_draws(blocks: list[dict[str, Array]]) -> dict[str, NDArray]:
+    """Concatenate blocks of samples of shape ``(chains, draws, ...)``."""
+    return jax.tree.map(lambda *x: np.concatenate(x, axis=1), *blocks)
+
+
+def _get_cached_pmap(sampler: MCMC) -> Callable[[Callable], Callable]:
+    """Get the chain method of numpyro MCMC that caches the pmap function.
+
+    numpyro MCMC creates a new function to pmap for each run, which is then
+    recompiled. The sampling loop depends only on the phase and the number
+    of steps, so the pmap function of the first run is reused when the
+    chains are continued in blocks of the same size.
+    """
+    cache = {}
+
+    def chain_method(fn: partial) -> Callable:
+        key = (
+            sampler.post_warmup_state is None,
+            sampler.num_warmup,
+            sampler.num_samples,
+            fn.keywords['collect_fields'],
+            fn.keywords['remove_sites'],
+        )
+        if key not in cache:
+            cache[key] = jax.pmap(fn)
+        return cache[key]
+
+    return chain_method
+
+
+def _get_convergence_fn(
+    ess_target: int | None,
+    rhat_target: float | None,
+) -> Callable[[dict[str, Array]], bool] | None:
+    """Get the function to check if the chains reach the targets.
+
+    The function returns True if the bulk and tail effective sample sizes
+    are not less than `ess_target`, and the rank-normalized split R-hat is
+    less than `rhat_target`, for all parameters of the given samples.
+    """
+    if ess_target is None and rhat_target is None:
+        return None
+
+    def converged(samples: dict[str, Array]) -> bool:
+        samples = az.convert_to_dataset(dict(samples))
+        if ess_target is not None:
+            for method in ['bulk', 'tail']:
+                ess = az.ess(samples, method=method)
+                if not all(v >= ess_target for v in ess.values()):
+                    return False
+        if rhat_target is not None:
+            rhat = az.rhat(samples)
+            if not all(v < rhat_target for v in rhat.values()):
+                return False
+        return True
+
+    return converged
+
+
+def _get_idata_dims(helper: Helper) -> dict[str, list[str]]:
+    """Get the dims of the point-wise variables of arviz.InferenceData."""
+    dims = {'channels': ['channel']}
+    for i in helper.data_names:
+        dim = [f'{i}_channel']
+        dims[i] = dims[f'{i}_Non'] = dims[f'{i}_Non_model'] = dim
+
+        if f'{i}_Noff' in helper.obs_data:
+            dims[f'{i}_Noff'] = dims[f'{i}_Noff_model'] = dim
+    return dims
+
+
+class _PosteriorWriter:
+    """Write posterior samples to HDF5 file block by block.
+
+    The file follows the netCDF layout used by
+    :meth:`arviz.InferenceData.to_netcdf`, the draw dimension of each group
+    is unlimited and is extended with each block.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file, which is overwritten.
+    chains : int
+        Number of chains.
+    channels : dict
+        Channel coordinates of datasets.
+    attrs : dict
+        Attributes of each group.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        chains: int,
+        channels: dict[str, NDArray],
+        attrs: dict[str, Any],
+    ):
+        import h5netcdf
+
+        self._file = h5netcdf.File(path, 'w')
+        self._chains = chains
+        self._channels = channels
+        self._attrs = attrs
+        self._ndraw = 0
+
+    def __enter__(self) -> _PosteriorWriter:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._file.close()
+
+    def _get_group(self, name: str):
+        if name in self._file.groups:
+            return self._file.groups[name]
+
+        group = self._file.create_group(name)
+        group.attrs.update(self._attrs)
+        group.dimensions = {'chain': self._chains, 'draw': None}
+        chain = group.create_variable('chain', ('chain',), np.int64)
+        chain[:] = np.arange(self._chains)
+        group.create_variable('draw', ('draw',), np.int64)
+        return group
+
+    def _create_dim(self, group, name: str, size: int) -> None:
+        if name in group.dimensions:
+            return
+
+        group.dimensions[name] = size
+        if name in self._channels:
+            import h5py
+
+            coord = group.create_variable(name, (name,), h5py.string_dtype())
+            coord[:] = np.asarray(self._channels[name], dtype=object)
+
+    def _get_dims(self, name: str, shape: tuple[int, ...]) -> tuple[str, ...]:
+        """Get the dims of the site by its name and shape."""
+        for data in self._channels:
+            prefix = data.removesuffix('_channel')
+            if (
+                name in (prefix, f'{prefix}_Non', f'{prefix}_Noff')
+                or name.startswith((f'{prefix}_Non_', f'{prefix}_Noff_'))
+                or name == f'{prefix}_loglike'
+            ) and (len(shape) == 1 and shape[0] == len(self._channels[data])):
+                return (data,)
+        return tuple(f'{name}_dim_{i}' for i in range(len(shape)))
+
+    def _write(
+        self,
+        name: str,
+        values: dict[str, NDArray],
+        draws: NDArray,
+    ) -> None:
+        group = self._get_group(name)
+        start = group.dimensions['draw'].size
+        stop = start + len(draws)
+        group.resize_dimension('draw', stop)
+        group.variables['draw'][start:stop] = draws
+        for k, v in values.items():
+            v = np.asarray(v)
+            # boolean is stored as int8 and decoded by xarray
+            is_bool = v.dtype == bool
+            if is_bool:
+                v = v.astype(np.int8)
+            if k not in group.variables:
+                dims = self._get_dims(k, v.shape[2:])
+                for d, n in zip(dims, v.shape[2:], strict=True):
+                    self._create_dim(group, d, n)
+                var = group.create_variable(
+                    k,
+                    ('chain', 'draw', *dims),
+                    v.dtype,
+                    chunks=(1, min(len(draws), 1024), *v.shape[2:]),
+                )
+                if is_bool:
+                    var.attrs['dtype'] = 'bool'
+            group.variables[k][:, start:stop] = v
+        self._file.flush()
+
+    def append(
+        self,
+        posterior: dict[str, NDArray],
+        log_likelihood: dict[str, NDArray],
+        sample_stats: dict[str, NDArray],
+        deterministic: dict[str, NDArray],
+        thinning: int,
+    ) -> None:
+        """Append a block of draws, of which the values are of shape
+        ``(chains, draws, ...)``.
+
+        The deterministic sites are recorded for every `thinning` draw.
+        """
+        n = len(next(iter(posterior.values()))[0])
+        draws = np.arange(self._ndraw, self._ndraw + n)
+        self._write('posterior', posterior, draws)
+        self._write('log_likelihood', log_likelihood, draws)
+        if sample_stats:
+            self._write('sample_stats', sample_stats, draws)
+        idx = np.flatnonzero(draws % thinning == 0)
+        if deterministic and len(idx):
+            deterministic = {k: v[:, idx] for k, v in deterministic.items()}
+            self._write('deterministic', deterministic, draws[idx])
+        self._ndraw += n
@@ -2,7 +2,13 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import threading
+import warnings
 from collections.abc import Callable, Iterable, Mapping, Sequence
+from operator import itemgetter
 from typing import Any, Literal, NamedTuple
 
 import jax
@@ -10,10 +16,13 @@ import jax.numpy as jnp
 import numpy as np
 import numpyro
 import optimistix as optx
+from iminuit import Minuit
+from iminuit.util import IMinuitWarning
 from jax import lax
 from numpyro import handlers
 from numpyro.distributions import Distribution
 from numpyro.infer.util import constrain_fn, unconstrain_fn
+from tqdm.auto import tqdm
 
 from elisa.data.base import FixedData
 from elisa.infer.likelihood import (
@@ -27,7 +36,13 @@ from elisa.infer.likelihood import (
     pstat,
     wstat,
 )
-from elisa.models.model import CompiledModel, ModelInfo, ParamSetup
+from elisa.infer.samplers.util import uniform_reparam_transform
+from elisa.models.model import (
+    CompiledModel,
+    ModelInfo,
+    ParamSetup,
+    compile_shared_eval,
+)
 from elisa.util.config import get_parallel_number
 from elisa.util.misc import (
     get_unit_latex,
@@ -125,6 +140,92 @@ def check_params(
 #     return reparam, inv
 
 
+# executables shared by helpers, keyed by the fingerprint of the lowered
+# program, which depends only on the structure of the model and data, the
+# least recently used one is evicted when the cache is full
+_EXECUTABLES: dict[str, Callable] = {}
+_EXECUTABLES_SIZE = 64
+_EXECUTABLES_LOCK = threading.Lock()
+
+
+def clear_shared_executables() -> None:
+    """Clear the cache of executables shared by fits.
+
+    The fits created afterwards compile their functions again, and the
+    existing fits keep using their own executables.
+    """
+    with _EXECUTABLES_LOCK:
+        _EXECUTABLES.clear()
+
+
+class _SharedJit:
+    """Function compiled by :func:`jit_shared`."""
+
+    def __init__(self, fn: Callable):
+        self._fn = fn
+        self._jitted = jax.jit(fn)
+        self._executables = {}
+
+    def __call__(self, *args):
+        leaves, treedef = jax.tree.flatten(args)
+        if any(isinstance(i, jax.core.Tracer) for i in leaves):
+            return self._jitted(*args)
+
+        leaves = [jnp.asarray(i) for i in leaves]
+        args = jax.tree.unflatten(treedef, leaves)
+        signature = (
+            treedef,
+            tuple((i.shape, i.dtype, i.weak_type) for i in leaves),
+        )
+        executable = self._executables.get(signature)
+        if executable is None:
+            lowered = self._jitted.lower(*args)
+            key = hashlib.sha256(lowered.as_text().encode()).hexdigest()
+            with _EXECUTABLES_LOCK:
+                executable = _EXECUTABLES.pop(key, None)
+            if executable is None:
+                executable = lowered.compile()
+            with _EXECUTABLES_LOCK:
+                # move to the end as the most recently used
+                _EXECUTABLES.pop(key, None)
+                _EXECUTABLES[key] = executable
+                if len(_EXECUTABLES) > _EXECUTABLES_SIZE:
+                    _EXECUTABLES.pop(next(iter(_EXECUTABLES)))
+            self._executables[signature] = executable
+        return executable(*args)
+
+    def __getstate__(self):
+        # executables cannot be pickled, and are re-compiled after unpickling
+        return {'fn': self._fn}
+
+    def __setstate__(self, state):
+        self.__init__(state['fn'])
+
+
+def jit_shared(fn: Callable) -> Callable:
+    """JIT compile a function, and share the executable among functions
+    lowered to the same program.
+
+    Unlike :func:`jax.jit`, whose cache is bound to the function object, the
+    executable is looked up by the fingerprint of the lowered program. The
+    functions created by different helpers of the same model structure,
+    statistic and data shapes thus reuse the executable, provided that the
+    data are passed as arguments rather than closure constants. The
+    function is traced as usual when transformed by JAX.
+
+    Parameters
+    ----------
+    fn : callable
+        The function to compile.
+
+    Returns
+    -------
+    callable
+        The compiled function.
+    """
+    return _SharedJit(fn)
+
+
 def get_helper(fit: Any) -> Helper:
     """Get helper functions for fitting."""
     model_info: ModelInfo = fit._model_info
@@ -265,7 +366,7 @@ def get_helper(fit: Any) -> Helper:
                 sampling_dist[name] = ('poisson', ())
 
     def simulate(
-        rng_seed: int,
+        rng_seed: int | np.random.Generator,
         model_values: dict[str, JAXArray],
         n: int = 1,
     ) -> dict[str, JAXArray]:
@@ -273,7 +374,10 @@ def get_helper(fit: Any) -> Helper:
         Use numpy.random instead of numpyro.infer.Predictive for performance.
         """
         models = {i: model_values[f'{i}_model'] for i in simulators.keys()}
-        rng = np.random.default_rng(int(rng_seed))
+        if isinstance(rng_seed, np.random.Generator):
+            rng = rng_seed
+        else:
+            rng = np.random.default_rng(int(rng_seed))
         sim = {k: v(rng, models[k], n) for k, v in simulators.items()}
         return get_counts_data(sim)
 
@@ -309,6 +413,21 @@ def get_helper(fit: Any) -> Helper:
     # get deterministic value getter function
     deterministic: dict[ParamID, Callable] = model_info.deterministic
 
+    # get the model function for each dataset, the model is specialized to the
+    # photon energy grid of the dataset, which is fixed during the fit, and the
+    # models on the same photon energy grid are evaluated together to share
+    # the evaluation of common components
+    egrid_to_names = {}
+    for k, v in data.items():
+        egrid = np.ascontiguousarray(v.photon_egrid, dtype=float)
+        key = (egrid.shape, hashlib.sha256(egrid.tobytes()).hexdigest())
+        egrid_to_names.setdefault(key, []).append(k)
+    model_fn = []
+    for names in egrid_to_names.values():
+        egrid = jnp.array(data[names[0]].photon_egrid, float)
+        fn = compile_shared_eval([model[k] for k in names], egrid)
+        model_fn.append((names, egrid, fn))
+
     # get the likelihood function for each dataset
     likelihood_wrapper = {
         'chi2': chi2,
@@ -317,9 +436,8 @@ def get_helper(fit: Any) -> Helper:
         'wstat': wstat,
         'pgstat': pgstat,
     }
-    likelihood: dict[str, Callable[[JAXArray], None]] = {
-        k: likelihood_wrapper[stat[k]](v, model[k].eval)
-        for k, v in data.items()
+    likelihood: dict[str, Callable[[JAXArray, bool], None]] = {
+        k: likelihood_wrapper[stat[k]](v) for k, v in data.items()
     }
 
     # get default re-parameterization of each parameter
@@ -360,11 +478,48 @@ def get_helper(fit: Any) -> Helper:
         for pid, fn in deterministic.items():
             numpyro.deterministic(pid_to_pname[pid], fn(params_id_values))
 
+        # evaluate the models on each photon energy grid once
+        unfold = {}
+        for names, egrid, fn in model_fn:
+            values = fn(egrid, params_name_values)
+            unfold |= dict(zip(names, values, strict=True))
+
         # the likelihood between observation and model for each dataset
         jax.tree.map(
-            lambda f: f(params_name_values, predictive=predictive),
+            lambda f, v: f(v, predictive=predictive),
             likelihood,
+            unfold,
+        )
+
+    # values of the data sites in the numpyro model, which are passed to the
+    # compiled functions as arguments, instead of being embedded as constants
+    data_sites = {}
+
+    def trace_data_sites():
+        model = handlers.seed(numpyro_model, 0)
+        model_trace = handlers.trace(model).get_trace()
+        data_sites.update(
+            (k, v['value'])
+            for k, v in model_trace.items()
+            if v['type'] == 'mutable'
+        )
+
+    # the data sites are concrete values, trace the model abstractly to avoid
+    # evaluating it eagerly
+    jax.eval_shape(trace_data_sites)
+
+    def jit_data(fn: Callable) -> Callable:
+        """JIT compile a function with the data sites as runtime arguments,
+        so that the executable is shared by fits with the same structure.
+
+        The function must not call JIT compiled functions that evaluate the
+        numpyro model, and the returned function must not be called inside a
+        :func:`numpyro.handlers.substitute` context.
+        """
+        compiled = jit_shared(
+            lambda data, *args: handlers.substitute(fn, data=data)(*args)
         )
+        return lambda *args: compiled(data_sites, *args)
 
     # ======================== create numpyro model ===========================
 
@@ -441,6 +596,20 @@ def get_helper(fit: Any) -> Helper:
         constr_arr = dic_to_arr(dic)
         return constr_arr_to_unconstr_arr(constr_arr)
 
+    prior_transform = [
+        uniform_reparam_transform(params_prior[i]) for i in free_names
+    ]
+
+    @jax.jit
+    def unit_cube_to_unconstr_arr(cube: JAXArray) -> JAXArray:
+        """Covert a point of unit hypercube to free parameters array in
+        unconstrained space, by the inverse CDF of parameters' priors.
+        """
+        constr_arr = jnp.array(
+            [f(q) for f, q in zip(prior_transform, cube, strict=True)], float
+        )
+        return constr_arr_to_unconstr_arr(constr_arr)
+
     # get default value of each parameter
     default_constr_dic = {
         pid_to_pname[k]: v for k, v in model_info.default.items()
@@ -529,12 +698,11 @@ def get_helper(fit: Any) -> Helper:
         params_dic = unconstr_dic_to_params_dic(unconstr_dic)
         return jnp.array([params_dic[i] for i in params_names])
 
-    @jax.jit
     def unconstr_covar(unconstr_arr: JAXArray) -> JAXArray:
         """Calculate covariance matrix of free parameters in unconstrained
         space, given a free parameters array in unconstrained space.
         """
-        hess = jax.jit(jax.hessian(deviance_total))(unconstr_arr)
+        hess = jax.hessian(deviance_total)(unconstr_arr)
         covar = jnp.linalg.inv(hess)
         return 2.0 * covar
 
@@ -550,13 +718,19 @@ def get_helper(fit: Any) -> Helper:
         jac = jax.jit(jax.jacobian(unconstr_arr_to_params_array))(unconstr_arr)
         return jac @ unconstr_cov @ jac.T
 
-    @jax.jit
     def get_mle(unconstr_arr: JAXArray) -> tuple[JAXArray, JAXArray]:
         """Get the value and covariance matrix of all parameters in constrained
         space, given MLE of free parameters in unconstrained space.
         """
-        params_arr = unconstr_arr_to_params_array(unconstr_arr)
-        params_cov = params_covar(unconstr_arr, unconstr_covar(unconstr_arr))
+
+        def params_arr_fn(arr):
+            params = get_sites(arr)['params']
+            return jnp.array([params[i] for i in params_names])
+
+        params_arr = params_arr_fn(unconstr_arr)
+        hess = jax.hessian(deviance_total)(unconstr_arr)
+        jac = jax.jacobian(params_arr_fn)(unconstr_arr)
+        params_cov = jac @ (2.0 * jnp.linalg.inv(hess)) @ jac.T
         return params_arr, params_cov
 
     # NOTE:
@@ -593,6 +767,14 @@ def get_helper(fit: Any) -> Helper:
         loglike_arr = jnp.hstack(list(loglike_dic['point'].values()))
         return jnp.sqrt(-2.0 * loglike_arr)
 
+    # deviance and its derivatives compiled for Minuit
+    deviance_fns = (
+        jit_data(deviance_total),
+        jit_data(jax.grad(deviance_total)),
+        jit_data(jax.hessian(deviance_total)),
+    )
+    deviance_fns[0].ndata = ndata['total']
+
     # =================== functions used in optimization ======================
 
     # =============== functions used in simulation procedure ==================
@@ -608,6 +790,8 @@ def get_helper(fit: Any) -> Helper:
         new_data = {
             f'{j}_data': sim_data[j][i] for v in data_group.values() for j in v
         }
+        if 'fixed' in result:
+            new_data |= jax.tree.map(lambda x: x[i], result['fixed'])
         new_residual = jax.jit(handlers.substitute(fn=residual, data=new_data))
         new_deviance = jax.jit(handlers.substitute(fn=deviance, data=new_data))
         new_sites = jax.jit(handlers.substitute(fn=get_sites, data=new_data))
@@ -665,6 +849,16 @@ def get_helper(fit: Any) -> Helper:
 
         return result, init
 
+    def fit_loop(result: dict, init: JAXArray) -> dict:
+        """Fit all simulation data in `result` with a single loop."""
+        n = len(result['valid'])
+        return lax.fori_loop(0, n, fit_once, (result, init))[0]
+
+    # cache the compiled loops, so that fitting chunks of the same size
+    # reuses the executable
+    fit_seq = jax.jit(fit_loop)
+    fit_par = jax.pmap(fit_loop)
+
     def fit_in_sequence(
         result: dict,
         init: JAXArray,
@@ -680,10 +874,9 @@ def get_helper(fit: Any) -> Helper:
                 n, 1, run_str=run_str, update_rate=update_rate
             )
             fn = pbar_factory(fit_once)
+            fit_jit = jax.jit(lambda *args: lax.fori_loop(0, n, fn, args)[0])
         else:
-            fn = fit_once
-
-        fit_jit = jax.jit(lambda *args: lax.fori_loop(0, n, fn, args)[0])
+            fit_jit = fit_seq
         result = fit_jit(result, init)
         return result
 
@@ -705,10 +898,12 @@ def get_helper(fit: Any) -> Helper:
                 n, n_parallel, run_str=run_str, update_rate=update_rate
             )
             fn = pbar_factory(fit_once)
+            fit_pmap = jax.pmap(
+                lambda *args: lax.fori_loop(0, batch, fn, args)[0]
+            )
         else:
-            fn = fit_once
+            fit_pmap = fit_par
 
-        fit_pmap = jax.pmap(lambda *args: lax.fori_loop(0, batch, fn, args)[0])
         reshape = lambda x: x.reshape((n_parallel, -1) + x.shape[1:])
         result = fit_pmap(
             jax.tree.map(reshape, result),
@@ -725,8 +920,9 @@ def get_helper(fit: Any) -> Helper:
         progress: bool = True,
         update_rate: int = 50,
         run_str: str = 'Fitting',
+        fixed: dict[str, JAXArray] | None = None,
     ) -> dict:
-        """Simulate data and then fit the simulation data.
+        """Fit a batch of data.
 
         Parameters
         ----------
@@ -746,6 +942,10 @@ def get_helper(fit: Any) -> Helper:
         run_str : str, optional
             The string to ahead progress bar during the run when `progress` is
             True. The default is 'Fitting'.
+        fixed : dict, optional
+            Values of the fixed data sites for each fit, e.g., exposure and
+            response matrix, which substitute the values of observations.
+            The leading dimension of the values must match that of `data`.
 
         Returns
         -------
@@ -792,6 +992,8 @@ def get_helper(fit: Any) -> Helper:
             },
             'valid': jnp.full(nsim, True, bool),
         }
+        if fixed:
+            result['fixed'] = fixed
 
         # fit simulation data
         if parallel:
@@ -805,6 +1007,40 @@ def get_helper(fit: Any) -> Helper:
 
         return result
 
+    def batch_covar(
+        params: dict[ParamName, JAXArray],
+        data: dict[str, JAXArray],
+        fixed: dict[str, JAXArray] | None = None,
+    ) -> JAXArray:
+        """Calculate covariance matrix of all parameters in constrained space,
+        given the MLE and data of each fit in a batch.
+
+        Parameters
+        ----------
+        params : dict
+            The MLE of free parameters in constrained space.
+        data : dict
+            The data corresponding to `params`.
+        fixed : dict, optional
+            Values of the fixed data sites for each fit.
+
+        Returns
+        -------
+        JAXArray
+            The covariance matrix of each fit.
+        """
+        free = jnp.array([params[k] for k in free_names], float).T
+        unconstr_arr = jax.vmap(constr_arr_to_unconstr_arr)(free)
+        sites = {f'{j}_data': data[j] for v in data_group.values() for j in v}
+        sites |= dict(fixed or {})
+
+        def covar(arr, sites_i):
+            dev = handlers.substitute(fn=deviance_total, data=sites_i)
+            hess = jax.hessian(dev)(arr)
+            return params_covar(arr, 2.0 * jnp.linalg.inv(hess))
+
+        return jax.jit(jax.vmap(covar))(unconstr_arr, sites)
+
     def simulate_and_fit(
         seed: int,
         free_params: dict[ParamName, JAXArray],
@@ -815,6 +1051,11 @@ def get_helper(fit: Any) -> Helper:
         progress: bool = True,
         update_rate: int = 50,
         run_str: str = 'Fitting',
+        chunk_size: int | None = None,
+        store: str | None = None,
+        deviance: dict | None = None,
+        resume: bool = True,
+        stop_fn: Callable[[dict], bool] | None = None,
     ) -> dict:
         """Simulate data and then fit the simulation data.
 
@@ -840,11 +1081,39 @@ def get_helper(fit: Any) -> Helper:
         run_str : str, optional
             The string to ahead progress bar during the run when `progress` is
             True. The default is 'Fitting'.
+        chunk_size : int, optional
+            If given, simulate and fit the data in chunks of this size, and
+            only keep the parameters, the total and group deviance, and the
+            validity of each fit in memory, so that the peak memory does not
+            grow with `n`. The chunk size is rounded up to a multiple of
+            `n_parallel` when `parallel` is ``True``.
+        store : str, optional
+            Path of an HDF5 file to which the full result of each chunk,
+            including the simulation data, models and point-wise deviance,
+            is appended. The file also serves as a checkpoint, recording the
+            number of completed fits and the state of random number
+            generator after each chunk. Requires `chunk_size`.
+        deviance : dict, optional
+            The observed deviance, used to accumulate :math:`p`-values of the
+            deviance chunk by chunk. Only used when `chunk_size` is given.
+        resume : bool, optional
+            Whether to resume from `store` if it exists, by default True.
+            The fits completed in `store` are reused, and only the remaining
+            simulations up to `n` are performed, so that an interrupted run
+            can be continued, or a finished run can be extended by a larger
+            `n`. If ``False``, `store` is overwritten.
+        stop_fn : callable, optional
+            Function called before each chunk with the result accumulated so
+            far, and the simulation stops early if it returns ``True``. Only
+            used when `chunk_size` is given.
 
         Returns
         -------
         result : dict
-            The simulation and fitting result.
+            The simulation and fitting result. When `chunk_size` is given,
+            the result contains only the parameters, the total and group
+            deviance, the validity, and the :math:`p`-values if `deviance`
+            is given.
         """
         model_values = {
             f'{k}_model': model_values[f'{k}_model'] for k in simulators
@@ -860,19 +1129,194 @@ def get_helper(fit: Any) -> Helper:
         assert all(i == shapes[0] for i in shapes)
         assert not (shapes[0] != () and n > 1)
 
-        # simulate data
-        sim_data = simulate(int(seed), model_values, int(n))
+        if store is not None and chunk_size is None:
+            raise ValueError('chunk_size is required to use store')
+
+        if chunk_size is None:
+            # simulate data
+            sim_data = simulate(int(seed), model_values, int(n))
+
+            # fit simulation data
+            return batch_fit(
+                free_params,
+                sim_data,
+                parallel,
+                n_parallel,
+                progress,
+                update_rate,
+                run_str,
+            )
 
-        # fit simulation data
-        return batch_fit(
-            free_params,
-            sim_data,
-            parallel,
-            n_parallel,
-            progress,
-            update_rate,
-            run_str,
+        chunk_size = int(chunk_size)
+        if chunk_size <= 0:
+            raise ValueError('chunk_size must be positive')
+        if parallel:
+            n_parallel = get_parallel_number(n_parallel)
+            chunk_size += -chunk_size % n_parallel
+
+        # model values are either a single one simulated n times, or a batch
+        # of model values each simulated once
+        batched = shapes[0] != ()
+        nsim = shapes[0][0] if batched else int(n)
+
+        # draw all chunks from the same generator
+        rng = np.random.default_rng(int(seed))
+        summary = {'params': [], 'total': [], 'group': [], 'valid': []}
+        exceed = None
+
+        def accumulate(result: dict):
+            """Accumulate summaries of fits of a chunk."""
+            nonlocal exceed
+            valid = result['valid']
+            dev = result['deviance']
+            summary['params'].append(result['params'])
+            summary['total'].append(dev['total'])
+            summary['group'].append(dev['group'])
+            summary['valid'].append(valid)
+            if deviance is not None:
+                count = jax.tree.map(
+                    lambda obs, sim: np.sum(sim[valid] >= obs, axis=0),
+                    deviance,
+                    dev,
+                )
+                if exceed is None:
+                    exceed = count
+                else:
+                    exceed = jax.tree.map(np.add, exceed, count)
+
+        def params_rep(start: int, stop: int) -> dict:
+            """Input parameters of simulations from start to stop."""
+            if batched:
+                take = itemgetter(slice(start, stop))
+                return jax.tree.map(lambda x: np.asarray(take(x)), free_params)
+            else:
+                shape = (stop - start,)
+                return {
+                    k: np.broadcast_to(v, shape)
+                    for k, v in free_params.items()
+                }
+
+        n_start = 0
+        file = None
+        if store is not None:
+            # h5py is imported here to avoid the cost when importing elisa
+            import h5py
+
+            if resume and os.path.exists(store):
+                file = h5py.File(store, 'a')
+                store_seed = int(file.attrs['seed'])
+                if store_seed != int(seed):
+                    file.close()
+                    raise ValueError(
+                        f'seed of {store} ({store_seed}) is different from '
+                        f'{int(seed)}'
+                    )
+
+                # start afresh if interrupted before the first checkpoint
+                if int(file.attrs['n']) == 0 or 'params_rep' not in file:
+                    file.close()
+                    file = None
+
+            if file is not None:
+                # discard fits not committed by the last checkpoint
+                n_done = int(file.attrs['n'])
+                _truncate_store(file, n_done)
+
+                # check the store is created by the same model setup
+                n_start = min(n_done, nsim)
+                stored = _read_store(file['params_rep'], slice(0, n_start))
+                if not all(
+                    np.array_equal(stored[k], v)
+                    for k, v in params_rep(0, n_start).items()
+                ):
+                    file.close()
+                    raise ValueError(
+                        f'{store} is created from different parameters'
+                    )
+
+                # rebuild summaries from stored fits
+                for i in range(0, n_start, chunk_size):
+                    sl = slice(i, min(i + chunk_size, n_start))
+                    accumulate(
+                        {
+                            'params': _read_store(file['params'], sl),
+                            'deviance': _read_store(file['deviance'], sl),
+                            'valid': file['valid'][sl],
+                        }
+                    )
+                rng.bit_generator.state = json.loads(file.attrs['rng_state'])
+            else:
+                file = h5py.File(store, 'w')
+                file.attrs['seed'] = int(seed)
+                file.attrs['n'] = 0
+                file.attrs['rng_state'] = json.dumps(rng.bit_generator.state)
+
+        def summarize() -> dict:
+            """Summarize the fits accumulated so far."""
+            concat = lambda *x: np.concatenate(x)
+            valid = np.concatenate(summary['valid'])
+            result = {
+                'params': jax.tree.map(concat, *summary['params']),
+                'deviance': {
+                    'total': np.concatenate(summary['total']),
+                    'group': jax.tree.map(concat, *summary['group']),
+                },
+                'valid': valid,
+            }
+            if exceed is not None:
+                n_valid = max(int(np.sum(valid)), 1)
+                result['p_value'] = jax.tree.map(lambda x: x / n_valid, exceed)
+            return result
+
+        bar = tqdm(
+            total=nsim, initial=n_start, desc=run_str, disable=not progress
         )
+        try:
+            for start in range(n_start, nsim, chunk_size):
+                if stop_fn is not None and start and stop_fn(summarize()):
+                    break
+
+                stop = min(start + chunk_size, nsim)
+                if batched:
+                    take = itemgetter(slice(start, stop))
+                    params_i = jax.tree.map(take, free_params)
+                    sim_data = simulate(
+                        rng, jax.tree.map(take, model_values), 1
+                    )
+                else:
+                    params_i = free_params
+                    sim_data = simulate(rng, model_values, stop - start)
+
+                # a chunk left by resuming may not be split across devices
+                result = batch_fit(
+                    params_i,
+                    sim_data,
+                    parallel and (stop - start) % n_parallel == 0,
+                    n_parallel,
+                    False,
+                    update_rate,
+                    run_str,
+                )
+                result = jax.device_get(result)
+                if file is not None:
+                    # checkpoint completed fits and the generator state
+                    result['params_rep'] = params_rep(start, stop)
+                    _append_to_store(file, result)
+                    file.attrs['n'] = stop
+                    file.attrs['rng_state'] = json.dumps(
+                        rng.bit_generator.state
+                    )
+                    file.flush()
+
+                accumulate(result)
+                del result, sim_data
+                bar.update(stop - start)
+        finally:
+            bar.close()
+            if file is not None:
+                file.close()
+
+        return summarize()
 
     # =============== functions used in simulation procedure ==================
 
@@ -908,20 +1352,97 @@ def get_helper(fit: Any) -> Helper:
         get_params=get_params,
         get_models=get_models,
         get_loglike=get_loglike,
-        get_mle=get_mle,
+        get_mle=jit_data(get_mle),
+        deviance_fns=deviance_fns,
+        unconstr_covar=jit_data(unconstr_covar),
         params_covar=params_covar,
         deviance_total=deviance_total,
         deviance=deviance,
         residual=residual,
         constr_arr_to_unconstr_arr=constr_arr_to_unconstr_arr,
         constr_dic_to_unconstr_arr=constr_dic_to_unconstr_arr,
+        unit_cube_to_unconstr_arr=unit_cube_to_unconstr_arr,
         unconstr_dic_to_params_dic=unconstr_dic_to_params_dic,
         simulate=simulate,
         simulate_and_fit=simulate_and_fit,
         batch_fit=batch_fit,
+        batch_covar=batch_covar,
+        data_sites=data_sites,
+        jit_data=jit_data,
     )
 
 
+def get_minuit(helper: Helper, unconstr_init: JAXArray) -> Minuit:
+    """Get Minuit minimizing total deviance, with the compiled gradient and
+    Hessian matrix of deviance.
+
+    Parameters
+    ----------
+    helper : Helper
+        The helper of the fit.
+    unconstr_init : ndarray
+        Initial value of free parameters in unconstrained space.
+
+    Returns
+    -------
+    Minuit
+        The Minuit instance.
+    """
+    deviance, grad, hessian = helper.deviance_fns
+
+    def hess(x):
+        return np.asarray(hessian(x))
+
+    with warnings.catch_warnings():
+        # Minuit still calls g2 if the Hessian is not positive definite,
+        # though it warns that g2 has no effect when hessian is given
+        warnings.simplefilter('ignore', IMinuitWarning)
+        return Minuit(
+            deviance,
+            np.array(unconstr_init, float),
+            grad=grad,
+            g2=lambda x: np.diagonal(hess(x)),
+            hessian=hess,
+            name=helper.params_names['free'],
+        )
+
+
+def _read_store(group, index: slice) -> dict:
+    """Read the slice of datasets of HDF5 group."""
+    return {
+        k: _read_store(v, index) if hasattr(v, 'keys') else v[index]
+        for k, v in group.items()
+    }
+
+
+def _truncate_store(group, n: int):
+    """Truncate datasets of HDF5 group to the first n entries."""
+    for v in group.values():
+        if hasattr(v, 'keys'):
+            _truncate_store(v, n)
+        elif v.shape[0] > n:
+            v.resize(n, axis=0)
+
+
+def _append_to_store(group, result: dict):
+    """Append the simulation and fitting result to datasets of HDF5 group."""
+    for k, v in result.items():
+        if isinstance(v, dict):
+            _append_to_store(group.require_group(k), v)
+            continue
+
+        v = np.asarray(v)
+        if k in group:
+            dataset = group[k]
+            n = dataset.shape[0]
+            dataset.resize(n + len(v), axis=0)
+            dataset[n:] = v
+        else:
+            group.create_dataset(
+                k, data=v, maxshape=(None,) + v.shape[1:], chunks=True
+            )
+
+
 class Helper(NamedTuple):
     """Helper for fitting and analysis."""
 
@@ -1016,6 +1537,20 @@ class Helper(NamedTuple):
     given MLE of free parameters in unconstrained space.
     """
 
+    deviance_fns: tuple[
+        Callable[[JAXArray], JAXFloat],
+        Callable[[JAXArray], JAXArray],
+        Callable[[JAXArray], JAXArray],
+    ]
+    """Compiled functions to calculate total deviance, and its gradient and
+    Hessian matrix, given free parameters array in unconstrained space.
+    """
+
+    unconstr_covar: Callable[[JAXArray], JAXArray]
+    """Calculate covariance matrix of free parameters in unconstrained space,
+    given a free parameters array in unconstrained space.
+    """
+
     params_covar: Callable[[JAXArray, JAXArray], JAXArray]
     """Calculate covariance matrix of all parameters in constrained space,
     given values and covariance matrix of free parameters in unconstrained
@@ -1047,6 +1582,11 @@ class Helper(NamedTuple):
     unconstrained space.
     """
 
+    unit_cube_to_unconstr_arr: Callable[[JAXArray], JAXArray]
+    """Covert a point of unit hypercube to free parameters array in
+    unconstrained space, by the inverse CDF of parameters' priors.
+    """
+
     unconstr_dic_to_params_dic: Callable[
         [ParamNameValMapping], ParamNameValMapping
     ]
@@ -1058,12 +1598,51 @@ class Helper(NamedTuple):
     """Function to simulate data."""
 
     simulate_and_fit: Callable[
-        [int, dict, dict, int, bool, int, bool, int, str], dict
+        [
+            int,
+            dict,
+            dict,
+            int,
+            bool,
+            int,
+            bool,
+            int,
+            str,
+            int | None,
+            str | None,
+            dict | None,
+            bool,
+            Callable[[dict], bool] | None,
+        ],
+        dict,
     ]
     """Function to simulate data and then fit the simulation data."""
 
     batch_fit: Callable[
-        [dict[str, JAXArray], dict[str, JAXArray], bool, int, bool, int, str],
+        [
+            dict[str, JAXArray],
+            dict[str, JAXArray],
+            bool,
+            int,
+            bool,
+            int,
+            str,
+            dict[str, JAXArray] | None,
+        ],
         dict,
     ]
-    """Function to fit simulation data."""
+    """Function to fit a batch of data."""
+
+    batch_covar: Callable[
+        [dict[str, JAXArray], dict[str, JAXArray], dict[str, JAXArray] | None],
+        JAXArray,
+    ]
+    """Function to calculate covariance matrix of each fit in a batch."""
+
+    data_sites: dict[str, Any]
+    """Values of the data sites in the numpyro model."""
+
+    jit_data: Callable[[Callable], Callable]
+    """JIT compile a function with the data sites as runtime arguments, so that
+    the executable is shared by fits with the same structure.
+    """
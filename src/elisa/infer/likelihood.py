@@ -12,17 +12,19 @@ from jax.experimental.sparse import BCSR
 from jax.scipy.special import xlogy
 from numpyro.distributions import Normal, Poisson
 from numpyro.distributions.util import validate_sample
+from scipy.sparse import csr_array
+
+from elisa.util.banded import BandedMatrix
 
 if TYPE_CHECKING:
     from collections.abc import Callable
+    from typing import Any
+
+    from numpy import ndarray as NDArray
+    from scipy.sparse import sparray
 
     from elisa.data.base import FixedData
-    from elisa.util.typing import (
-        ArrayLike,
-        JAXArray,
-        ModelCompiledFn,
-        ParamNameValMapping,
-    )
+    from elisa.util.typing import ArrayLike, JAXArray
 
 
 # TODO:
@@ -37,6 +39,10 @@ _STATISTIC_SPEC_NORMAL: frozenset[str] = frozenset({'chi2'})
 _STATISTIC_BACK_NORMAL: frozenset[str] = frozenset({'pgstat'})
 _STATISTIC_WITH_BACK: frozenset[str] = frozenset({'pgstat', 'wstat'})
 
+# per-element cost of folding in banded and BCSR format relative to dense
+_BANDED_COST = 4.0
+_BCSR_COST = 8.0
+
 
 def pgstat_background(
     s: ArrayLike,
@@ -174,43 +180,94 @@ class BetterPoisson(Poisson):
             return jnp.clip(logp - gof, max=0.0)
 
 
-def _get_resp_matrix(data: FixedData) -> JAXArray | BCSR:
-    if data.response_sparse:
-        return BCSR.from_scipy_sparse(data.sparse_matrix.T)
+def _resp_matrix_format(
+    matrix: NDArray | sparray,
+    sparse: bool = False,
+    band: tuple[NDArray, int] | None = None,
+) -> Literal['dense', 'bcsr', 'banded']:
+    """Select the format of the response matrix by the fill factors.
+
+    The cost of folding is estimated as the number of elements to process in
+    each format, i.e., the matrix size, the band size, and the number of
+    nonzero elements, weighted by the per-element cost relative to the dense
+    matrix-vector product. The dense format is excluded if `sparse` is True.
+    The band structure of the matrix is computed if `band` is not provided.
+    """
+    matrix = csr_array(matrix)
+    size = matrix.shape[0] * matrix.shape[1]
+    if band is None:
+        band = BandedMatrix.band_structure(matrix)
+    _, width = band
+    cost = {
+        'dense': size,
+        'banded': _BANDED_COST * matrix.shape[0] * width,
+        'bcsr': _BCSR_COST * matrix.nnz,
+    }
+    if sparse:
+        cost.pop('dense')
+    return min(cost, key=cost.get)
+
+
+def _get_resp_matrix(data: FixedData) -> JAXArray | BCSR | BandedMatrix:
+    """Get the transposed response matrix used to fold the model."""
+    matrix = data.resp_matrix.T
+    sparse = csr_array(matrix)
+    band = BandedMatrix.band_structure(sparse)
+    fmt = _resp_matrix_format(sparse, data.response_sparse, band)
+    if fmt == 'banded':
+        return BandedMatrix.from_scipy_sparse(sparse, band)
+    elif fmt == 'bcsr':
+        return BCSR.from_scipy_sparse(sparse)
+    elif data.response_sparse:
+        return jnp.array(matrix.toarray(), float)
     else:
-        return jnp.array(data.response_matrix.T, float)
+        return jnp.array(matrix, float)
+
+
+def _fixed_sites(name: str, **values: Any) -> dict[str, Any]:
+    """Define fixed data of the likelihood as mutable sites.
+
+    The sites are named ``f'{name}_{key}'``, and can be substituted by
+    :func:`numpyro.handlers.substitute` to fit spectra with different exposure,
+    area scaling, background and response to the same model.
+    """
+    return {
+        k: numpyro.primitives.mutable(f'{name}_{k}', v)
+        for k, v in values.items()
+    }
 
 
 def chi2(
     data: FixedData,
-    model: ModelCompiledFn,
-) -> Callable[[ParamNameValMapping, bool], None]:
+) -> Callable[[JAXArray, bool], None]:
     """S^2 statistic, Gaussian likelihood."""
     name = str(data.name)
     spec = jnp.array(data.net_counts, float)
     error = jnp.array(data.net_errors, float)
-    photon_egrid = jnp.array(data.photon_egrid, float)
     channel_width = jnp.array(data.channel_width, float)
     resp_matrix = _get_resp_matrix(data)
     area_scale = jnp.array(data.area_scale, float)
     exposure = jnp.array(data.spec_exposure, float)
 
-    def likelihood(
-        params: ParamNameValMapping,
-        predictive: bool = False,
-    ) -> None:
+    def likelihood(unfold: JAXArray, predictive: bool = False) -> None:
         """Gaussian likelihood defined via numpyro primitives."""
-        unfold = model(photon_egrid, params)
+        fixed = _fixed_sites(
+            name,
+            resp=resp_matrix,
+            area_scale=area_scale,
+            exposure=exposure,
+            spec_error=error,
+        )
         unfold = jnp.clip(unfold, min=1e-300, max=1e300)
-        source_rate = resp_matrix @ unfold * area_scale
+        source_rate = fixed['resp'] @ unfold * fixed['area_scale']
         numpyro.deterministic(name, source_rate / channel_width)
-        source_counts = source_rate * exposure
+        source_counts = source_rate * fixed['exposure']
         source_counts = jnp.clip(source_counts, min=1e-30, max=1e15)
         spec_data = numpyro.primitives.mutable(f'{name}_Non_data', spec)
         spec_model = numpyro.deterministic(f'{name}_Non_model', source_counts)
 
         with numpyro.plate(f'{name}_plate', len(spec)):
-            dist_on = BetterNormal(spec_model, error)
+            dist_on = BetterNormal(spec_model, fixed['spec_error'])
             numpyro.sample(
                 name=f'{name}_Non',
                 fn=dist_on,
@@ -229,27 +286,24 @@ def chi2(
 
 def cstat(
     data: FixedData,
-    model: ModelCompiledFn,
-) -> Callable[[ParamNameValMapping, bool], None]:
+) -> Callable[[JAXArray, bool], None]:
     """C-statistic, Poisson likelihood."""
     name = str(data.name)
     spec = jnp.array(data.spec_counts, float)
-    photon_egrid = jnp.array(data.photon_egrid, float)
     channel_width = jnp.array(data.channel_width, float)
     resp_matrix = _get_resp_matrix(data)
     area_scale = jnp.array(data.area_scale, float)
     exposure = jnp.array(data.spec_exposure, float)
 
-    def likelihood(
-        params: ParamNameValMapping,
-        predictive: bool = False,
-    ) -> None:
+    def likelihood(unfold: JAXArray, predictive: bool = False) -> None:
         """Poisson likelihood defined via numpyro primitives."""
-        unfold = model(photon_egrid, params)
+        fixed = _fixed_sites(
+            name, resp=resp_matrix, area_scale=area_scale, exposure=exposure
+        )
         unfold = jnp.clip(unfold, min=1e-300, max=1e300)
-        source_rate = resp_matrix @ unfold * area_scale
+        source_rate = fixed['resp'] @ unfold * fixed['area_scale']
         numpyro.deterministic(name, source_rate / channel_width)
-        source_counts = source_rate * exposure
+        source_counts = source_rate * fixed['exposure']
         source_counts = jnp.clip(source_counts, min=1e-30, max=1e15)
         spec_data = numpyro.primitives.mutable(f'{name}_Non_data', spec)
         spec_model = numpyro.deterministic(f'{name}_Non_model', source_counts)
@@ -274,31 +328,36 @@ def cstat(
 
 def pstat(
     data: FixedData,
-    model: ModelCompiledFn,
-) -> Callable[[ParamNameValMapping, bool], None]:
+) -> Callable[[JAXArray, bool], None]:
     """P-statistic, Poisson likelihood for data with a known background."""
     assert data.has_back, 'Data must have background'
 
     name = str(data.name)
     spec = jnp.array(data.spec_counts, float)
     back = jnp.array(data.back_counts, float)
-    photon_egrid = jnp.array(data.photon_egrid, float)
     channel_width = jnp.array(data.channel_width, float)
     resp_matrix = _get_resp_matrix(data)
     area_scale = jnp.array(data.area_scale, float)
     exposure = jnp.array(data.spec_exposure, float)
     back_ratio = jnp.array(data.back_ratio, float)
 
-    def likelihood(
-        params: ParamNameValMapping,
-        predictive: bool = False,
-    ) -> None:
+    def likelihood(unfold: JAXArray, predictive: bool = False) -> None:
         """Poisson likelihood defined via numpyro primitives."""
-        unfold = model(photon_egrid, params)
+        fixed = _fixed_sites(
+            name,
+            resp=resp_matrix,
+            area_scale=area_scale,
+            exposure=exposure,
+            back_ratio=back_ratio,
+            back_counts=back,
+        )
         unfold = jnp.clip(unfold, min=1e-300, max=1e300)
-        source_rate = resp_matrix @ unfold * area_scale
+        source_rate = fixed['resp'] @ unfold * fixed['area_scale']
         numpyro.deterministic(name, source_rate / channel_width)
-        model_counts = source_rate * exposure + back_ratio * back
+        model_counts = (
+            source_rate * fixed['exposure']
+            + fixed['back_ratio'] * fixed['back_counts']
+        )
         model_counts = jnp.clip(model_counts, min=1e-30, max=1e15)
         spec_data = numpyro.primitives.mutable(f'{name}_Non_data', spec)
         spec_model = numpyro.deterministic(f'{name}_Non_model', model_counts)
@@ -323,8 +382,7 @@ def pstat(
 
 def pgstat(
     data: FixedData,
-    model: ModelCompiledFn,
-) -> Callable[[ParamNameValMapping, bool], None]:
+) -> Callable[[JAXArray, bool], None]:
     """PG-statistic, Poisson likelihood for data and profile Gaussian
     likelihood for background.
     """
@@ -334,33 +392,43 @@ def pgstat(
     spec = jnp.array(data.spec_counts, float)
     back = jnp.array(data.back_counts, float)
     back_error = jnp.array(data.back_errors, float)
-    photon_egrid = jnp.array(data.photon_egrid, float)
     channel_width = jnp.array(data.channel_width, float)
     resp_matrix = _get_resp_matrix(data)
     area_scale = jnp.array(data.area_scale, float)
     exposure = jnp.array(data.spec_exposure, float)
     back_ratio = jnp.array(data.back_ratio, float)
 
-    def likelihood(params: ParamNameValMapping, predictive: bool = False):
+    def likelihood(unfold: JAXArray, predictive: bool = False) -> None:
         """Poisson and Gaussian likelihood defined via numpyro primitives."""
-        unfold = model(photon_egrid, params)
+        fixed = _fixed_sites(
+            name,
+            resp=resp_matrix,
+            area_scale=area_scale,
+            exposure=exposure,
+            back_ratio=back_ratio,
+            back_error=back_error,
+        )
         unfold = jnp.clip(unfold, min=1e-300, max=1e300)
-        source_rate = resp_matrix @ unfold * area_scale
+        source_rate = fixed['resp'] @ unfold * fixed['area_scale']
         numpyro.deterministic(name, source_rate / channel_width)
         spec_data = numpyro.primitives.mutable(f'{name}_Non_data', spec)
         back_data = numpyro.primitives.mutable(f'{name}_Noff_data', back)
-        source_counts = source_rate * exposure
+        source_counts = source_rate * fixed['exposure']
         source_counts = jnp.clip(source_counts, min=1e-30, max=1e15)
         b = pgstat_background(
-            source_counts, spec_data, back_data, back_error, back_ratio
+            source_counts,
+            spec_data,
+            back_data,
+            fixed['back_error'],
+            fixed['back_ratio'],
         )
-        spec_model = source_counts + back_ratio * b
+        spec_model = source_counts + fixed['back_ratio'] * b
         spec_model = numpyro.deterministic(f'{name}_Non_model', spec_model)
         back_model = numpyro.deterministic(f'{name}_Noff_model', b)
 
         with numpyro.plate(f'{name}_plate', len(spec_data)):
             dist_on = BetterPoisson(spec_model)
-            dist_off = BetterNormal(back_model, back_error)
+            dist_off = BetterNormal(back_model, fixed['back_error'])
             numpyro.sample(
                 name=f'{name}_Non',
                 fn=dist_on,
@@ -389,8 +457,7 @@ def pgstat(
 
 def wstat(
     data: FixedData,
-    model: ModelCompiledFn,
-) -> Callable[[ParamNameValMapping, bool], None]:
+) -> Callable[[JAXArray, bool], None]:
     """W-statistic, i.e. Poisson likelihood for data and profile Poisson
     likelihood for background.
     """
@@ -399,25 +466,32 @@ def wstat(
     name = str(data.name)
     spec = jnp.array(data.spec_counts, float)
     back = jnp.array(data.back_counts, float)
-    photon_egrid = jnp.array(data.photon_egrid, float)
     channel_width = jnp.array(data.channel_width, float)
     resp_matrix = _get_resp_matrix(data)
     area_scale = jnp.array(data.area_scale, float)
     exposure = jnp.array(data.spec_exposure, float)
     back_ratio = jnp.array(data.back_ratio, float)
 
-    def likelihood(params: ParamNameValMapping, predictive: bool = False):
+    def likelihood(unfold: JAXArray, predictive: bool = False) -> None:
         """Poisson and Poisson likelihood defined via numpyro primitives."""
-        unfold = model(photon_egrid, params)
+        fixed = _fixed_sites(
+            name,
+            resp=resp_matrix,
+            area_scale=area_scale,
+            exposure=exposure,
+            back_ratio=back_ratio,
+        )
         unfold = jnp.clip(unfold, min=1e-300, max=1e300)
-        source_rate = resp_matrix @ unfold * area_scale
+        source_rate = fixed['resp'] @ unfold * fixed['area_scale']
         numpyro.deterministic(name, source_rate / channel_width)
         spec_data = numpyro.primitives.mutable(f'{name}_Non_data', spec)
         back_data = numpyro.primitives.mutable(f'{name}_Noff_data', back)
-        source_counts = source_rate * exposure
+        source_counts = source_rate * fixed['exposure']
         source_counts = jnp.clip(source_counts, min=1e-30, max=1e15)
-        b = wstat_background(source_counts, spec_data, back_data, back_ratio)
-        model_counts = source_counts + back_ratio * b
+        b = wstat_background(
+            source_counts, spec_data, back_data, fixed['back_ratio']
+        )
+        model_counts = source_counts + fixed['back_ratio'] * b
         spec_model = numpyro.deterministic(f'{name}_Non_model', model_counts)
         back_model = numpyro.deterministic(f'{name}_Noff_model', b)
 
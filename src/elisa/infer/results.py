@@ -5,8 +5,10 @@ from __future__ import annotations
 import bz2
 import gzip
 import lzma
+import os
 import warnings
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, NamedTuple
 
 import arviz as az
@@ -15,15 +17,18 @@ import dill
 import jax
 import jax.numpy as jnp
 import numpy as np
+import optimistix as optx
 import scipy.stats as stats
 from arviz import InferenceData
 from astropy.cosmology import Planck18
+from contourpy import contour_generator
 from iminuit import Minuit
 from iminuit.util import Matrix as CovarMatrix
+from jax import lax
 from jax.experimental.mesh_utils import create_device_mesh
 from jax.sharding import Mesh, PartitionSpec
 
-from elisa.infer.helper import check_params
+from elisa.infer.helper import check_params, get_minuit
 from elisa.plot.plotter import MLEResultPlotter, PosteriorResultPlotter
 from elisa.util.config import (
     get_parallel_number,
@@ -43,7 +48,11 @@ if TYPE_CHECKING:
 
     from elisa.infer.helper import Helper
     from elisa.plot.plotter import Plotter
-    from elisa.util.typing import JAXArray
+    from elisa.util.typing import (
+        ArrayLike,
+        JAXArray,
+        NumPyArray as NDArray,
+    )
 
 
 class FitResult(ABC):
@@ -407,6 +416,11 @@ class MLEResult(FitResult):
         n_parallel: int | None = None,
         progress: bool = True,
         update_rate: int = 50,
+        chunk_size: int | None = None,
+        store: str | None = None,
+        resume: bool = True,
+        p_tol: float | None = None,
+        ci_tol: float | None = None,
     ):
         """Preform parametric bootstrap.
 
@@ -426,21 +440,73 @@ class MLEResult(FitResult):
             Whether to display progress bar. The default is True.
         update_rate : int, optional
             The update rate of progress bar. The default is 50.
+        chunk_size : int, optional
+            If given, simulate and fit in chunks of this size to keep memory
+            bounded. Only the parameters, the total and group deviance, and
+            the :math:`p`-values are then kept, so the per-channel bootstrap
+            bands and residuals are not available in plots.
+        store : str, optional
+            Path of an HDF5 file to store the full simulation and fitting
+            result of each chunk, which requires `chunk_size`. The file is
+            also a checkpoint of the run.
+        resume : bool, optional
+            Whether to resume from `store` if it exists. The fits completed
+            in `store` are reused, so an interrupted run can be continued by
+            the same call, and a finished run can be extended with a larger
+            `n`. The default is True.
+        p_tol : float, optional
+            If given, run the bootstrap in chunks and stop once the Monte
+            Carlo standard error of the total and group :math:`p`-values is
+            less than `p_tol`, in which case `n` is the maximum number of
+            bootstraps. The chunk size defaults to 256.
+        ci_tol : float, optional
+            Similar to `p_tol`, but stop once the Monte Carlo error of the
+            1σ interval endpoints of free parameters, relative to their
+            bootstrap standard deviation, is less than `ci_tol`. If both
+            `p_tol` and `ci_tol` are given, both must be satisfied.
         """
         n = int(n)
         n_parallel = get_parallel_number(n_parallel)
         if parallel and (n % n_parallel):
             n += n_parallel - n % n_parallel
 
-        # reuse the previous result if all setup is the same
-        if self._boot and self._boot.n == n and self._boot.seed == seed:
-            return
-
         helper = self._helper
         seed = helper.seed['pred'] if seed is None else int(seed)
-        params = {i: self._mle[i][0] for i in helper.params_names['free']}
+
+        adaptive = p_tol is not None or ci_tol is not None
+        if adaptive and chunk_size is None:
+            chunk_size = 256
+
+        # reuse the previous result if all setup is the same, otherwise the
+        # fits completed in the store are reused
+        if (
+            store is None
+            and not adaptive
+            and self._boot
+            and self._boot.n == n
+            and self._boot.seed == seed
+        ):
+            return
+
+        free = helper.params_names['free']
+        params = {i: self._mle[i][0] for i in free}
         models = self._model_values
 
+        def converged(result: dict) -> bool:
+            """Check if the Monte Carlo error is within tolerance."""
+            valid = result['valid']
+            if p_tol is not None:
+                p_value = result['p_value']
+                p_value = p_value['group'] | {'total': p_value['total']}
+                err = _p_value_error(p_value, np.sum(valid))
+                if max(err.values()) >= p_tol:
+                    return False
+            if ci_tol is not None:
+                err = _ci_error({k: result['params'][k][valid] for k in free})
+                if max(err.values()) >= ci_tol:
+                    return False
+            return True
+
         # perform parametric bootstrap
         with jax_pmap_shmap_merge(False):
             result = helper.simulate_and_fit(
@@ -453,23 +519,36 @@ class MLEResult(FitResult):
                 progress,
                 update_rate,
                 'Bootstrap',
+                chunk_size,
+                store,
+                self._deviance,
+                resume,
+                converged if adaptive else None,
             )
         valid = result.pop('valid')
+        p_value = result.pop('p_value', None)
+        # the error is reported as checked by the stopping rule
+        ci_error = _ci_error({k: result['params'][k][valid] for k in free})
         result = jax.tree.map(lambda x: x[valid], result)
+        if p_value is None:
+            p_value = jax.tree.map(
+                lambda obs, sim: np.sum(sim >= obs, axis=0) / len(sim),
+                self._deviance,
+                result['deviance'],
+            )
+        n_valid = np.sum(valid)
 
         self._boot = BootstrapResult(
             mle={k: v[0] for k, v in self.mle.items()},
-            data=result['data'],
-            models=result['models'],
+            data=result.get('data', {}),
+            models=result.get('models', {}),
             params=result['params'],
             deviance=result['deviance'],
-            p_value=jax.tree.map(
-                lambda obs, sim: np.sum(sim >= obs, axis=0) / len(sim),
-                self._deviance,
-                result['deviance'],
-            ),
-            n=n,
-            n_valid=np.sum(valid),
+            p_value=p_value,
+            p_value_error=_p_value_error(p_value, n_valid),
+            ci_error=ci_error,
+            n=len(valid),
+            n_valid=n_valid,
             seed=seed,
         )
 
@@ -503,7 +582,8 @@ class MLEResult(FitResult):
         method : {'hess', 'boot'}, optional
             Method used to calculate covariance. Available options are:
 
-                * ``'hess'``: inverse of Hessian matrix from Minuit
+                * ``'hess'``: inverse of the exact Hessian matrix of deviance
+                  at MLE, computed by JAX
                 * ``'boot'``: calculate covariance based on bootstrap samples,
                   :meth:`MLEResult.boot` must be called before using this
                   method.
@@ -589,7 +669,7 @@ class MLEResult(FitResult):
         cl: float | int = 1,
         params: str | Iterable[str] | None = None,
         fn: dict[str, Callable] | None = None,
-        method: Literal['profile', 'boot'] = 'profile',
+        method: Literal['profile', 'profile_batch', 'boot'] = 'profile',
         rtol: float | dict[str, float] = 1e-6,
         parallel: bool = True,
     ) -> ConfidenceInterval:
@@ -610,11 +690,16 @@ class MLEResult(FitResult):
             A dict containing functions to calculate the confidence intervals.
             The keys are the names of the function results, and the values are
             the functions whose input is a dict of model parameters.
-        method : {'profile', 'boot'}, optional
+        method : {'profile', 'profile_batch', 'boot'}, optional
             Method for calculating confidence intervals. Available options are:
 
                 * ``'profile'``: use Minos algorithm of Minuit to find the
                   confidence intervals based on the profile likelihood
+                * ``'profile_batch'``: find the confidence intervals based on
+                  the profile likelihood, by solving the constrained
+                  minimization of all parameters and `fn` at once with the
+                  vectorized Levenberg-Marquardt algorithm of
+                  :mod:`optimistix`
                 * ``'boot'``: use parametric bootstrap method to calculate
                   the confidence intervals. :meth:`MLEResult.boot` must be
                   called before using this method.
@@ -622,11 +707,12 @@ class MLEResult(FitResult):
             The default is ``'profile'``.
         rtol : float, or dict of float, optional
             The relative tolerance in determining the value of composite
-            parameters and `fn` when `method` is ``'profile'``.
-            The default is 1e-6.
+            parameters and `fn` when `method` is ``'profile'`` or
+            ``'profile_batch'``. The default is 1e-6.
         parallel : bool, optional
-            Whether to evaluate `fn` in parallel when `method` is ``'boot'``.
-            The default is True.
+            Whether to profile the parameters and `fn` in parallel threads
+            when `method` is ``'profile'``, or to evaluate `fn` in parallel
+            when `method` is ``'boot'``. The default is True.
 
         Returns
         -------
@@ -653,36 +739,49 @@ class MLEResult(FitResult):
         if np.any([i > 0.01 for i in rtol.values()]):
             raise ValueError('rtol must be less than 0.01')
 
+        def factory(k):
+            def _(p):
+                return p[k]
+
+            return _
+
         if method == 'profile':
             self._warn_invalid_fit()
             if not self._minuit.valid:
                 intervals, status = self._ci_invalid(params_set | fn.keys())
             else:
-                res1 = self._ci_free(free, cl) if free else ({}, {})
+                if free:
+                    res1 = self._ci_free(free, cl, parallel)
+                else:
+                    res1 = ({}, {})
 
                 if composite:
-
-                    def factory(k):
-                        def _(p):
-                            return p[k]
-
-                        return _
-
                     fn_composite = {k: factory(k) for k in composite}
-                    res2 = self._ci_fn(fn_composite, cl, rtol)
+                    res2 = self._ci_fn(fn_composite, cl, rtol, parallel)
                 else:
                     res2 = ({}, {})
 
-                res3 = self._ci_fn(fn, cl, rtol) if fn else ({}, {})
+                res3 = self._ci_fn(fn, cl, rtol, parallel) if fn else ({}, {})
 
                 intervals = res1[0] | res2[0] | res3[0]
                 status = res1[1] | res2[1] | res3[1]
 
+        elif method == 'profile_batch':
+            self._warn_invalid_fit()
+            if not self._minuit.valid:
+                intervals, status = self._ci_invalid(params_set | fn.keys())
+            else:
+                fn_all = {k: factory(k) for k in params} | fn
+                rtol_all = dict.fromkeys(free, 1e-6) | rtol
+                intervals, status = self._ci_batch(fn_all, cl, rtol_all)
+
         elif method == 'boot':
             intervals, status = self._ci_boot(cl, params, fn, parallel)
 
         else:
-            raise ValueError("method must be either 'profile' or 'boot'")
+            raise ValueError(
+                "method must be either 'profile', 'profile_batch' or 'boot'"
+            )
 
         params_mle = {k: v[0] for k, v in self._mle.items()}
         vars_names = params + list(fn.keys())
@@ -721,11 +820,34 @@ class MLEResult(FitResult):
         }
         return interval, status
 
-    def _ci_free(self, names: Iterable[str], cl: float | int):
+    def _ci_free(
+        self,
+        names: Iterable[str],
+        cl: float | int,
+        parallel: bool = False,
+    ):
         """Confidence interval of free parameters."""
-        self._minuit.minos(*names, cl=cl)
-        mle_unconstr = self._minuit.values.to_dict()
-        ci_unconstr = self._minuit.merrors
+        names = list(names)
+        if parallel and len(names) > 1:
+
+            def minos(name):
+                # Minuit is not thread-safe, so each thread profiles the
+                # parameter with its own Minuit sharing compiled deviance
+                minuit = get_minuit(self._helper, self._mle_unconstr)
+                minuit.strategy = self._minuit.strategy.strategy
+                minuit.migrad()
+                minuit.minos(name, cl=cl)
+                return minuit.values[name], minuit.merrors[name]
+
+            with ThreadPoolExecutor(_thread_number(len(names))) as executor:
+                res = dict(zip(names, executor.map(minos, names), strict=True))
+            mle_unconstr = self._minuit.values.to_dict()
+            mle_unconstr |= {k: v[0] for k, v in res.items()}
+            ci_unconstr = {k: v[1] for k, v in res.items()}
+        else:
+            self._minuit.minos(*names, cl=cl)
+            mle_unconstr = self._minuit.values.to_dict()
+            ci_unconstr = self._minuit.merrors
 
         # values of uninterested free parameters, in unconstrained space
         others = {k: v for k, v in mle_unconstr.items() if k not in names}
@@ -758,23 +880,28 @@ class MLEResult(FitResult):
         fn: dict[str, Callable],
         cl: float | int,
         rtol: dict[str, float],
+        parallel: bool = False,
     ):
         """Confidence intervals of function of free parameters."""
         params_mle = {k: v[0] for k, v in self._mle.items()}
         fn_mle = {k: v(params_mle) for k, v in fn.items()}
 
-        def get_minuit(name, mle, r) -> Minuit:
-            loss = self._loss_factory(fn[name], r)
-            grad = jax.jit(jax.grad(loss))
+        def get_joint_minuit(loss, grad, mle, r) -> Minuit:
             init = np.hstack([mle, self._minuit.values])
-            minuit = Minuit(loss, init, grad=grad)
+            minuit = Minuit(
+                lambda x: loss(x, r), init, grad=lambda x: grad(x, r)
+            )
             minuit.strategy = 2
             minuit.migrad()
             return minuit
 
         def get_minuit_iter_rtol(name, mle) -> Minuit:
+            # rtol is an argument of the loss, so the loss and its gradient
+            # are compiled only once when iterating over rtol
+            loss = self._loss_factory(fn[name])
+            grad = jax.jit(jax.grad(loss))
             rtol_desired = rtol[name]
-            minuit0 = get_minuit(name, mle, rtol_desired)
+            minuit0 = get_joint_minuit(loss, grad, mle, rtol_desired)
             if not minuit0.accurate:
                 # When profiling the likelihood, deviance difference for
                 # 1-sigma confidence interval is 1, thus the deviance
@@ -785,36 +912,46 @@ class MLEResult(FitResult):
                 rtol_max = np.min([0.01, 0.01 * rel_err, 100 * rtol_desired])
                 if rtol_desired < rtol_max:
                     for r in np.geomspace(rtol_desired, rtol_max, num=15)[1:]:
-                        minuit = get_minuit(name, mle, r)
+                        minuit = get_joint_minuit(loss, grad, mle, r)
                         if minuit.accurate:
                             return minuit
             return minuit0
 
-        interval = {}
-        status = {}
-        for name, mle in fn_mle.items():
+        def minos(name):
+            mle = fn_mle[name]
             minuit = get_minuit_iter_rtol(name, mle)
             minuit.minos(0, cl=cl)
             ci = minuit.merrors[0]
-            interval[name] = (mle + ci.lower, mle + ci.upper)
-            status[name] = {
+            interval = (mle + ci.lower, mle + ci.upper)
+            status = {
                 'valid': (ci.lower_valid, ci.upper_valid),
                 'at_limit': (ci.at_lower_limit, ci.at_upper_limit),
                 'at_max_fcn': (ci.at_lower_max_fcn, ci.at_upper_max_fcn),
                 'new_min': (ci.lower_new_min, ci.upper_new_min),
             }
+            return interval, status
 
+        names = list(fn_mle)
+        if parallel and len(names) > 1:
+            with ThreadPoolExecutor(_thread_number(len(names))) as executor:
+                res = list(executor.map(minos, names))
+        else:
+            res = list(map(minos, names))
+
+        interval = {k: v[0] for k, v in zip(names, res, strict=True)}
+        status = {k: v[1] for k, v in zip(names, res, strict=True)}
         return interval, status
 
-    def _loss_factory(self, fn: Callable, rtol: float):
+    def _loss_factory(self, fn: Callable):
         """Factory method to create joint loss of params and func of params.
 
+        The loss accepts the joint array of function value and free
+        parameters, and the relative tolerance of the function value.
+
         Parameters
         ----------
         fn : Callable
             Function accepts model parameters and outputs a single value.
-        rtol : float
-            Relative tolerance of the function value.
 
         References
         ----------
@@ -825,7 +962,7 @@ class MLEResult(FitResult):
         params_free = helper.params_names['free']
 
         @jax.jit
-        def loss(x: np.ndarray):
+        def loss(x: np.ndarray, rtol: float):
             """Joint loss of params and func of params."""
             unconstr_dic = dict(zip(params_free, x[1:], strict=True))
             params = helper.unconstr_dic_to_params_dic(unconstr_dic)
@@ -836,6 +973,159 @@ class MLEResult(FitResult):
 
         return loss
 
+    def _ci_batch(
+        self,
+        fn: dict[str, Callable],
+        cl: float | int,
+        rtol: dict[str, float],
+        max_iter: int = 30,
+    ):
+        """Confidence intervals of functions of parameters, by solving the
+        profile likelihood of all functions at once.
+
+        For each function and each side of the interval, the deviance is
+        minimized with the function value penalized to a target value, which
+        is the constrained minimization with the function value fixed to the
+        value of solution. The target values are updated by secant method
+        until the deviance difference reaches the critical value. The
+        minimizations of all functions and sides are solved in one call of
+        vectorized Levenberg-Marquardt algorithm in each iteration.
+        """
+        helper = self._helper
+        names = list(fn)
+        n = len(names)
+        params_names = helper.params_names['all']
+        free_names = helper.params_names['free']
+        params_mle = {k: v[0] for k, v in self._mle.items()}
+
+        def fn_arr(params_arr):
+            params = dict(zip(params_names, params_arr, strict=True))
+            return jnp.array([fn[k](params) for k in names], float)
+
+        params_arr = jnp.array([params_mle[k] for k in params_names])
+        jac = jax.jacobian(fn_arr)(params_arr)
+        fn_mle = np.array(fn_arr(params_arr))
+        fn_se = np.sqrt(np.diagonal(jac @ np.array(self._covar) @ jac.T))
+        scale = np.maximum(np.abs(fn_mle), fn_se)
+        scale *= np.sqrt([rtol[k] for k in names])
+
+        branches = [lambda p, f=fn[k]: jnp.asarray(f(p), float) for k in names]
+        lm_solver = optx.LevenbergMarquardt(rtol=0.0, atol=1e-6)
+
+        def constraint(i, x):
+            unconstr_dic = dict(zip(free_names, x, strict=True))
+            params = helper.unconstr_dic_to_params_dic(unconstr_dic)
+            return lax.switch(i, branches, params)
+
+        @jax.jit
+        @jax.vmap
+        def solve(x0, i, target, scale):
+            def residual(x, args):
+                penalty = (constraint(i, x) - target) / scale
+                return jnp.append(helper.residual(x), penalty)
+
+            res = optx.least_squares(
+                residual, lm_solver, x0, max_steps=1024, throw=False
+            )
+            x = res.value
+            return x, helper.deviance_total(x), constraint(i, x)
+
+        # each function has two sides, i.e. lower and upper bound
+        idx = np.repeat(np.arange(n, dtype=np.int32), 2)
+        side = np.tile([-1.0, 1.0], n)
+        z_crit = np.sqrt(stats.chi2.ppf(cl, 1))
+        dev_min = self._minuit.fval
+        scale = scale[idx]
+        mle = fn_mle[idx]
+        x_mle = np.array(self._mle_unconstr)
+        x = np.tile(x_mle, (2 * n, 1))
+        lo = [(m, 0.0, x_mle) for m in mle]  # inner points, z < z_crit
+        hi: list = [None] * (2 * n)  # outer points, z > z_crit or invalid
+        last = [(m, 0.0) for m in mle]
+        target = mle + side * z_crit * fn_se[idx]
+        converged = np.full(2 * n, False)
+        new_min = np.full(2 * n, False)
+        result = mle.copy()
+
+        for _ in range(max_iter):
+            x_new, dev, value = jax.device_get(solve(x, idx, target, scale))
+            for k in np.flatnonzero(~converged):
+                d = dev[k] - dev_min
+                if not (np.isfinite(d) and np.isfinite(value[k])):
+                    hi[k] = (target[k], np.inf)
+                    x[k] = lo[k][2]
+                else:
+                    new_min[k] |= d < -0.01
+                    z = np.sqrt(max(d, 0.0))
+                    # the secant is applied to the target rather than the
+                    # function value of solution, which is biased from the
+                    # target due to the penalty
+                    t = target[k]
+                    x[k] = x_new[k]
+                    if abs(z - z_crit) < 1e-3:
+                        converged[k] = True
+                        result[k] = value[k]
+                        continue
+                    if z < z_crit:
+                        lo[k] = (t, z, x_new[k])
+                    else:
+                        hi[k] = (t, z)
+                    t0, z0 = last[k]
+                    last[k] = (t, z)
+
+                    # secant step from the last two points
+                    if z != z0:
+                        step = (z_crit - z) * (t - t0) / (z - z0)
+                    else:
+                        step = np.nan
+                    target[k] = t + step
+
+                t_lo = lo[k][0]
+                if hi[k] is None:
+                    # extrapolate outwards with limited step
+                    dist = abs(t_lo - mle[k])
+                    t_max = t_lo + side[k] * max(3.0 * dist, fn_se[idx[k]])
+                    if not (side[k] * (target[k] - t_lo) > 0):
+                        target[k] = t_max
+                    elif side[k] * (target[k] - t_max) > 0:
+                        target[k] = t_max
+                else:
+                    # keep the target within the bracket
+                    t_hi, z_hi = hi[k]
+                    inside = (target[k] - t_lo) * (target[k] - t_hi) < 0
+                    if not np.isfinite(z_hi) or not inside:
+                        target[k] = 0.5 * (t_lo + t_hi)
+
+            if converged.all():
+                break
+
+        at_limit = np.array(
+            [
+                not c and h is not None and not np.isfinite(h[1])
+                for c, h in zip(converged, hi, strict=True)
+            ]
+        )
+        at_max_fcn = ~converged & ~at_limit
+        valid = converged & ~new_min
+        result[~converged] = target[~converged]
+        result = result.reshape(n, 2)
+        valid = valid.reshape(n, 2)
+        at_limit = at_limit.reshape(n, 2)
+        at_max_fcn = at_max_fcn.reshape(n, 2)
+        new_min = new_min.reshape(n, 2)
+
+        interval = {k: tuple(result[i]) for i, k in enumerate(names)}
+        status = {
+            k: {
+                'valid': tuple(map(bool, valid[i])),
+                'at_limit': tuple(map(bool, at_limit[i])),
+                'at_max_fcn': tuple(map(bool, at_max_fcn[i])),
+                'new_min': tuple(map(bool, new_min[i])),
+            }
+            for i, k in enumerate(names)
+        }
+        return interval, status
+
     def _ci_boot(
         self,
         cl: float | int,
@@ -907,6 +1197,227 @@ class MLEResult(FitResult):
 
         return interval, status
 
+    def profile(self, param: str, grid: ArrayLike) -> ProfileLikelihood:
+        """Calculate the profile likelihood of a free parameter on a grid.
+
+        At each grid point, the other free parameters are minimized with the
+        vectorized Levenberg-Marquardt algorithm of :mod:`optimistix`, which
+        solves all grid points at once and warm-starts each point from its
+        neighbours.
+
+        Parameters
+        ----------
+        param : str
+            Name of the free parameter.
+        grid : array_like
+            Parameter values on which to compute the profile likelihood.
+
+        Returns
+        -------
+        ProfileLikelihood
+            The profile likelihood.
+        """
+        grid = np.asarray(grid, float)
+        if grid.ndim != 1 or grid.size == 0:
+            raise ValueError('grid must be a non-empty 1D array')
+
+        n = grid.size
+        neighbors = np.arange(n)[:, None] + np.array([-1, 1])
+        neighbors[(neighbors < 0) | (neighbors >= n)] = -1
+        delta, params = self._profile_grid([param], grid[:, None], neighbors)
+        return ProfileLikelihood(
+            param=param,
+            grid=grid,
+            delta=delta,
+            params=params,
+        )
+
+    def contour(
+        self,
+        param1: str,
+        param2: str,
+        grid1: ArrayLike,
+        grid2: ArrayLike,
+        cl: float | int | Sequence[float | int] = (1, 2, 3),
+    ) -> ProfileContour:
+        """Calculate the confidence contours of two free parameters.
+
+        The profile likelihood is calculated on the grid, by minimizing the
+        other free parameters with the vectorized Levenberg-Marquardt
+        algorithm of :mod:`optimistix`, which solves all grid points at once
+        and warm-starts each point from its neighbours. The contours are then
+        extracted from the profile likelihood on the grid.
+
+        Parameters
+        ----------
+        param1, param2 : str
+            Names of the two free parameters.
+        grid1, grid2 : array_like
+            Values of `param1` and `param2` on which to compute the profile
+            likelihood.
+        cl : float, int, or sequence of them, optional
+            Confidence levels of the contours. If 0 < `cl` < 1, the value is
+            interpreted as the confidence level. If `cl` >= 1, it is
+            interpreted as the number of standard deviations. The default is
+            (1, 2, 3).
+
+        Returns
+        -------
+        ProfileContour
+            The profile likelihood and the confidence contours.
+        """
+        if param1 == param2:
+            raise ValueError('param1 and param2 must be different')
+
+        grid1 = np.asarray(grid1, float)
+        grid2 = np.asarray(grid2, float)
+        if grid1.ndim != 1 or grid1.size < 2:
+            raise ValueError('grid1 must be a 1D array of at least 2 values')
+        if grid2.ndim != 1 or grid2.size < 2:
+            raise ValueError('grid2 must be a 1D array of at least 2 values')
+
+        cl = tuple(float(self._to_unit_cl(i)) for i in np.atleast_1d(cl))
+
+        n1 = grid1.size
+        n2 = grid2.size
+        i1, i2 = np.meshgrid(np.arange(n1), np.arange(n2), indexing='ij')
+        i1 = i1.ravel()
+        i2 = i2.ravel()
+        values = np.column_stack([grid1[i1], grid2[i2]])
+        neighbors = []
+        for d1, d2 in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            j1 = i1 + d1
+            j2 = i2 + d2
+            valid = (j1 >= 0) & (j1 < n1) & (j2 >= 0) & (j2 < n2)
+            neighbors.append(np.where(valid, j1 * n2 + j2, -1))
+        neighbors = np.column_stack(neighbors)
+
+        delta, params = self._profile_grid([param1, param2], values, neighbors)
+        delta = delta.reshape(n1, n2)
+        params = {k: v.reshape(n1, n2) for k, v in params.items()}
+
+        # contourpy takes z of shape (ny, nx)
+        generator = contour_generator(
+            grid1, grid2, np.ma.masked_invalid(delta.T)
+        )
+        levels = tuple(float(stats.chi2.ppf(i, 2)) for i in cl)
+        contours = {
+            i: [np.asarray(line) for line in generator.lines(level)]
+            for i, level in zip(cl, levels, strict=True)
+        }
+        return ProfileContour(
+            params=(param1, param2),
+            grid=(grid1, grid2),
+            delta=delta,
+            params_profile=params,
+            cl=cl,
+            levels=levels,
+            contours=contours,
+        )
+
+    def _profile_grid(
+        self,
+        names: Sequence[str],
+        values: NDArray,
+        neighbors: NDArray,
+        max_pass: int = 4,
+    ) -> tuple[NDArray, dict[str, NDArray]]:
+        """Calculate the profile likelihood on grid points.
+
+        Parameters
+        ----------
+        names : sequence of str
+            Names of free parameters to fix.
+        values : ndarray
+            Values of the fixed parameters of grid points, of shape
+            ``(npoints, len(names))``.
+        neighbors : ndarray
+            Indices of neighbours of grid points, of shape
+            ``(npoints, nneighbors)``, -1 for no neighbour.
+        max_pass : int, optional
+            Maximum number of passes warm-starting grid points from their
+            neighbours. The default is 4.
+
+        Returns
+        -------
+        delta : ndarray
+            Deviance difference between the profile likelihood and the MLE,
+            NaN for invalid grid points.
+        params : dict
+            Parameters values of the profile likelihood.
+        """
+        helper = self._helper
+        free = helper.params_names['free']
+        for name in names:
+            if name not in free:
+                raise ValueError(f'{name} is not a free parameter')
+
+        fixed_idx = np.array([free.index(i) for i in names])
+        nuisance_idx = np.setdiff1d(np.arange(len(free)), fixed_idx)
+
+        # the transforms are element-wise, so the fixed values can be
+        # converted to unconstrained space with the other values at MLE
+        mle_constr = np.array([self._mle[i][0] for i in free])
+        constr = np.tile(mle_constr, (len(values), 1))
+        constr[:, fixed_idx] = values
+        to_unconstr = jax.vmap(helper.constr_arr_to_unconstr_arr)
+        fixed = np.asarray(to_unconstr(jnp.asarray(constr)))[:, fixed_idx]
+
+        def full_arr(y, fixed):
+            x = jnp.empty(len(free))
+            x = x.at[nuisance_idx].set(y)
+            return x.at[fixed_idx].set(fixed)
+
+        if nuisance_idx.size:
+            lm_solver = optx.LevenbergMarquardt(rtol=0.0, atol=1e-6)
+
+            def solve(y0, fixed):
+                res = optx.least_squares(
+                    fn=lambda y, aux: helper.residual(full_arr(y, fixed)),
+                    solver=lm_solver,
+                    y0=y0,
+                    max_steps=1024,
+                    throw=False,
+                )
+                y = res.value
+                return y, helper.deviance_total(full_arr(y, fixed))
+
+        else:
+
+            def solve(y0, fixed):
+                return y0, helper.deviance_total(full_arr(y0, fixed))
+
+        solve = helper.jit_data(jax.vmap(solve))
+
+        y0 = np.asarray(self._mle_unconstr)[nuisance_idx]
+        y, dev = jax.device_get(solve(np.tile(y0, (len(values), 1)), fixed))
+        dev = np.where(np.isfinite(dev), dev, np.inf)
+
+        has_neighbor = neighbors >= 0
+        for _ in range(max_pass if nuisance_idx.size else 0):
+            # warm-start from the neighbour of the lowest deviance, which is
+            # likely closer to the minimum
+            dev_neighbors = np.where(has_neighbor, dev[neighbors], np.inf)
+            best = np.argmin(dev_neighbors, axis=1)
+            best = neighbors[np.arange(len(values)), best]
+            y_new, dev_new = jax.device_get(solve(y[best], fixed))
+            dev_new = np.where(np.isfinite(dev_new), dev_new, np.inf)
+            improved = dev_new < dev - 1e-6
+            if not improved.any():
+                break
+            y[improved] = y_new[improved]
+            dev[improved] = dev_new[improved]
+
+        x = jax.vmap(full_arr)(jnp.asarray(y), jnp.asarray(fixed))
+        params = jax.vmap(
+            lambda x: helper.unconstr_dic_to_params_dic(
+                dict(zip(free, x, strict=True))
+            )
+        )(x)
+        params = {k: np.asarray(v) for k, v in params.items()}
+        delta = np.where(np.isfinite(dev), dev - self._minuit.fval, np.nan)
+        return delta, params
+
     def _warn_invalid_fit(self):
         if not self._minuit.valid:
             warnings.warn('fit must be valid to calculate confidence interval')
@@ -1000,7 +1511,7 @@ class MLEResult(FitResult):
 
             fn_dic = jax.tree.map(transform, fn_dic)
             rtol = dict.fromkeys(fn_dic.keys(), 1e-08)
-            intervals, status = self._ci_fn(fn_dic, cl, rtol=rtol)
+            intervals, status = self._ci_fn(fn_dic, cl, rtol, parallel=True)
             intervals = jax.tree.map(jnp.exp, intervals)
         elif method == 'boot':
             intervals, status = self._ci_boot(cl, [], fn_dic, True, params)
@@ -1362,33 +1873,38 @@ class PosteriorResult(FitResult):
 
     def __repr__(self):
         tabs = self._tabs()
-        return (
-            f'Parameters\n{tabs["params"]}\n\n'
-            f'Fit Statistics\n{tabs["stat"]}\n\n'
-            f'Information Criterion\n{tabs["ic"]}\n\n'
-            f'Pareto k Diagnostic\n{tabs["k"]}\n'
-        )
+        s = f'Parameters\n{tabs["params"]}\n\nFit Statistics\n{tabs["stat"]}\n'
+        if 'ic' in tabs:
+            s += (
+                f'\nInformation Criterion\n{tabs["ic"]}\n\n'
+                f'Pareto k Diagnostic\n{tabs["k"]}\n'
+            )
+        return s
 
     def _repr_html_(self):
         """The repr in Jupyter notebook environment."""
         tabs = self._tabs()
         params_tab = tabs['params'].get_html_string(format=True)
         stat_tab = tabs['stat'].get_html_string(format=True)
-        ic_tab = tabs['ic'].get_html_string(format=True)
-        k_tab = tabs['k'].get_html_string(format=True)
-        return (
+        s = (
             '<details open><summary><b>Posterior Result</b></summary>'
             '<details open style="padding-left: 1em">'
             f'<summary><b>Parameters</b></summary>{params_tab}</details>'
             '<details open style="padding-left: 1em">'
             f'<summary><b>Statistics</b></summary>{stat_tab}</details>'
-            '<details open style="padding-left: 1em">'
-            '<summary><b>Information Criterion</b></summary>'
-            f'{ic_tab}</details>'
-            '<details open style="padding-left: 1em">'
-            f'<summary><b>Pareto k Diagnostic</b></summary>{k_tab}</details>'
-            '</details>'
         )
+        if 'ic' in tabs:
+            ic_tab = tabs['ic'].get_html_string(format=True)
+            k_tab = tabs['k'].get_html_string(format=True)
+            s += (
+                '<details open style="padding-left: 1em">'
+                '<summary><b>Information Criterion</b></summary>'
+                f'{ic_tab}</details>'
+                '<details open style="padding-left: 1em">'
+                '<summary><b>Pareto k Diagnostic</b></summary>'
+                f'{k_tab}</details>'
+            )
+        return s + '</details>'
 
     def _tabs(self):
         if self._info_tabs is not None:
@@ -1455,6 +1971,12 @@ class PosteriorResult(FitResult):
         ]
         stat_tab = make_pretty_table(names, rows)
 
+        # the point-wise log likelihood is not recorded if samples are
+        # streamed to store
+        if not self._has_pointwise:
+            self._info_tabs = {'params': params_tab, 'stat': stat_tab}
+            return self._info_tabs
+
         loo = self.loo
         waic = self.waic
         rows = [
@@ -2033,6 +2555,9 @@ class PosteriorResult(FitResult):
         n_parallel: int | None = None,
         progress: bool = True,
         update_rate: int = 50,
+        chunk_size: int | None = None,
+        store: str | None = None,
+        resume: bool = True,
     ):
         """Perform posterior predictive check.
 
@@ -2051,33 +2576,67 @@ class PosteriorResult(FitResult):
             Whether to display progress bar. The default is True.
         update_rate : int, optional
             The update rate of progress bar. The default is 50.
+        chunk_size : int, optional
+            If given, simulate and fit in chunks of this size to keep memory
+            bounded. Only the parameters, the total and group deviance, and
+            the :math:`p`-values are then kept, so the per-channel PPC
+            bands and residuals are not available in plots.
+        store : str, optional
+            Path of an HDF5 file to store the full simulation and fitting
+            result of each chunk, which requires `chunk_size`. The file is
+            also a checkpoint of the run.
+        resume : bool, optional
+            Whether to resume from `store` if it exists. The fits completed
+            in `store` are reused, so an interrupted run can be continued by
+            the same call, and a finished run can be extended with a larger
+            `n`. The default is True.
         """
         n = int(n)
         n_parallel = get_parallel_number(n_parallel)
         if parallel and (n % n_parallel):
             n += n_parallel - n % n_parallel
 
-        # reuse the previous result if all setup is the same
-        if self._ppc and self._ppc.n == n and self._ppc.seed == seed:
+        helper = self._helper
+        seed = helper.seed['pred'] if seed is None else int(seed)
+
+        # reuse the previous result if all setup is the same, otherwise the
+        # fits completed in the store are reused
+        if (
+            store is None
+            and self._ppc
+            and self._ppc.n == n
+            and self._ppc.seed == seed
+        ):
             return
 
-        helper = self._helper
         free_params = helper.params_names['free']
-        seed = helper.seed['pred'] if seed is None else int(seed)
 
-        # randomly select n samples from posterior
+        # randomly select n samples from posterior, the samples selected by a
+        # smaller n are the leading ones, so that the run can be extended
         rng = np.random.default_rng(seed)
         idata = self.idata
-        i = rng.integers(0, idata['posterior'].chain.size, n)
-        j = rng.integers(0, idata['posterior'].draw.size, n)
+        ndraw = idata['posterior'].draw.size
+        i, j = np.divmod(
+            rng.integers(0, idata['posterior'].chain.size * ndraw, n), ndraw
+        )
         params = {
             k: v.values[i, j]
             for k, v in idata['posterior'][free_params].data_vars.items()
         }
-        models = {
-            k: v.values[i, j]
-            for k, v in helper.get_models(idata['posterior']).items()
-        }
+        if self._has_pointwise:
+            models = {
+                k: v.values[i, j]
+                for k, v in helper.get_models(idata['posterior']).items()
+            }
+        else:
+            # models are not recorded in samples streamed to store
+            @jax.jit
+            @jax.vmap
+            def get_models(params):
+                unconstr = helper.constr_dic_to_unconstr_arr(params)
+                return helper.get_sites(unconstr)['models']
+
+            models = jax.device_get(get_models(params))
 
         # perform ppc
         with jax_pmap_shmap_merge(False):
@@ -2091,22 +2650,29 @@ class PosteriorResult(FitResult):
                 progress,
                 update_rate,
                 'PPC',
+                chunk_size,
+                store,
+                self._mle['deviance'],
+                resume,
             )
         valid = result.pop('valid')
+        p_value = result.pop('p_value', None)
         result = jax.tree.map(lambda x: x[valid], result)
+        if p_value is None:
+            p_value = jax.tree.map(
+                lambda obs, sim: np.sum(sim >= obs, axis=0) / len(sim),
+                self._mle['deviance'],
+                result['deviance'],
+            )
 
         self._ppc = PPCResult(
             params_rep=params,
             models_rep=models,
-            data=result['data'],
+            data=result.get('data', {}),
             params_fit=result['params'],
-            models_fit=result['models'],
+            models_fit=result.get('models', {}),
             deviance=result['deviance'],
-            p_value=jax.tree.map(
-                lambda obs, sim: np.sum(sim >= obs, axis=0) / len(sim),
-                self._mle['deviance'],
-                result['deviance'],
-            ),
+            p_value=p_value,
             n=n,
             n_valid=np.sum(valid),
             seed=seed,
@@ -2299,6 +2865,18 @@ class PosteriorResult(FitResult):
 
         return self._divergence
 
+    @property
+    def _has_pointwise(self) -> bool:
+        """Whether the point-wise log likelihood and models are recorded."""
+        return 'channels' in self.idata['log_likelihood']
+
+    def _check_pointwise(self) -> None:
+        if not self._has_pointwise:
+            raise RuntimeError(
+                'point-wise log likelihood is not recorded in the samples '
+                'streamed to store'
+            )
+
     @property
     def waic(self) -> ELPDData:
         """The widely applicable information criterion (WAIC).
@@ -2313,6 +2891,7 @@ class PosteriorResult(FitResult):
         .. [2] https://arxiv.org/abs/1004.2316
         """
         if self._waic is None:
+            self._check_pointwise()
             self._waic = az.waic(
                 self.idata, var_name='channels', scale='deviance'
             )
@@ -2335,6 +2914,7 @@ class PosteriorResult(FitResult):
         .. [3] https://arxiv.org/abs/1507.02646
         """
         if self._loo is None:
+            self._check_pointwise()
             self._loo = az.loo(
                 self.idata,
                 var_name='channels',
@@ -2354,6 +2934,7 @@ class PosteriorResult(FitResult):
     @property
     def _psislw(self) -> DataArray:
         if self._psislw_ is None:
+            self._check_pointwise()
             idata = self.idata
             reff = self.reff
             stack_kwargs = {'__sample__': ('chain', 'draw')}
@@ -2494,6 +3075,51 @@ class ConfidenceInterval(NamedTuple):
     """Status of the calculation progress."""
 
 
+class ProfileLikelihood(NamedTuple):
+    """Profile likelihood of a parameter."""
+
+    param: str
+    """Name of the parameter."""
+
+    grid: NDArray
+    """Parameter values of the profile likelihood."""
+
+    delta: NDArray
+    """Deviance difference between the profile likelihood and the MLE."""
+
+    params: dict[str, NDArray]
+    """Parameters values of the profile likelihood."""
+
+
+class ProfileContour(NamedTuple):
+    """Profile likelihood and confidence contours of two parameters."""
+
+    params: tuple[str, str]
+    """Names of the two parameters."""
+
+    grid: tuple[NDArray, NDArray]
+    """Parameters values of the profile likelihood."""
+
+    delta: NDArray
+    """Deviance difference between the profile likelihood and the MLE, of
+    shape ``(len(grid[0]), len(grid[1]))``.
+    """
+
+    params_profile: dict[str, NDArray]
+    """Parameters values of the profile likelihood."""
+
+    cl: tuple[float, ...]
+    """The confidence levels of contours."""
+
+    levels: tuple[float, ...]
+    """The deviance differences of contours."""
+
+    contours: dict[float, list[NDArray]]
+    """The contour lines of each confidence level. Each line is an array of
+    shape ``(npoints, 2)`` of the two parameters values.
+    """
+
+
 class MLEFlux(NamedTuple):
     """The flux of the MLE model."""
 
@@ -2612,20 +3238,28 @@ class BootstrapResult(NamedTuple):
     """The maximum likelihood estimation."""
 
     data: dict
-    """Simulation data based on MLE."""
+    """Simulation data based on MLE, empty if run in chunks."""
 
     models: dict
-    """Bootstrap models."""
+    """Bootstrap models, empty if run in chunks."""
 
     params: dict
     """Bootstrap parameters."""
 
     deviance: dict
-    """Bootstrap deviance."""
+    """Bootstrap deviance, without point-wise deviance if run in chunks."""
 
     p_value: dict
     """Model fitness :math:`p`-value."""
 
+    p_value_error: dict
+    """Monte Carlo standard error of :math:`p`-value."""
+
+    ci_error: dict
+    """Monte Carlo error of the 1σ interval endpoints of free parameters,
+    relative to their bootstrap standard deviation.
+    """
+
     n: int
     """Numbers of bootstrap."""
 
@@ -2636,6 +3270,37 @@ class BootstrapResult(NamedTuple):
     """Seed of random number generator used in simulation."""
 
 
+class BatchMLEResult(NamedTuple):
+    """Result of maximum likelihood fits to a batch of spectra."""
+
+    mle: dict[str, np.ndarray]
+    """MLE of parameters of each spectrum."""
+
+    error: dict[str, np.ndarray]
+    """Error of parameters of each spectrum."""
+
+    covar: np.ndarray
+    """Covariance matrix of parameters of each spectrum."""
+
+    models: dict[str, np.ndarray]
+    """Model values at MLE of each spectrum."""
+
+    deviance: dict
+    """Deviance of the model at MLE of each spectrum."""
+
+    aic: np.ndarray
+    """Akaike information criterion with sample size correction."""
+
+    bic: np.ndarray
+    """Bayesian information criterion."""
+
+    dof: int
+    """Degree of freedom of each fit."""
+
+    valid: np.ndarray
+    """Whether the fit to each spectrum converges."""
+
+
 class CredibleInterval(NamedTuple):
     """Credible interval result."""
 
@@ -2788,16 +3453,20 @@ class PPCResult(NamedTuple):
     """Models' values corresponding to `params_rep`."""
 
     data: dict
-    """Posterior predictive data."""
+    """Posterior predictive data, empty if run in chunks."""
 
     params_fit: dict
     """Best fit parameters of posterior predictive data."""
 
     deviance: dict
-    """Deviance of posterior predictive data and best fit models."""
+    """Deviance of posterior predictive data and best fit models, without
+    point-wise deviance if run in chunks.
+    """
 
     models_fit: dict
-    """Best fit models' values of posterior predictive data."""
+    """Best fit models' values of posterior predictive data, empty if run in
+    chunks.
+    """
 
     p_value: dict
     """Posterior predictive :math:`p`-value."""
@@ -2812,6 +3481,46 @@ class PPCResult(NamedTuple):
     """Seed of random number generator used in simulation."""
 
 
+def _p_value_error(p_value: dict, n: int) -> dict:
+    """Monte Carlo standard error of p-values estimated from n simulations."""
+    n = max(int(n), 1)
+
+    def error(p):
+        # shrink p towards 0.5, so the error is nonzero when p is 0 or 1
+        p = (p * n + 1.0) / (n + 2.0)
+        return np.sqrt(p * (1.0 - p) / n)
+
+    return jax.tree.map(error, p_value)
+
+
+def _ci_error(params: dict[str, NDArray]) -> dict[str, float]:
+    """Monte Carlo error of the 1σ interval endpoints of bootstrap samples,
+    relative to the standard deviation of samples.
+
+    The error of a sample quantile is estimated by half the spread of order
+    statistics whose ranks are within one binomial standard deviation.
+    """
+    q = np.array([0.15865525393145707, 0.8413447460685429])
+    error = {}
+    for k, x in params.items():
+        x = np.sort(np.asarray(x))
+        n = len(x)
+        std = np.std(x)
+        if n < 2 or std == 0.0:
+            error[k] = np.inf
+            continue
+        d = np.sqrt(n * q * (1.0 - q))
+        lo = np.clip(np.floor(n * q - d).astype(int), 0, n - 1)
+        hi = np.clip(np.ceil(n * q + d).astype(int), 0, n - 1)
+        error[k] = float(np.max(x[hi] - x[lo]) / (2.0 * std))
+    return error
+
+
+def _thread_number(n: int) -> int:
+    """Get the number of threads to run n tasks."""
+    return max(min(n, os.cpu_count() or 1), 1)
+
+
 def _format_result(result: dict, order: Sequence[str]) -> dict:
     """Sort the result and use float type."""
     formatted = jax.tree.map(float, result)
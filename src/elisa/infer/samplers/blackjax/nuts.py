@@ -73,6 +73,8 @@ class BlackJAXNUTS(MCMCKernel):
         potential_fn: Callable | None = None,
         init_strategy: Callable = init_to_uniform,
         dense_mass: bool = True,
+        inverse_mass_matrix: jax.Array | None = None,
+        adapt_mass_matrix: bool = True,
         initial_step_size: float = 1.0,
         target_accept_prob: float = 0.8,
         max_tree_depth: int = 10,
@@ -92,6 +94,8 @@ class BlackJAXNUTS(MCMCKernel):
 
         # Window adaption parameters
         self._dense_mass = dense_mass
+        self._inverse_mass_matrix = inverse_mass_matrix
+        self._adapt_mass_matrix = adapt_mass_matrix
         self._initial_step_size = initial_step_size
         self._target_accept_prob = target_accept_prob
 
@@ -122,7 +126,8 @@ class BlackJAXNUTS(MCMCKernel):
                 model_kwargs=model_kwargs,
                 validate_grad=True,
             )
-            init_params = model_info.param_info.z
+            if init_params is None:
+                init_params = model_info.param_info.z
             potential_gen = model_info.potential_fn
             postprocess_gen = model_info.postprocess_fn
             model_kwargs = {} if model_kwargs is None else model_kwargs
@@ -165,7 +170,10 @@ class BlackJAXNUTS(MCMCKernel):
             is_mass_matrix_diagonal=not self._dense_mass,
             target_acceptance_rate=self._target_accept_prob,
         )
-        schedule = wa.build_schedule(num_warmup)
+        if self._adapt_mass_matrix:
+            schedule = wa.build_schedule(num_warmup)
+        else:  # only adapt the step size in fast windows
+            schedule = jnp.array([(0, False)] * num_warmup)
 
         def wa_update(state, new_hmc_state, info):
             return adapt_step(
@@ -237,6 +245,8 @@ class BlackJAXNUTS(MCMCKernel):
         self._mcmc_kernel = mcmc_kernel
 
         init_adapt_state = adapt_init(init_params, self._initial_step_size)
+        if self._inverse_mass_matrix is not None:
+            init_adapt_state = self._seed_mass_matrix(init_adapt_state)
         pe, z_grad = jax.value_and_grad(self._potential_fn)(init_params)
 
         return BlackJAXNUTSState(
@@ -257,6 +267,20 @@ class BlackJAXNUTS(MCMCKernel):
             rng_key=rng_key,
         )
 
+    def _seed_mass_matrix(self, adapt_state):
+        """Use the given inverse mass matrix in the first adaption window."""
+        inverse_mass_matrix = jnp.asarray(self._inverse_mass_matrix, float)
+        if self._dense_mass and inverse_mass_matrix.ndim == 1:
+            inverse_mass_matrix = jnp.diag(inverse_mass_matrix)
+        elif not self._dense_mass and inverse_mass_matrix.ndim == 2:
+            inverse_mass_matrix = jnp.diag(inverse_mass_matrix)
+        imm_state = adapt_state.imm_state._replace(
+            inverse_mass_matrix=inverse_mass_matrix
+        )
+        return adapt_state._replace(
+            imm_state=imm_state, inverse_mass_matrix=inverse_mass_matrix
+        )
+
     def sample(self, state, model_args, model_kwargs):
         return self._mcmc_kernel(state)
 
@@ -3,7 +3,7 @@ from __future__ import annotations
 import threading
 import warnings
 from abc import ABCMeta, abstractmethod
-from typing import TYPE_CHECKING, NamedTuple
+from typing import TYPE_CHECKING, Literal, NamedTuple
 
 import jax
 import jax.numpy as jnp
@@ -12,6 +12,10 @@ import numpy as np
 from numpyro.infer.initialization import init_to_value
 from tqdm.auto import tqdm
 
+from elisa.infer.samplers.ensemble.vectorized import (
+    get_moves,
+    sample_ensembles,
+)
 from elisa.infer.samplers.util import get_model_info
 
 if TYPE_CHECKING:
@@ -31,8 +35,15 @@ class EnsembleSamplerState(NamedTuple):
     random_state: Any
     """The state of random number generator."""
 
+    mu: float | None = None
+    """The scale factor of differential slice move, which is tuned during
+    warmup. This is only kept by the JAX backend."""
+
 
 class EnsembleSampler(metaclass=ABCMeta):
+    _default_move: str
+    _default_tune: bool
+
     def __init__(
         self,
         numpyro_model: Callable,
@@ -87,19 +98,19 @@ class EnsembleSampler(metaclass=ABCMeta):
         log_prob_fn = info.log_prob_fn
         postprocess_fn = info.postprocess_fn
 
-        @jax.vmap
-        @jax.jit
-        def _log_prob_with_blobs(z):
+        def log_prob_one(z):
             z = unravel(z)
             log_prob = log_prob_fn(z)
+            if ignore_nan:
+                log_prob = jnp.nan_to_num(log_prob, nan=-np.inf)
             blobs = postprocess_fn(z)
             return log_prob, [blobs[i] for i in blobs_names]
 
+        _log_prob_with_blobs = jax.vmap(jax.jit(log_prob_one))
+
         @jax.jit
         def log_prob_with_blobs(z):
             log_prob, blobs = _log_prob_with_blobs(z)
-            if ignore_nan:
-                log_prob = jnp.nan_to_num(log_prob, nan=-np.inf)
             return [
                 (log_prob[i], *(b[i] for b in blobs))
                 for i in range(len(log_prob))
@@ -107,6 +118,7 @@ class EnsembleSampler(metaclass=ABCMeta):
 
         self._ndim = ndim
         self._init = init
+        self._log_prob_one = log_prob_one
         self._log_prob_with_blobs = log_prob_with_blobs
         self._blobs_dtype = blobs_dtype
         self._seed = seed
@@ -123,6 +135,7 @@ class EnsembleSampler(metaclass=ABCMeta):
         states: Sequence[EnsembleSamplerState] | None = None,
         warmup_kwargs: dict | None = None,
         sampling_kwargs: dict | None = None,
+        backend: Literal['process', 'jax'] = 'process',
     ) -> tuple[dict[str, NDArray[float]], tuple[EnsembleSamplerState, ...]]:
         """Run the sampler.
 
@@ -150,6 +163,15 @@ class EnsembleSampler(metaclass=ABCMeta):
             Extra parameters passed to sampler constructor for warm-up phase.
         sampling_kwargs: dict | None = None,
             Extra parameters passed to sampler constructor for sampling phase.
+        backend : {'process', 'jax'}, optional
+            The backend to run samplers. Available options are:
+
+                * ``'process'``: run each sampler in a spawned process
+                * ``'jax'``: advance all walkers of all samplers in one
+                  vectorized JAX call per step in the current process,
+                  with samplers sharded across devices
+
+            The default is ``'process'``.
 
         Returns
         -------
@@ -194,6 +216,20 @@ class EnsembleSampler(metaclass=ABCMeta):
         else:
             sampling_kwargs = dict(sampling_kwargs)
 
+        if backend == 'jax':
+            return self._run_vectorized(
+                warmup=warmup,
+                steps=steps,
+                thinning=thinning,
+                tune=tune,
+                progress=progress,
+                states=states,
+                warmup_kwargs=warmup_kwargs,
+                sampling_kwargs=sampling_kwargs,
+            )
+        elif backend != 'process':
+            raise ValueError(f'unknown backend: {backend}')
+
         old_method = mp.get_start_method()
         if old_method != 'spawn':
             mp.set_start_method('spawn', force=True)
@@ -258,6 +294,55 @@ class EnsembleSampler(metaclass=ABCMeta):
         states = tuple(r[1] for r in results)
         return samples, states
 
+    def _run_vectorized(
+        self,
+        warmup: int,
+        steps: int,
+        thinning: int,
+        tune: bool | None,
+        progress: bool,
+        states: Sequence[EnsembleSamplerState],
+        warmup_kwargs: dict,
+        sampling_kwargs: dict,
+    ) -> tuple[dict[str, NDArray[float]], tuple[EnsembleSamplerState, ...]]:
+        """Run all samplers in the current process with JAX."""
+        ndim = self._ndim
+        if tune is None:
+            tune = self._default_tune
+        seeds, random_states = zip(
+            *(self.split_random_state(s.random_state) for s in states),
+            strict=True,
+        )
+        mu = [s.mu for s in states]
+        blobs, coords, mu = sample_ensembles(
+            log_prob_fn=self._log_prob_one,
+            coords=np.stack([s.coords for s in states]),
+            seeds=seeds,
+            mu=None if None in mu else mu,
+            warmup=warmup,
+            steps=steps,
+            thinning=thinning,
+            tune=tune,
+            progress=progress,
+            warmup_moves=get_moves(warmup_kwargs, self._default_move, ndim),
+            sampling_moves=get_moves(
+                sampling_kwargs, self._default_move, ndim
+            ),
+        )
+
+        # reshape samples from (n_sampler, n_step, n_walker, ...) to
+        # (n_sampler * n_walker, n_step, ...), which is consistent with the
+        # process backend
+        samples = {}
+        for (name, dtype, _), b in zip(self._blobs_dtype, blobs, strict=True):
+            b = np.swapaxes(np.asarray(b, dtype), 1, 2)
+            samples[name] = b.reshape((-1,) + b.shape[2:])
+        states = tuple(
+            EnsembleSamplerState(c, r, float(m))
+            for c, r, m in zip(coords, random_states, mu, strict=True)
+        )
+        return samples, states
+
     @staticmethod
     def _progress_listener(
         queue: Queue,
@@ -305,3 +390,10 @@ class EnsembleSampler(metaclass=ABCMeta):
     def get_random_state(self, seed: int) -> Any:
         """Get the random state for the sampler."""
         pass
+
+    @abstractmethod
+    def split_random_state(self, random_state: Any) -> tuple[int, Any]:
+        """Draw a seed for JAX from the random state of the sampler, and
+        return the seed and the updated random state.
+        """
+        pass
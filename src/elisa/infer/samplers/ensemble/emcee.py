@@ -17,6 +17,9 @@ if TYPE_CHECKING:
 
 
 class EmceeSampler(EnsembleSampler):
+    _default_move = 'stretch'
+    _default_tune = False
+
     def get_sampling_fn(
         self,
         chains: int,
@@ -99,3 +102,8 @@ class EmceeSampler(EnsembleSampler):
 
     def get_random_state(self, seed: int) -> Generator:
         return np.random.default_rng(seed)
+
+    def split_random_state(
+        self, random_state: Generator
+    ) -> tuple[int, Generator]:
+        return int(random_state.integers(2**32)), random_state
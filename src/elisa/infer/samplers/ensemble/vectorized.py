@@ -0,0 +1,433 @@
+"""In-process ensemble samplers vectorized with JAX."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING, NamedTuple
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+from jax import lax
+from jax.sharding import NamedSharding, PartitionSpec
+from tqdm.auto import tqdm
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from typing import Any
+
+    from numpy.typing import NDArray
+
+    from elisa.util.typing import JAXArray
+
+# move kinds
+STRETCH = 0
+DE = 1
+SLICE = 2
+
+
+class EnsembleMoves(NamedTuple):
+    """Moves of the ensemble, and the settings of slice sampling."""
+
+    kinds: tuple[int, ...]
+    """Kinds of moves."""
+
+    params: tuple[tuple[float, float], ...]
+    """Parameters of moves: ``(a, _)`` for stretch move, ``(sigma, g0)``
+    for differential evolution move, and ``(mu0, tune)`` for differential
+    slice move."""
+
+    weights: tuple[float, ...]
+    """Probabilities to choose moves at each step."""
+
+    mu: float
+    """Initial scale factor of differential slice move."""
+
+    maxsteps: int
+    """Maximum number of stepping-out steps of slice sampling."""
+
+    maxiter: int
+    """Maximum number of contractions of slice sampling."""
+
+
+def get_moves(kwargs: dict, default_move: str, ndim: int) -> EnsembleMoves:
+    """Get the moves from the keyword arguments of emcee or zeus sampler.
+
+    Parameters
+    ----------
+    kwargs : dict
+        Keyword arguments passed to the sampler. The supported keywords are
+        ``moves`` for both emcee and zeus, and ``mu``, ``maxsteps`` and
+        ``maxiter`` for zeus. The ``moves`` can be a move or a list of moves,
+        or a list of ``(move, weight)``, where a move is an instance of
+        :class:`emcee.moves.StretchMove`, :class:`emcee.moves.DEMove`,
+        :class:`zeus.moves.DifferentialMove`, or one of ``'stretch'``,
+        ``'de'`` and ``'slice'``.
+    default_move : str
+        The move used if ``moves`` is not given.
+    ndim : int
+        The dimension of parameter space.
+
+    Returns
+    -------
+    EnsembleMoves
+        The moves of the ensemble.
+    """
+    kwargs = dict(kwargs)
+    kwargs.pop('verbose', None)
+    moves = kwargs.pop('moves', None)
+    mu = float(kwargs.pop('mu', 1.0))
+    maxsteps = int(kwargs.pop('maxsteps', 10000))
+    maxiter = int(kwargs.pop('maxiter', 10000))
+    if kwargs:
+        raise ValueError(
+            f'unsupported arguments for vectorized backend: {list(kwargs)}'
+        )
+
+    if moves is None:
+        moves = [default_move]
+    elif not isinstance(moves, list | tuple):
+        moves = [moves]
+
+    kinds = []
+    params = []
+    weights = []
+    for m in moves:
+        if isinstance(m, tuple):
+            move, weight = m
+        else:
+            move, weight = m, 1.0
+
+        name = type(move).__name__
+        if move == 'stretch' or name == 'StretchMove':
+            kinds.append(STRETCH)
+            params.append((float(getattr(move, 'a', 2.0)), 0.0))
+        elif move == 'de' or name == 'DEMove':
+            g0 = getattr(move, 'gamma0', None)
+            if g0 is None:
+                g0 = 2.38 / np.sqrt(2.0 * ndim)
+            kinds.append(DE)
+            params.append((float(getattr(move, 'sigma', 1e-5)), float(g0)))
+        elif move == 'slice' or name == 'DifferentialMove':
+            kinds.append(SLICE)
+            mu0 = float(getattr(move, 'mu0', 1.0))
+            params.append((mu0, float(getattr(move, 'tune', True))))
+        else:
+            raise ValueError(f'unsupported move for vectorized backend: {m}')
+        weights.append(float(weight))
+
+    weights = np.array(weights) / np.sum(weights)
+    return EnsembleMoves(
+        kinds=tuple(kinds),
+        params=tuple(params),
+        weights=tuple(weights.tolist()),
+        mu=mu,
+        maxsteps=maxsteps,
+        maxiter=maxiter,
+    )
+
+
+class _EnsembleState(NamedTuple):
+    coords: JAXArray
+    log_prob: JAXArray
+    blobs: list[JAXArray]
+    key: JAXArray
+    mu: JAXArray
+
+
+def _where(cond: JAXArray, x: Any, y: Any) -> Any:
+    """Select the leading entries of the pytree by `cond`."""
+
+    def where(a, b):
+        c = jnp.reshape(cond, cond.shape + (1,) * (a.ndim - cond.ndim))
+        return jnp.where(c, a, b)
+
+    return jax.tree.map(where, x, y)
+
+
+def _random_pairs(key: JAXArray, n: int, m: int) -> tuple[JAXArray, ...]:
+    """Random pairs of distinct indices of `m` walkers, for `n` walkers."""
+    k1, k2 = jax.random.split(key)
+    i = jax.random.randint(k1, (n,), 0, m)
+    j = jax.random.randint(k2, (n,), 0, m - 1)
+    return i, j + (j >= i)
+
+
+def get_step_fn(
+    log_prob_fn: Callable,
+    moves: EnsembleMoves,
+    tune: bool,
+) -> Callable[[_EnsembleState], _EnsembleState]:
+    """Get the function to advance an ensemble by one step.
+
+    Each step splits the walkers randomly into two halves, and updates the
+    walkers of each half in turn, using the other half as the complementary
+    ensemble, as in emcee and zeus.
+    """
+    log_prob_only = lambda x: log_prob_fn(x)[0]
+    batch_log_prob = jax.vmap(log_prob_fn)
+    zero = jnp.zeros((), int)
+
+    def stretch(key, x, lp, blobs, c, mu, a, _):
+        k1, k2, k3 = jax.random.split(key, 3)
+        n, ndim = x.shape
+        z = jnp.square((a - 1.0) * jax.random.uniform(k1, (n,)) + 1.0) / a
+        cj = c[jax.random.randint(k2, (n,), 0, c.shape[0])]
+        q = cj - (cj - x) * z[:, None]
+        lp_q, blobs_q = batch_log_prob(q)
+        diff = (ndim - 1.0) * jnp.log(z) + lp_q - lp
+        accept = diff > jnp.log(jax.random.uniform(k3, (n,)))
+        new = _where(accept, (q, lp_q, blobs_q), (x, lp, blobs))
+        return *new, zero, zero
+
+    def de(key, x, lp, blobs, c, mu, sigma, g0):
+        k1, k2, k3 = jax.random.split(key, 3)
+        n = x.shape[0]
+        gamma = g0 * (1.0 + sigma * jax.random.normal(k1, (n,)))
+        i, j = _random_pairs(k2, n, c.shape[0])
+        q = x + (c[j] - c[i]) * gamma[:, None]
+        lp_q, blobs_q = batch_log_prob(q)
+        accept = lp_q - lp > jnp.log(jax.random.uniform(k3, (n,)))
+        new = _where(accept, (q, lp_q, blobs_q), (x, lp, blobs))
+        return *new, zero, zero
+
+    def slice_one(key, x, lp, blobs, d):
+        """Slice sampling along direction d, see zeus for details."""
+        k1, k2, k3, k4 = jax.random.split(key, 4)
+        z0 = lp - jax.random.exponential(k1)
+        left = -jax.random.uniform(k2)
+        right = left + 1.0
+        nleft = jnp.floor(moves.maxsteps * jax.random.uniform(k3))
+        nright = moves.maxsteps - 1.0 - nleft
+
+        def step_out(edge, nstep, sign):
+            def body(carry):
+                edge, nstep, nexp, _ = carry
+                expand = (nstep >= 1.0) & (z0 < log_prob_only(x + edge * d))
+                edge = jnp.where(expand, edge + sign, edge)
+                nstep = nstep - expand
+                return edge, nstep, nexp + expand, expand & (nstep >= 1.0)
+
+            init = (edge, nstep, zero, nstep >= 1.0)
+            edge, _, nexp, _ = lax.while_loop(lambda c: c[-1], body, init)
+            return edge, nexp
+
+        left, nexp_left = step_out(left, nleft, -1.0)
+        right, nexp_right = step_out(right, nright, 1.0)
+
+        def shrink(carry):
+            key, left, right, new, _, ncon, n = carry
+            key, subkey = jax.random.split(key)
+            w = left + jax.random.uniform(subkey) * (right - left)
+            x_w = x + w * d
+            lp_w, blobs_w = log_prob_fn(x_w)
+            accept = z0 < lp_w
+            new = _where(accept, (x_w, lp_w, blobs_w), new)
+            shrink_left = ~accept & (w < 0.0)
+            shrink_right = ~accept & (w > 0.0)
+            left = jnp.where(shrink_left, w, left)
+            right = jnp.where(shrink_right, w, right)
+            ncon = ncon + (shrink_left | shrink_right)
+            return key, left, right, new, accept, ncon, n + 1
+
+        # the walker stays if the slice fails to shrink within maxiter
+        init = (k4, left, right, (x, lp, blobs), jnp.bool_(False), zero, zero)
+        carry = lax.while_loop(
+            lambda c: ~c[4] & (c[6] < moves.maxiter), shrink, init
+        )
+        return *carry[3], nexp_left + nexp_right, carry[5]
+
+    def differential_slice(key, x, lp, blobs, c, mu, mu0, tunable):
+        k1, k2 = jax.random.split(key)
+        n = x.shape[0]
+        i, j = _random_pairs(k1, n, c.shape[0])
+        mu = jnp.where(tunable, mu, mu0)
+        d = 2.0 * mu * (c[i] - c[j])
+        keys = jax.random.split(k2, n)
+        x, lp, blobs, nexp, ncon = jax.vmap(slice_one)(keys, x, lp, blobs, d)
+        return x, lp, blobs, jnp.sum(nexp), jnp.sum(ncon)
+
+    move_fns = {STRETCH: stretch, DE: de, SLICE: differential_slice}
+    branches = [
+        lambda *args, f=move_fns[k], p=p: f(*args, *p)
+        for k, p in zip(moves.kinds, moves.params, strict=True)
+    ]
+    is_slice = jnp.array([k == SLICE for k in moves.kinds])
+    weights = jnp.array(moves.weights)
+
+    def step(state: _EnsembleState) -> _EnsembleState:
+        key, k_perm, k_move, k1, k2 = jax.random.split(state.key, 5)
+        nwalkers = state.coords.shape[0]
+        half = nwalkers // 2
+        perm = jax.random.permutation(k_perm, nwalkers)
+        move = jax.random.choice(k_move, len(branches), p=weights)
+
+        coords = state.coords
+        log_prob = state.log_prob
+        blobs = state.blobs
+        nexp = ncon = 0
+        for k, active, inactive in [
+            (k1, perm[:half], perm[half:]),
+            (k2, perm[half:], perm[:half]),
+        ]:
+            args = (
+                k,
+                coords[active],
+                log_prob[active],
+                [b[active] for b in blobs],
+                coords[inactive],
+                state.mu,
+            )
+            if len(branches) == 1:
+                new = branches[0](*args)
+            else:
+                new = lax.switch(move, branches, *args)
+            x, lp, b, e, c = new
+            coords = coords.at[active].set(x)
+            log_prob = log_prob.at[active].set(lp)
+            blobs = [
+                i.at[active].set(j) for i, j in zip(blobs, b, strict=True)
+            ]
+            nexp = nexp + e
+            ncon = ncon + c
+
+        mu = state.mu
+        if tune:
+            # Robbins-Monro update of the scale factor of slice move
+            nexp = jnp.maximum(1, nexp)
+            factor = 2.0 * nexp / (nexp + ncon)
+            mu = jnp.where(is_slice[move], mu * factor, mu)
+
+        return _EnsembleState(coords, log_prob, blobs, key, mu)
+
+    return step
+
+
+def sample_ensembles(
+    log_prob_fn: Callable,
+    coords: NDArray[float],
+    seeds: Sequence[int],
+    warmup: int,
+    steps: int,
+    thinning: int,
+    tune: bool,
+    progress: bool,
+    warmup_moves: EnsembleMoves,
+    sampling_moves: EnsembleMoves,
+    mu: Sequence[float] | None = None,
+) -> tuple[list[NDArray], NDArray[float], NDArray[float]]:
+    """Advance all walkers of all ensembles in one vectorized call per step.
+
+    Parameters
+    ----------
+    log_prob_fn : callable
+        Function of raveled parameters in unconstrained space, returns log
+        probability and list of blobs.
+    coords : ndarray
+        Initial coordinates of walkers, in shape of
+        ``(n_ensemble, n_walker, ndim)``.
+    seeds : sequence of int
+        Seeds of random number generator of each ensemble.
+    warmup : int
+        The warmup steps.
+    steps : int
+        The sampling steps.
+    thinning : int
+        Stores every `thinning` samples in the chain.
+    tune : bool
+        Whether to tune the scale factor of differential slice move during
+        the warmup phase.
+    progress : bool
+        Whether to display a progress bar.
+    warmup_moves : EnsembleMoves
+        Moves used in the warmup phase.
+    sampling_moves : EnsembleMoves
+        Moves used in the sampling phase.
+    mu : sequence of float, optional
+        Initial scale factor of differential slice move of each ensemble,
+        e.g., the one tuned in a previous run. This is ignored if `warmup`
+        is positive. Defaults to the one of `sampling_moves`.
+
+    Returns
+    -------
+    blobs : list
+        Blobs of the sampling phase, in shape of
+        ``(n_ensemble, steps, n_walker, ...)``.
+    coords : ndarray
+        The final coordinates of walkers.
+    mu : ndarray
+        The final scale factor of differential slice move of each ensemble.
+    """
+    coords = jnp.asarray(coords, float)
+    n_ensemble, nwalkers, _ = coords.shape
+    if nwalkers % 2:
+        raise ValueError('number of walkers must be even')
+
+    # shard ensembles across devices
+    ndevice = jax.local_device_count()
+    if ndevice > 1 and n_ensemble % ndevice == 0:
+        mesh = jax.make_mesh((ndevice,), ('ensemble',))
+        sharding = NamedSharding(mesh, PartitionSpec('ensemble'))
+        shard = lambda x: jax.device_put(x, sharding)
+    else:
+        shard = lambda x: x
+
+    log_prob, blobs = jax.jit(jax.vmap(jax.vmap(log_prob_fn)))(coords)
+    keys = jax.vmap(jax.random.key)(jnp.asarray(seeds, jnp.uint32))
+    if warmup:
+        mu = jnp.full(n_ensemble, warmup_moves.mu)
+    elif mu is not None:
+        mu = jnp.asarray(mu, float)
+    else:
+        mu = jnp.full(n_ensemble, sampling_moves.mu)
+    state = shard(_EnsembleState(coords, log_prob, blobs, keys, mu))
+
+    warmup_step = jax.vmap(get_step_fn(log_prob_fn, warmup_moves, tune))
+    sampling_step = jax.vmap(get_step_fn(log_prob_fn, sampling_moves, False))
+
+    @jax.jit
+    def run_warmup(state, n):
+        return lax.fori_loop(0, n, lambda _, s: warmup_step(s), state)
+
+    @partial(jax.jit, donate_argnums=1)
+    def run_sampling(state, samples, start, stop):
+        def body(i, carry):
+            state, samples = carry
+            state = lax.fori_loop(
+                0, thinning, lambda _, s: sampling_step(s), state
+            )
+            samples = [
+                lax.dynamic_update_index_in_dim(x, b, i, 1)
+                for x, b in zip(samples, state.blobs, strict=True)
+            ]
+            return state, samples
+
+        return lax.fori_loop(start, stop, body, (state, samples))
+
+    samples = shard(
+        [jnp.empty((n_ensemble, steps) + b.shape[1:], b.dtype) for b in blobs]
+    )
+    # run in blocks of steps to update the progress bar
+    block = max(1, -(-(warmup + steps) // 100))
+    with tqdm(
+        total=warmup + steps, desc='Warm-up', disable=not progress
+    ) as pbar:
+        for start in range(0, warmup, block):
+            n = min(block, warmup - start)
+            state = run_warmup(state, n)
+            jax.block_until_ready(state)
+            pbar.update(n)
+
+        # the sampling phase continues with the tuned scale factor
+        pbar.set_description('Running')
+        for start in range(0, steps, block):
+            stop = min(start + block, steps)
+            state, samples = run_sampling(state, samples, start, stop)
+            jax.block_until_ready(state)
+            pbar.update(stop - start)
+
+    return (
+        jax.device_get(samples),
+        np.asarray(state.coords),
+        np.asarray(state.mu),
+    )
@@ -20,6 +20,9 @@ if TYPE_CHECKING:
 
 
 class ZeusSampler(EnsembleSampler):
+    _default_move = 'slice'
+    _default_tune = True
+
     def get_sampling_fn(
         self,
         chains: int,
@@ -100,6 +103,12 @@ class ZeusSampler(EnsembleSampler):
     def get_random_state(self, seed: int) -> tuple:
         return np.random.RandomState(seed).get_state(legacy=True)
 
+    def split_random_state(self, random_state: tuple) -> tuple[int, tuple]:
+        rng = np.random.RandomState()
+        rng.set_state(random_state)
+        seed = int(rng.randint(2**32, dtype=np.uint64))
+        return seed, rng.get_state(legacy=True)
+
 
 class DifferentialMove:
     """Improved DifferentialMove of zeus for reproducibility."""
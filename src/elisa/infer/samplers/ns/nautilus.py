@@ -9,7 +9,7 @@ import multiprocess as mp
 import nautilus
 import nautilus.pool as nautilus_pool
 
-from elisa.infer.samplers.util import uniform_reparam_model
+from elisa.infer.samplers.util import batch_fn, uniform_reparam_model
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -41,15 +41,20 @@ class NautilusSampler:
             rng_seed=seed,
         )
 
-        @jax.jit
         def log_prob_fn(cube_and_derived):
             log_p = mi.log_prob_fn(mi.unravel(cube_and_derived[: mi.ndim]))
             if ignore_nan:
                 log_p = jnp.nan_to_num(log_p, nan=-1e300)
             return log_p
 
-        if 'pool' in kwargs:
-            kwargs['vectorized'] = False
+        # the likelihood is evaluated in batches on the devices, and the pool
+        # is only used for the sampler calculations
+        kwargs['vectorized'] = True
+        pool = kwargs.pop('pool', None)
+        if isinstance(pool, tuple | list):
+            pool = pool[-1]
+        if pool not in (None, 1):
+            kwargs['pool'] = (None, pool)
             old_method = mp.get_start_method()
             if old_method != 'spawn':
                 mp.set_start_method('spawn', force=True)
@@ -59,14 +64,12 @@ class NautilusSampler:
             old_pool = nautilus_pool.Pool
             nautilus_pool.Pool = mp.Pool
         else:
-            kwargs['vectorized'] = True
-            log_prob_fn = jax.jit(jax.vmap(log_prob_fn))
             old_method = ''
             old_pool = None
 
         self._sampler = nautilus.Sampler(
             prior=lambda x: x,
-            likelihood=lambda x: jax.device_get(log_prob_fn(x)),
+            likelihood=batch_fn(log_prob_fn),
             n_dim=mi.ndim,
             pass_dict=False,
             seed=seed,
@@ -9,7 +9,11 @@ import jax.numpy as jnp
 import numpy as np
 from ultranest import ReactiveNestedSampler, read_file
 
-from elisa.infer.samplers.util import ravel_params_names, uniform_reparam_model
+from elisa.infer.samplers.util import (
+    batch_fn,
+    ravel_params_names,
+    uniform_reparam_model,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -41,15 +45,13 @@ class UltraNestSampler:
             rng_seed=seed,
         )
 
-        @jax.jit
-        @jax.vmap
         def log_prob_fn(cube_and_derived):
             log_p = mi.log_prob_fn(mi.unravel(cube_and_derived[: mi.ndim]))
             if ignore_nan:
                 log_p = jnp.nan_to_num(log_p, nan=-1e300)
             return log_p
 
-        self._log_prob_fn = log_prob_fn
+        self._log_prob_fn = batch_fn(log_prob_fn)
         self._sampler = None
         self._sampler_constructor = partial(ReactiveNestedSampler, **kwargs)
         self._seed = seed
@@ -67,8 +69,6 @@ class UltraNestSampler:
         else:
             viz_sample_names = list(map(str, viz_sample_names))
 
-        @jax.jit
-        @jax.vmap
         def transform(cube):
             samples = mi.postprocess_fn(mi.unravel(cube))
             viz = jnp.hstack([samples[i].ravel() for i in viz_sample_names])
@@ -93,8 +93,8 @@ class UltraNestSampler:
             np.random.seed(self._seed)
             sampler = self._sampler = self._sampler_constructor(
                 param_names=params_names,
-                loglike=lambda x: jax.device_get(self._log_prob_fn(x)),
-                transform=lambda x: jax.device_get(transform(x)),
+                loglike=self._log_prob_fn,
+                transform=batch_fn(transform),
                 derived_param_names=derived_names,
                 vectorized=True,
             )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from functools import singledispatch
-from typing import TYPE_CHECKING, NamedTuple
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 import jax
 import jax.numpy as jnp
@@ -10,6 +10,7 @@ import numpy as np
 import numpyro
 import numpyro.distributions as dist
 from jax.flatten_util import ravel_pytree
+from jax.sharding import NamedSharding, PartitionSpec
 from numpyro.handlers import reparam, seed, trace
 from numpyro.infer.initialization import init_to_uniform
 from numpyro.infer.reparam import Reparam
@@ -328,3 +329,50 @@ def uniform_reparam_model(
 
 
 # <<< Codes above are adapted from numpyro.contrib.nested_sampling <<<
+
+
+def batch_fn(fn: Callable, min_size: int = 64) -> Callable[[NDArray], Any]:
+    """Get a function evaluating `fn` on a batch of points.
+
+    The batch is padded to a power of two no less than `min_size`, so that
+    the vectorized `fn` is compiled only once for each bucket size, and is
+    sharded across the local devices.
+
+    Parameters
+    ----------
+    fn : callable
+        The function to evaluate on a single point.
+    min_size : int, optional
+        The minimum bucket size. The default is 64.
+
+    Returns
+    -------
+    callable
+        The function taking a batch of points as a NumPy array, and returning
+        the results of `fn` as NumPy arrays.
+    """
+    vmap_fn = jax.jit(jax.vmap(fn))
+
+    ndevice = jax.local_device_count()
+    if ndevice > 1:
+        mesh = jax.make_mesh((ndevice,), ('batch',))
+        sharding = NamedSharding(mesh, PartitionSpec('batch'))
+    else:
+        sharding = None
+
+    def batched_fn(x: NDArray) -> Any:
+        x = np.asarray(x, dtype=float)
+        n = len(x)
+        if n == 0:
+            point = jax.ShapeDtypeStruct(x.shape[1:], float)
+            empty = lambda v: np.empty((0, *v.shape), v.dtype)
+            return jax.tree.map(empty, jax.eval_shape(fn, point))
+        size = max(int(min_size), 1 << (n - 1).bit_length())
+        size = -(-size // ndevice) * ndevice
+        # pad with the last point to avoid spurious NaN in the padded results
+        x = np.pad(x, [(0, size - n)] + [(0, 0)] * (x.ndim - 1), mode='edge')
+        if sharding is not None:
+            x = jax.device_put(x, sharding)
+        return jax.tree.map(lambda v: v[:n], jax.device_get(vmap_fn(x)))
+
+    return batched_fn
@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING
 
 import jax
 import jax.numpy as jnp
+import numpy as np
 
 from elisa.models.model import ConvolutionComponent, ParamConfig
 
@@ -15,13 +16,16 @@ if TYPE_CHECKING:
 
     from elisa.util.typing import ConvolveEval, JAXArray, NameValMapping
 
+    NDArray = np.ndarray
+
 __all__ = ['EnFlux', 'PhFlux', 'ZAShift', 'ZMShift', 'VAShift', 'VMShift']
 
 
 class NormConvolution(ConvolutionComponent):
     _args = ('emin', 'emax')
-    _kwargs = ('ngrid', 'elog')
+    _kwargs = ('ngrid', 'elog', 'reuse_egrid')
     _supported = frozenset({'add'})
+    _staticmethod = ('convolve', 'flux_weight')
 
     def __init__(
         self,
@@ -31,12 +35,14 @@ class NormConvolution(ConvolutionComponent):
         latex: str | None,
         ngrid: int | None,
         elog: bool | None,
+        reuse_egrid: bool | None,
     ):
         self._emin = float(emin)
         self.emax = emax
 
         self.ngrid = 1000 if ngrid is None else ngrid
         self.elog = True if elog is None else bool(elog)
+        self.reuse_egrid = True if reuse_egrid is None else bool(reuse_egrid)
 
         self._prev_config: tuple | None = None
 
@@ -72,6 +78,86 @@ class NormConvolution(ConvolutionComponent):
         """
         pass
 
+    @staticmethod
+    @abstractmethod
+    def flux_weight(egrid: NDArray) -> NDArray:
+        """Weight of model value over each energy bin in the flux.
+
+        Parameters
+        ----------
+        egrid : ndarray
+            Photon energy grid in units of keV.
+
+        Returns
+        -------
+        ndarray
+            The weight of model value over each energy bin, with which the
+            flux is the weighted sum of the model values.
+        """
+        pass
+
+    def _eval_on_egrid(self, egrid: NDArray) -> ConvolveEval:
+        """Get the convolution function calculating the flux from the fixed
+        photon energy grid.
+
+        The model values over the energy bins inside [`emin`, `emax`] are
+        reused in the flux, and the flux of the partially covered bins at the
+        band edges is integrated exactly by evaluating the model on the
+        sub-bins. If the energy grid does not cover [`emin`, `emax`], or
+        `reuse_egrid` is False, the auxiliary energy grid is used instead.
+        """
+        if not self.reuse_egrid or not (
+            egrid[0] <= self.emin and self.emax <= egrid[-1]
+        ):
+            return self.eval
+
+        emin = self.emin
+        emax = self.emax
+        flux_weight = self.flux_weight
+
+        # the energy bins of index from i0 to i1 - 1 are fully inside the band
+        i0 = int(np.searchsorted(egrid, emin, side='left'))
+        i1 = int(np.searchsorted(egrid, emax, side='right')) - 1
+        if i0 < i1:
+            weight = jnp.asarray(flux_weight(egrid[i0 : i1 + 1]))
+
+        # sub-bins at the band edges
+        if i0 > i1:  # the band is inside one energy bin
+            edge_egrid = [emin, emax]
+            edge_mask = [1.0]
+        else:
+            edge_egrid = [egrid[i0]]
+            edge_mask = []
+            if emin < egrid[i0]:
+                edge_egrid = [emin] + edge_egrid
+                edge_mask.append(1.0)
+            if emax > egrid[i1]:
+                if i1 > i0:
+                    edge_egrid.append(egrid[i1])
+                    edge_mask.append(0.0)
+                edge_egrid.append(emax)
+                edge_mask.append(1.0)
+
+        if len(edge_egrid) > 1:
+            edge_egrid = np.array(edge_egrid)
+            edge_weight = jnp.asarray(edge_mask * flux_weight(edge_egrid))
+            edge_egrid = jnp.asarray(edge_egrid)
+        else:
+            edge_egrid = None
+
+        def convolve(
+            egrid: JAXArray,
+            params: NameValMapping,
+            model_fn: Callable[[JAXArray], JAXArray],
+        ) -> JAXArray:
+            flux = model_fn(egrid)
+            mflux = weight @ flux[i0:i1] if i0 < i1 else 0.0
+            if edge_egrid is not None:
+                mflux += edge_weight @ model_fn(edge_egrid)
+            return params['F'] / mflux * flux
+
+        return jax.jit(convolve, static_argnums=2)
+
     @property
     def eval(self) -> ConvolveEval:
         if self._prev_config == (self.emin, self.emax, self.ngrid, self.elog):
@@ -90,7 +176,6 @@ class NormConvolution(ConvolutionComponent):
                 params: NameValMapping,
                 model_fn: Callable[[JAXArray], JAXArray],
             ) -> JAXArray:
-                # TODO: egrid can be reused to reduce computation
                 return fn(egrid, params, model_fn, flux_egrid)
 
             self._prev_config = (self.emin, self.emax, self.ngrid, self.elog)
@@ -140,6 +225,17 @@ class NormConvolution(ConvolutionComponent):
     def elog(self, value: bool):
         self._elog = bool(value)
 
+    @property
+    def reuse_egrid(self) -> bool:
+        """Whether to calculate the flux from the photon energy grid of data
+        when it covers [`emin`, `emax`].
+        """
+        return self._reuse_egrid
+
+    @reuse_egrid.setter
+    def reuse_egrid(self, value: bool):
+        self._reuse_egrid = bool(value)
+
 
 class PhFlux(NormConvolution):
     r"""Normalize an additive model by photon flux between `emin` and `emax`.
@@ -173,6 +269,10 @@ class PhFlux(NormConvolution):
     elog : bool, optional
         Whether to use logarithmically regular energy grids.
         The default is True.
+    reuse_egrid : bool, optional
+        Whether to calculate the flux from the photon energy grid of data
+        when fitting, if the grid covers `emin` and `emax`. The energy grid
+        of `ngrid` and `elog` is used otherwise. The default is True.
     """
 
     _config = (
@@ -181,6 +281,10 @@ class PhFlux(NormConvolution):
         ),
     )
 
+    @staticmethod
+    def flux_weight(egrid: NDArray) -> NDArray:
+        return np.ones(len(egrid) - 1)
+
     @staticmethod
     def convolve(
         egrid: JAXArray,
@@ -226,6 +330,10 @@ class EnFlux(NormConvolution):
     elog : bool, optional
         Whether to use logarithmically regular energy grids.
         The default is True.
+    reuse_egrid : bool, optional
+        Whether to calculate the flux from the photon energy grid of data
+        when fitting, if the grid covers `emin` and `emax`. The energy grid
+        of `ngrid` and `elog` is used otherwise. The default is True.
     """
 
     _config = (
@@ -240,6 +348,11 @@ class EnFlux(NormConvolution):
         ),
     )
 
+    @staticmethod
+    def flux_weight(egrid: NDArray) -> NDArray:
+        keV_to_erg = 1.602176634e-9
+        return keV_to_erg * np.sqrt(egrid[:-1] * egrid[1:])
+
     @staticmethod
     def convolve(
         egrid: JAXArray,
@@ -137,7 +137,14 @@ class Model(ABC):
         mtype = self.type
 
         return CompiledModel(
-            name, params_id, fixed_id, fn, additive_fn, mtype, model_info
+            name,
+            params_id,
+            fixed_id,
+            fn,
+            additive_fn,
+            mtype,
+            model_info,
+            self,
         )
 
     @property
@@ -146,6 +153,42 @@ class Model(ABC):
         """Get side-effect free model evaluation function."""
         pass
 
+    def _eval_on_egrid(self, egrid: NDArray) -> ModelEval:
+        """Get model evaluation function specialized to a fixed energy grid.
+
+        The returned function is only valid when evaluated on `egrid`, which
+        allows the components to precompute the quantities depending only on
+        the energy grid. By default, this is the same as :attr:`eval`.
+        """
+        return self.eval
+
+    def _eval_nodes(self, egrid: NDArray, nodes: dict[str, Callable]) -> str:
+        """Register the evaluation nodes of the model on a fixed energy grid.
+
+        Each node is keyed by the model expression of component IDs, and is
+        a function of the energy grid, component parameters and values of the
+        nodes registered before. Identical subexpressions of several models
+        are registered once, so that they are evaluated once when the models
+        are evaluated together.
+
+        Parameters
+        ----------
+        egrid : ndarray
+            Photon energy grid in units of keV.
+        nodes : dict
+            The registered nodes, which is updated in place.
+
+        Returns
+        -------
+        str
+            Key of the node of the model.
+        """
+        key = self._name
+        if key not in nodes:
+            fn = self._eval_on_egrid(egrid)
+            nodes[key] = lambda egrid, params, values: fn(egrid, params)
+        return key
+
     @property
     def name(self) -> str:
         """Model name."""
@@ -199,13 +242,24 @@ class Model(ABC):
 
         return label
 
-    def _compile_model_fn(self, model_info: ModelInfo) -> ModelCompiledFn:
-        """Get the model evaluation function."""
+    def _compile_model_fn(
+        self,
+        model_info: ModelInfo,
+        egrid: NDArray | None = None,
+    ) -> ModelCompiledFn:
+        """Get the model evaluation function.
+
+        If `egrid` is given, the function is specialized to the fixed photon
+        energy grid, see :meth:`_eval_on_egrid`.
+        """
         pid_to_value = {
             c._id: model_info.cid_to_params[c._id] for c in self._comps
         }
 
-        eval_fn = jax.jit(self.eval)
+        if egrid is None:
+            eval_fn = jax.jit(self.eval)
+        else:
+            eval_fn = jax.jit(self._eval_on_egrid(egrid))
 
         @jax.jit
         def fn(egrid: JAXArray, params: ParamIDValMapping) -> JAXArray:
@@ -317,12 +371,14 @@ class CompiledModel:
         additive_fn: AdditiveFn | None,
         mtype: Literal['add', 'mul'],
         model_info: ModelInfo,
+        model: Model | None = None,
     ):
         pname_to_pid = {model_info.name[pid]: pid for pid in params_id}
         self.name = name
         self._pname_to_pid = pname_to_pid
         self._params_name = tuple(pname_to_pid)
         self._params_id = params_id
+        self._fixed_id = fixed_id
         self._params_default = dict(model_info.default)
         self._value_sequence_to_params: Callable[
             [Sequence[JAXFloat]], ParamIDValMapping
@@ -343,8 +399,42 @@ class CompiledModel:
         self._type = mtype
         self._model_info = model_info
         self._nparam = len(pname_to_pid)
+        self._model = model
         self.__initialized = True
 
+    def at_egrid(self, egrid: ArrayLike) -> CompiledModel:
+        """Specialize the model to a fixed photon energy grid.
+
+        The quantities depending only on the energy grid, e.g., the photon
+        cross-sections of absorption models, are precomputed once, so that
+        repeated evaluations on `egrid` are faster.
+
+        Parameters
+        ----------
+        egrid : ndarray
+            Photon energy grid in units of keV.
+
+        Returns
+        -------
+        CompiledModel
+            The model specialized to `egrid`, which should then be evaluated
+            only on `egrid`.
+        """
+        if self._model is None:
+            return self
+
+        egrid = np.array(egrid, dtype=float)
+        fn = self._model._compile_model_fn(self._model_info, egrid)
+        return CompiledModel(
+            self.name,
+            self._params_id,
+            self._fixed_id,
+            fn,
+            self._additive_fn,
+            self._type,
+            self._model_info,
+        )
+
     @property
     def params_name(self) -> tuple[str, ...]:
         """Parameter names."""
@@ -1176,6 +1266,68 @@ class CompiledModel:
         super().__setattr__(key, value)
 
 
+def compile_shared_eval(
+    models: Sequence[CompiledModel],
+    egrid: ArrayLike,
+) -> Callable[[JAXArray, ParamNameValMapping], tuple[JAXArray, ...]]:
+    """Get the evaluation function of models sharing a fixed energy grid.
+
+    The models are evaluated together, and the subexpressions shared by the
+    models, e.g., components or products of components, are evaluated once.
+
+    Parameters
+    ----------
+    models : sequence of CompiledModel
+        The models compiled with the same model information.
+    egrid : ndarray
+        Photon energy grid in units of keV.
+
+    Returns
+    -------
+    callable
+        The evaluation function, which takes the energy grid and the parameter
+        mapping as input, returns the values of the models, and should be
+        evaluated only on `egrid`.
+    """
+    egrid = np.array(egrid, dtype=float)
+    model_info = models[0]._model_info
+    if (
+        len(models) == 1
+        or any(m._model is None for m in models)
+        or any(m._model_info is not model_info for m in models)
+        or model_info.integrate
+    ):
+        fns = [m.at_egrid(egrid).eval for m in models]
+
+        def eval_fn(
+            egrid: JAXArray, params: ParamNameValMapping
+        ) -> tuple[JAXArray, ...]:
+            return tuple(f(egrid, params) for f in fns)
+
+        return eval_fn
+
+    nodes = {}
+    keys = [m._model._eval_nodes(egrid, nodes) for m in models]
+    comps = {c._id for m in models for c in m._model._comps}
+    pid_to_value = {cid: model_info.cid_to_params[cid] for cid in comps}
+    to_params = [m._value_mapping_to_params for m in models]
+
+    @jax.jit
+    def fn(
+        egrid: JAXArray, params: ParamNameValMapping
+    ) -> tuple[JAXArray, ...]:
+        params_id = {}
+        for f in to_params:
+            params_id |= f(params)
+        comps_params = jax.tree.map(lambda f: f(params_id), pid_to_value)
+        values = {}
+        for key, node in nodes.items():
+            values[key] = node(egrid, comps_params, values)
+        return tuple(values[k] for k in keys)
+
+    return fn
+
+
 class UniComponentModel(Model):
     """Model defined by a single additive or multiplicative component."""
 
@@ -1187,8 +1339,13 @@ class UniComponentModel(Model):
 
     @property
     def eval(self) -> ModelEval:
+        return self._make_eval(self._component.eval)
+
+    def _eval_on_egrid(self, egrid: NDArray) -> ModelEval:
+        return self._make_eval(self._component._eval_on_egrid(egrid))
+
+    def _make_eval(self, _fn: CompEval) -> ModelEval:
         comp_id = self._component._id
-        _fn = self._component.eval
 
         def fn(egrid: JAXArray, params: CompIDParamValMapping) -> JAXArray:
             """The model evaluation function"""
@@ -1284,9 +1441,29 @@ class CompositeModel(Model):
 
     @property
     def eval(self) -> ModelEval:
+        lhs, rhs = self._operands
+        return self._make_eval(lhs.eval, rhs.eval)
+
+    def _eval_on_egrid(self, egrid: NDArray) -> ModelEval:
+        lhs, rhs = self._operands
+        return self._make_eval(
+            lhs._eval_on_egrid(egrid), rhs._eval_on_egrid(egrid)
+        )
+
+    def _eval_nodes(self, egrid: NDArray, nodes: dict[str, Callable]) -> str:
+        key = self._name
+        if key not in nodes:
+            op = self._op
+            lhs, rhs = self._operands
+            lhs_key = lhs._eval_nodes(egrid, nodes)
+            rhs_key = rhs._eval_nodes(egrid, nodes)
+            nodes[key] = lambda egrid, params, values: op(
+                values[lhs_key], values[rhs_key]
+            )
+        return key
+
+    def _make_eval(self, lhs: ModelEval, rhs: ModelEval) -> ModelEval:
         op = self._op
-        lhs = self._operands[0].eval
-        rhs = self._operands[1].eval
 
         def fn(egrid: JAXArray, params: CompIDParamValMapping) -> JAXArray:
             """The model evaluation function"""
@@ -1600,6 +1777,16 @@ class Component(ABC, metaclass=ComponentMeta):
         """Get side-effect free component evaluation function."""
         pass
 
+    def _eval_on_egrid(self, egrid: NDArray) -> CompEval:
+        """Get component evaluation function specialized to a fixed energy
+        grid.
+
+        The returned function is only valid when evaluated on `egrid`.
+        Subclasses can override this to precompute the quantities depending
+        only on the energy grid. By default, this is the same as :attr:`eval`.
+        """
+        return self.eval
+
     @property
     def name(self) -> str:
         """Component name."""
@@ -1728,8 +1915,19 @@ class NumericalIntegral(Component):
 
         return self._make_integral(self._continuum_jit)
 
-    def _make_integral(self, continuum: CompEval):
+    def _make_integral(
+        self,
+        continuum: CompEval,
+        continuum_mid: CompEval | None = None,
+    ):
+        """Make the integral function of `continuum`.
+
+        The `continuum_mid` is used to evaluate the continuum at the midpoints
+        of the energy grid in Simpson's rule, which defaults to `continuum`.
+        """
         mtype = self.type
+        if continuum_mid is None:
+            continuum_mid = continuum
 
         if self.method == 'trapz':
 
@@ -1752,7 +1950,7 @@ class NumericalIntegral(Component):
                     factor = 1.0 / 6.0
                 e_mid = 0.5 * (egrid[:-1] + egrid[1:])
                 f_grid = continuum(egrid, params)
-                f_mid = continuum(e_mid, params)
+                f_mid = continuum_mid(e_mid, params)
                 return factor * (f_grid[:-1] + 4.0 * f_mid + f_grid[1:])
 
         else:
@@ -1944,8 +2142,14 @@ class ConvolvedModel(Model):
 
     @property
     def eval(self) -> ModelEval:
+        return self._make_eval(self._op.eval)
+
+    def _eval_on_egrid(self, egrid: NDArray) -> ModelEval:
+        # the convolved model may be evaluated on other energy grids
+        return self._make_eval(self._op._eval_on_egrid(egrid))
+
+    def _make_eval(self, _fn: ConvolveEval) -> ModelEval:
         comp_id = self._op._id
-        _fn = self._op.eval
         _model_fn = self._model.eval
 
         def fn(egrid: JAXArray, params: CompIDParamValMapping) -> JAXArray:
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+import hashlib
 import warnings
 from abc import abstractmethod
+from functools import cache
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-import h5py
 import jax
 import jax.numpy as jnp
 import numpy as np
@@ -19,8 +20,12 @@ from elisa.models.model import (
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from elisa.util.typing import CompEval, JAXArray, NameValMapping
 
+    NDArray = np.ndarray
+
 __all__ = [
     'Constant',
     'Edge',
@@ -271,6 +276,11 @@ class PLAbs(AnaIntMultiplicative):
         return (f[1:] - f[:-1]) / (egrid[1:] - egrid[:-1])
 
 
+_XSECT_FILE = Path(__file__).parent / 'tables' / 'xsect.hdf5'
+_XSECT_ON_EGRID: dict[tuple, JAXArray] = {}
+_XSECT_CACHE_SIZE = 32
+
+
 def _make_interp(egrid, xsect):
     xp = np.log(egrid)
     fp = np.log(xsect)
@@ -283,20 +293,45 @@ def _make_interp(egrid, xsect):
     )
 
 
-with h5py.File(Path(__file__).parent / 'tables' / 'xsect.hdf5') as f:
-    _XSECT_INTERP = {
-        mabs: {
-            xsect: {
-                abund: _make_interp(
-                    f['energy'][:], f[f'{mabs}/{xsect}/{abund}'][:]
-                )
-                for abund in f[f'{mabs}/{xsect}'].keys()
-            }
-            for xsect in f[mabs].keys()
-        }
-        for mabs in [k for k in f.keys() if k != 'energy']
-    }
-del f
+@cache
+def _xsect_interp(
+    abs_model: str, xsect: str, abund: str
+) -> Callable[[JAXArray], JAXArray]:
+    """Get the photon cross-section interpolator.
+
+    The cross-section table is read on first use of the combination of
+    absorption model, cross-section and abundance, and then cached.
+    """
+    # h5py is imported here to avoid the cost when importing elisa
+    import h5py
+
+    with h5py.File(_XSECT_FILE) as f:
+        return _make_interp(
+            f['energy'][:], f[f'{abs_model}/{xsect}/{abund}'][:]
+        )
+
+
+def _xsect_on_egrid(
+    abs_model: str, xsect: str, abund: str, egrid: NDArray
+) -> JAXArray:
+    """Get the photon cross-section on the fixed energy grid.
+
+    The cross-section is interpolated once for each combination of absorption
+    model, cross-section, abundance and energy grid, and then cached. Only
+    the most recently used ``_XSECT_CACHE_SIZE`` entries are kept.
+    """
+    egrid = np.ascontiguousarray(egrid, dtype=float)
+    digest = hashlib.sha256(egrid.tobytes()).hexdigest()
+    key = (abs_model, xsect, abund, egrid.shape, digest)
+    if key in _XSECT_ON_EGRID:
+        # move the entry to the end, so that it is evicted last
+        sigma = _XSECT_ON_EGRID[key] = _XSECT_ON_EGRID.pop(key)
+        return sigma
+    if len(_XSECT_ON_EGRID) >= _XSECT_CACHE_SIZE:
+        _XSECT_ON_EGRID.pop(next(iter(_XSECT_ON_EGRID)))
+    interp = _xsect_interp(abs_model, xsect, abund)
+    sigma = _XSECT_ON_EGRID[key] = interp(jnp.asarray(egrid))
+    return sigma
 
 
 class PhotonAbsorption(NumIntMultiplicative):
@@ -356,6 +391,25 @@ class PhotonAbsorption(NumIntMultiplicative):
         )
         return self._make_integral(continuum)
 
+    def _eval_on_egrid(self, egrid: NDArray) -> CompEval:
+        """Get photon absorption model function with the cross-sections
+        precomputed on the fixed energy grid and its midpoints.
+        """
+        abs_model = self.__class__.__name__.lower()
+        abund = self.abund
+        xsect = self.xsect
+        sigma = _xsect_on_egrid(abs_model, xsect, abund, egrid)
+        continuum = jax.jit(lambda e, params: jnp.exp(-params['nH'] * sigma))
+        if self.method == 'simpson':
+            e_mid = 0.5 * (egrid[:-1] + egrid[1:])
+            sigma_mid = _xsect_on_egrid(abs_model, xsect, abund, e_mid)
+            continuum_mid = jax.jit(
+                lambda e, params: jnp.exp(-params['nH'] * sigma_mid)
+            )
+        else:
+            continuum_mid = None
+        return self._make_integral(continuum, continuum_mid)
+
     @staticmethod
     def continuum(
         egrid: JAXArray,
@@ -384,7 +438,7 @@ class PhotonAbsorption(NumIntMultiplicative):
         jax.Array
             The model value at `egrid`, dimensionless.
         """
-        sigma = _XSECT_INTERP[abs_model][xsect][abund](egrid)
+        sigma = _xsect_interp(abs_model, xsect, abund)(egrid)
         return jnp.exp(-params['nH'] * sigma)
 
     @property
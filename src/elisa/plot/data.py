@@ -311,8 +311,12 @@ class MLEPlotData(PlotData):
     _cached_method_with_check = _cached_method_with_check
 
     @property
-    def boot(self) -> BootstrapResult:
-        return self.result._boot
+    def boot(self) -> BootstrapResult | None:
+        boot = self.result._boot
+        # chunked bootstrap does not keep the per-channel simulations
+        if boot is None or not boot.models:
+            return None
+        return boot
 
     @property
     def params_mle(self) -> dict[str, Array]:
@@ -683,21 +687,28 @@ class PosteriorPlotData(PlotData):
 
     @property
     def ppc(self) -> PPCResult | None:
-        return self.result._ppc
+        ppc = self.result._ppc
+        # chunked ppc does not keep the per-channel simulations
+        if ppc is None or not ppc.models_fit:
+            return None
+        return ppc
 
     @_to_cached_method
     def get_model_median(self, name: str) -> Array:
+        self.result._check_pointwise()
         posterior = self.result.idata['posterior'][name]
         return posterior.median(dim=('chain', 'draw')).values
 
     @_to_cached_method
     def get_model_loo(self, name: str) -> Array:
+        self.result._check_pointwise()
         posterior = self.result.idata['posterior'][name]
         posterior = posterior.stack(__sample__=('chain', 'draw'))
         return self.result._loo_expectation(posterior, self.name).values
 
     @_to_cached_method
     def get_model_posterior(self, name: str) -> DataArray:
+        self.result._check_pointwise()
         posterior = self.result.idata['posterior'][name]
         # return shape (n_samples, n_channel)
         return posterior.stack(__sample__=('chain', 'draw')).T
@@ -822,6 +833,9 @@ class PosteriorPlotData(PlotData):
         rtype: Literal['posterior', 'loo', 'mle', 'ppc'],
     ) -> DataArray | None:
         """Median, MLE, and ppc deviance."""
+        if rtype in {'posterior', 'loo'}:
+            self.result._check_pointwise()
+
         if rtype == 'posterior':
             loglike = self.result.idata['log_likelihood'][self.name]
             return -2.0 * loglike.stack(__sample__=('chain', 'draw')).T
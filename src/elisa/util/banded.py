@@ -0,0 +1,151 @@
+"""Banded matrix representation for folding model through response."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+from scipy.sparse import csr_array
+
+if TYPE_CHECKING:
+    from scipy.sparse import sparray
+
+    from elisa.util.typing import JAXArray, NumPyArray as NDArray
+
+
+@jax.tree_util.register_pytree_node_class
+class BandedMatrix:
+    """Row-banded matrix.
+
+    The nonzero elements of each row of the matrix lie in a contiguous window
+    of columns. The rows are stored as an array of shape ``(nrows, width)``
+    padded with zeros to the maximum window width, along with the column
+    indices of each window. The matrix-vector product is then a gather and
+    a row sum, whose cost scales with ``nrows * width`` rather than
+    ``nrows * ncols``.
+
+    For a response matrix of shape ``(nphoton, nchannel)``, whose channel
+    columns collect photons from a contiguous energy range, the transpose of
+    the response matrix is row-banded, and the folded model is given by
+    ``banded @ unfold``.
+
+    Parameters
+    ----------
+    values : array_like
+        Values of each row window, of shape ``(nrows, width)``.
+    indices : array_like
+        Column indices of each row window, of shape ``(nrows, width)``.
+    shape : tuple of int
+        Shape of the matrix.
+    """
+
+    def __init__(
+        self,
+        values: JAXArray,
+        indices: JAXArray,
+        shape: tuple[int, int],
+    ):
+        self.values = values
+        self.indices = indices
+        self.shape = tuple(shape)
+
+    @classmethod
+    def from_scipy_sparse(
+        cls,
+        mat: sparray,
+        band: tuple[NDArray, int] | None = None,
+    ) -> BandedMatrix:
+        """Create a banded matrix from a :mod:`scipy.sparse` array.
+
+        Parameters
+        ----------
+        mat : sparray
+            The 2D sparse array.
+        band : tuple, optional
+            The window offsets and width returned by :meth:`band_structure`,
+            which are computed from `mat` if not provided.
+
+        Returns
+        -------
+        BandedMatrix
+            The banded matrix.
+        """
+        if band is None:
+            band = cls.band_structure(mat)
+        offsets, width = band
+        mat = csr_array(mat)
+        nrows = mat.shape[0]
+        row_idx = np.repeat(np.arange(nrows), np.diff(mat.indptr))
+        # explicit zeros may lie outside the row windows
+        nonzero = mat.data != 0
+        row_idx = row_idx[nonzero]
+        col_idx = mat.indices[nonzero] - offsets[row_idx]
+        values = np.zeros((nrows, width), dtype=mat.dtype)
+        np.add.at(values, (row_idx, col_idx), mat.data[nonzero])
+        indices = offsets[:, None] + np.arange(width)
+        return cls(
+            jnp.asarray(values, float),
+            jnp.asarray(indices, jnp.int32),
+            mat.shape,
+        )
+
+    @staticmethod
+    def band_structure(mat: sparray) -> tuple[NDArray, int]:
+        """Get the window offset of each row and the window width.
+
+        Parameters
+        ----------
+        mat : sparray
+            The 2D sparse array.
+
+        Returns
+        -------
+        offsets : ndarray
+            First column index of each row window. The windows near the right
+            edge are shifted leftwards to fit in the matrix.
+        width : int
+            The maximum width of row windows.
+        """
+        # copy to avoid modifying the input in place
+        mat = csr_array(mat, copy=True)
+        mat.eliminate_zeros()
+        nrows, ncols = mat.shape
+        nonempty = np.diff(mat.indptr) > 0
+        lo = np.zeros(nrows, dtype=np.int64)
+        hi = np.zeros(nrows, dtype=np.int64)
+        if mat.nnz:
+            starts = mat.indptr[:-1][nonempty]
+            lo[nonempty] = np.minimum.reduceat(mat.indices, starts)
+            hi[nonempty] = np.maximum.reduceat(mat.indices, starts) + 1
+        width = min(max(int(np.max(hi - lo, initial=0)), 1), ncols)
+        offsets = np.clip(lo, 0, ncols - width)
+        return offsets, width
+
+    def __matmul__(self, other: JAXArray) -> JAXArray:
+        other = jnp.asarray(other)
+        if other.ndim != 1:
+            raise ValueError(
+                'BandedMatrix only supports matrix-vector product'
+            )
+        return jnp.sum(self.values * other[self.indices], axis=1)
+
+    def todense(self) -> JAXArray:
+        """Convert to a dense array."""
+        nrows = self.shape[0]
+        rows = jnp.arange(nrows)[:, None]
+        dense = jnp.zeros(self.shape, dtype=self.values.dtype)
+        return dense.at[rows, self.indices].add(self.values)
+
+    @property
+    def width(self) -> int:
+        """Width of row windows."""
+        return self.values.shape[1]
+
+    def tree_flatten(self):
+        return (self.values, self.indices), self.shape
+
+    @classmethod
+    def tree_unflatten(cls, aux_data, children):
+        return cls(*children, aux_data)
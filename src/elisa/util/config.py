@@ -91,6 +91,42 @@ def set_cpu_cores(n: int) -> None:
     )
 
 
+def set_compilation_cache(
+    directory: str | os.PathLike | None = None,
+    min_compile_time: float = 1.0,
+) -> None:
+    """Set the directory of JAX's persistent compilation cache.
+
+    The compiled programs that take longer than `min_compile_time` to compile
+    are saved to the directory, and loaded by new processes running the same
+    programs, e.g., fitting the same model to the data of the same structure.
+
+    .. warning::
+        This utility takes effect only before compiling the programs to
+        cache.
+
+    Parameters
+    ----------
+    directory : str or path-like, optional
+        Directory of the compilation cache. If None, read from environment
+        variable ``JAX_COMPILATION_CACHE_DIR``, and disable the cache if the
+        variable is not set.
+    min_compile_time : float, optional
+        Minimum compilation time in seconds of the programs to cache. The
+        default is 1.0.
+    """
+    if directory is None:
+        directory = os.getenv('JAX_COMPILATION_CACHE_DIR') or None
+    if directory is not None:
+        directory = os.path.abspath(os.path.expanduser(directory))
+        os.makedirs(directory, exist_ok=True)
+    jax.config.update('jax_compilation_cache_dir', directory)
+    jax.config.update(
+        'jax_persistent_cache_min_compile_time_secs', float(min_compile_time)
+    )
+    jax.config.update('jax_persistent_cache_min_entry_size_bytes', 0)
+
+
 def jax_debug_nans(flag: bool):
     """Automatically detect when NaNs are produced when running JAX codes.
 
@@ -162,3 +162,31 @@ def test_set_cpu_cores_after_default_import():
     xla_flags = _get_str(payload, 'xla_flags')
     assert count == expected
     assert f'--xla_force_host_platform_device_count={expected}' in xla_flags
+
+
+def test_set_compilation_cache(tmp_path):
+    """Ensure set_compilation_cache configures the persistent cache."""
+    script = f"""\
+    import json
+
+    import jax
+
+    from elisa.util.config import set_compilation_cache
+
+    set_compilation_cache({str(tmp_path / 'cache')!r}, 0.5)
+    payload = {{
+        "directory": jax.config.jax_compilation_cache_dir,
+        "min_compile_time": (
+            jax.config.jax_persistent_cache_min_compile_time_secs
+        ),
+    }}
+    set_compilation_cache(None)
+    payload["disabled"] = jax.config.jax_compilation_cache_dir is None
+    print(json.dumps(payload))
+    """
+    payload = _run_subprocess(script)
+
+    assert _get_str(payload, 'directory') == str(tmp_path / 'cache')
+    assert payload['min_compile_time'] == 0.5
+    assert payload['disabled']
+    assert (tmp_path / 'cache').is_dir()
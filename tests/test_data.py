@@ -8,9 +8,15 @@ from jax.experimental.sparse import BCSR
 
 import elisa.data.base as data_base
 import elisa.data.ogip as ogip_mod
-from elisa.data import Data
+from elisa.data import Data, group_spectra, set_response_cache
 from elisa.data.base import ObservationData
-from elisa.data.grouping import significance_gv, significance_lima
+from elisa.data.grouping import (
+    _calc_optimal_binning,
+    group_opt,
+    group_optsig_normal,
+    significance_gv,
+    significance_lima,
+)
 from elisa.data.ogip import Response, ResponseData, Spectrum, SpectrumData
 from elisa.models import PowerLaw
 
@@ -1078,6 +1084,93 @@ def test_significance_grouping_helpers_ignore_net(
     assert called['has_source_net'] is False
 
 
+def test_optimal_grouping_meets_scale():
+    rng = np.random.default_rng(42)
+    nchan = 2048
+    fwhm = rng.uniform(1.0, 10.0, nchan)
+    counts = rng.poisson(1.0, nchan).astype(float)
+
+    # compare the optimal bin sizes with the direct summation over FWHM
+    bint = _calc_optimal_binning(fwhm, counts)
+    nr = np.empty(nchan)
+    for i in range(nchan):
+        low = max(0, int(np.round(i - 0.5 * fwhm[i])))
+        high = min(nchan, int(np.round(i + 0.5 * fwhm[i])))
+        nr[i] = 1.314 * counts[low : high + 1].sum()
+    logr = np.log(1.0 + np.sum(1.0 / fwhm))
+    b = fwhm.copy()
+    mask = nr > np.exp(2.119) / (1.0 + 0.2 * logr)
+    x = np.log(nr[mask] * (1.0 + 0.2 * logr))
+    b[mask] *= (0.08 * x + 7.0 + 1.8 / x) / (x + 5.9)
+    np.testing.assert_array_equal(bint, np.maximum(b.astype(int), 1))
+
+    flag, success = group_opt(fwhm, counts, counts, 25)
+    assert success
+    idx = np.flatnonzero(flag == 1)
+    assert np.all(np.add.reduceat(counts, idx) >= 25)
+
+    errors = np.sqrt(counts + 1.0)
+    flag, success = group_optsig_normal(fwhm, counts, counts, errors, 3.0)
+    assert success
+    idx = np.flatnonzero(flag == 1)
+    group_counts = np.add.reduceat(counts, idx)
+    group_errors = np.sqrt(np.add.reduceat(errors * errors, idx))
+    assert np.all(group_counts >= 3.0 * group_errors)
+
+
+def test_group_spectra():
+    nbins = 200
+    photon_egrid = np.geomspace(1.0, 100.0, nbins + 1)
+    response_matrix = np.eye(nbins) + 0.5 * np.eye(nbins, k=1)
+    model = PowerLaw(K=[10.0]).compile()
+    data = [
+        model.simulate(
+            photon_egrid=photon_egrid,
+            channel_emin=photon_egrid[:-1],
+            channel_emax=photon_egrid[1:],
+            response_matrix=response_matrix,
+            spec_exposure=50.0,
+            spec_poisson=True,
+            back_counts=np.full(nbins, 10),
+            back_exposure=2.0,
+            back_poisson=True,
+            seed=seed,
+        )
+        for seed in range(3)
+    ]
+    grouping = [d.grouping.copy() for d in data]
+
+    for method, scale in [('min', 1000), ('opt', None), ('optsig', 1)]:
+        grouped = group_spectra(data, method, scale)
+        assert len(grouped) == len(data)
+        # identical responses are shared between the grouped data
+        assert all(g.resp_data is grouped[0].resp_data for g in grouped)
+        for d, g, flag in zip(data, grouped, grouping, strict=True):
+            # the input data are not modified
+            np.testing.assert_array_equal(d.grouping, flag)
+            d.group(method, scale)
+            np.testing.assert_array_equal(g.grouping, d.grouping)
+            np.testing.assert_array_equal(g.spec_counts, d.spec_counts)
+            np.testing.assert_allclose(g.response_matrix, d.response_matrix)
+            d.set_grouping(flag)
+
+    # group one spectrum with a grid of scales
+    grouped = group_spectra(data[0], 'min', [500, 1000, 2000])
+    nchan = [g.channel.size for g in grouped]
+    assert nchan[0] > nchan[1] > nchan[2]
+
+    # group stacked counts with a template
+    counts = np.random.default_rng(42).poisson(5.0, (4, nbins))
+    grouped = group_spectra(data[0], 'min', 20, counts=counts)
+    assert len(grouped) == 4
+    for c, g in zip(counts, grouped, strict=True):
+        np.testing.assert_array_equal(g.spec_data.counts, c)
+        assert np.all(g.spec_counts[:-1] >= 20)
+
+    with pytest.raises(ValueError):
+        group_spectra(data, 'min', [5, 20])
+
+
 def test_preserve_grouping_recomputes_ratio():
     grouping = np.array([1, -1, 1, -1])
     data = _make_observation(
@@ -1322,3 +1415,173 @@ def test_response():
         )
     assert np.all(r1.channel == r2.channel)
     assert np.all(r1.channel_fwhm == r2.channel_fwhm)
+
+
+def _write_grouped_rmf(path, variable_length: bool) -> np.ndarray:
+    """Write a compressed RMF and return the expected dense matrix."""
+    rng = np.random.default_rng(42)
+    nrows, nchan, first_chan = 50, 40, 1
+    expected = np.zeros((nrows, nchan), dtype=np.float32)
+    n_grp = np.zeros(nrows, dtype=np.int16)
+    f_chan = np.zeros((nrows, 3), dtype=np.int16)
+    n_chan = np.zeros((nrows, 3), dtype=np.int16)
+    matrix = []
+    for i in range(nrows):
+        n = int(rng.integers(0, 4))
+        edges = np.sort(rng.choice(nchan + 1, 2 * n, replace=False))
+        values = []
+        for j, (lo, hi) in enumerate(edges.reshape(-1, 2)):
+            f_chan[i, j] = lo + first_chan
+            n_chan[i, j] = hi - lo
+            v = rng.uniform(0.1, 1.0, hi - lo).astype(np.float32)
+            expected[i, lo:hi] = v
+            values.append(v)
+        n_grp[i] = n
+        # placeholder values in unused groups must be ignored
+        f_chan[i, n:] = 7
+        n_chan[i, n:] = 5
+        matrix.append(np.hstack(values + [np.float32([9.0])]))
+
+    egrid = np.linspace(1.0, 2.0, nrows + 1)
+    if variable_length:
+        f_col = fits.Column('F_CHAN', 'PI()', array=list(f_chan))
+        n_col = fits.Column('N_CHAN', 'PI()', array=list(n_chan))
+        m_col = fits.Column('MATRIX', 'PE()', array=matrix)
+    else:
+        padded = np.zeros((nrows, nchan + 1), dtype=np.float32)
+        for i, m in enumerate(matrix):
+            padded[i, : len(m)] = m
+        f_col = fits.Column('F_CHAN', '3I', array=f_chan)
+        n_col = fits.Column('N_CHAN', '3I', array=n_chan)
+        m_col = fits.Column('MATRIX', f'{nchan + 1}E', array=padded)
+    matrix_hdu = fits.BinTableHDU.from_columns(
+        [
+            fits.Column('ENERG_LO', 'E', array=egrid[:-1]),
+            fits.Column('ENERG_HI', 'E', array=egrid[1:]),
+            fits.Column('N_GRP', 'I', array=n_grp),
+            f_col,
+            n_col,
+            m_col,
+        ],
+        name='MATRIX',
+    )
+    matrix_hdu.header['DETCHANS'] = nchan
+    matrix_hdu.header['TLMIN4'] = first_chan
+    cegrid = np.linspace(1.0, 2.0, nchan + 1)
+    ebounds_hdu = fits.BinTableHDU.from_columns(
+        [
+            fits.Column('CHANNEL', 'J', array=np.arange(nchan) + first_chan),
+            fits.Column('E_MIN', 'E', array=cegrid[:-1]),
+            fits.Column('E_MAX', 'E', array=cegrid[1:]),
+        ],
+        name='EBOUNDS',
+    )
+    fits.HDUList([fits.PrimaryHDU(), matrix_hdu, ebounds_hdu]).writeto(path)
+    return expected
+
+
+def test_response_fwhm_and_group_energy():
+    nchan = 8
+    profile = np.array([0.2, 0.6, 1.0, 0.7, 0.4])
+    matrix = np.zeros((nchan + 1, nchan))
+    for i in range(nchan):
+        for j, v in enumerate(profile, start=i - 2):
+            if 0 <= j < nchan:
+                matrix[i, j] = v
+    # the last photon bin has no response
+    egrid = np.arange(nchan + 2.0)
+    rsp = ResponseData(
+        photon_egrid=egrid,
+        channel_emin=egrid[:nchan],
+        channel_emax=egrid[1 : nchan + 1],
+        response_matrix=matrix,
+        channel=np.arange(nchan).astype(str),
+    )
+    # FWHM is doubled from one side at the edges
+    np.testing.assert_array_equal(rsp.fwhm, [4, 4, 4, 4, 4, 4, 4, 4, 1])
+
+    grouping = np.array([1, -1, -1, 1, 1, -1, 1, -1])
+    quality = np.array([1, 0, 1, 1, 1, 1, 1, 1], dtype=bool)
+    emin, emax, channel = rsp.group_energy(grouping, quality)
+    np.testing.assert_array_equal(emin, [0.0, 3.0, 4.0, 6.0])
+    np.testing.assert_array_equal(emax, [3.0, 4.0, 6.0, 8.0])
+    np.testing.assert_array_equal(channel, ['0', '1', '2', '3'])
+    _, _, channel = rsp.group_energy(grouping, quality, True)
+    np.testing.assert_array_equal(channel, ['0+2', '3', '4+5', '6+7'])
+
+
+@pytest.mark.parametrize('variable_length', [False, True])
+def test_response_grouped_matrix(tmp_path, variable_length):
+    path = str(tmp_path / 'grouped.rmf')
+    expected = _write_grouped_rmf(path, variable_length)
+    rsp = Response(path)
+    np.testing.assert_array_equal(rsp.matrix, expected)
+    assert rsp.sparse_matrix.nnz == np.count_nonzero(expected)
+
+
+def test_response_cache(tmp_path):
+    path = str(tmp_path / 'grouped.rmf')
+    expected = _write_grouped_rmf(path, variable_length=True)
+    cache = set_response_cache(tmp_path / 'cache')
+    try:
+        rsp1 = Response(path)
+        assert len(list(cache.directory.glob('*/meta.json'))) == 1
+        rsp2 = Response(path)
+        np.testing.assert_array_equal(rsp2.matrix, expected)
+        np.testing.assert_array_equal(rsp2.photon_egrid, rsp1.photon_egrid)
+        np.testing.assert_array_equal(rsp2.channel, rsp1.channel)
+        assert rsp2.channel_type == rsp1.channel_type
+        assert np.all(rsp2.channel_fwhm == rsp1.channel_fwhm)
+
+        # modifying the file invalidates the entry
+        os.utime(path, ns=(0, 0))
+        Response(path)
+        assert len(list(cache.directory.glob('*/meta.json'))) == 2
+
+        cache.invalidate(path)
+        assert not list(cache.directory.glob('*/meta.json'))
+
+        Response(path)
+        cache.clear()
+        assert cache.size == 0
+
+        # the least recently used entries are evicted when exceeding max_size
+        cache = set_response_cache(tmp_path / 'cache', max_size=1)
+        Response(path)
+        assert cache.size == 0
+    finally:
+        set_response_cache(None)
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_fixed_data_response(sparse):
+    nchan = 50
+    egrid = np.linspace(1.0, nchan + 1.0, nchan + 1)
+    matrix = np.eye(nchan) + np.eye(nchan, k=1)
+    response = ResponseData(
+        photon_egrid=egrid,
+        channel_emin=egrid[:-1],
+        channel_emax=egrid[1:],
+        response_matrix=matrix,
+        channel=np.arange(nchan).astype(str),
+        sparse=sparse,
+    )
+    spec = SpectrumData(
+        counts=np.ones(nchan),
+        errors=np.ones(nchan),
+        poisson=True,
+        exposure=1.0,
+    )
+    data = ObservationData('test', [(1.0, 41.0)], spec, response)
+    fixed = data.get_fixed_data()
+    assert fixed.response_sparse == sparse
+    if sparse:
+        assert fixed.resp_matrix.format == 'csr'
+        assert fixed.resp_matrix.nnz == np.count_nonzero(matrix[:, :40])
+    else:
+        assert isinstance(fixed.resp_matrix, np.ndarray)
+    np.testing.assert_array_equal(fixed.response_matrix, matrix[:, :40])
+    np.testing.assert_array_equal(
+        fixed.sparse_matrix.toarray(), matrix[:, :40]
+    )
+    assert not fixed.spec_counts.flags.writeable
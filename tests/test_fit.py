@@ -1,10 +1,16 @@
 import sys
 from importlib.util import find_spec
 
+import jax
+import jax.numpy as jnp
 import numpy as np
 import pytest
 
 from elisa import BayesFit, MaxLikeFit
+from elisa.infer import clear_shared_executables
+from elisa.infer.helper import _EXECUTABLES, _EXECUTABLES_SIZE
+from elisa.infer.samplers.ensemble.vectorized import DE, STRETCH, get_moves
+from elisa.infer.samplers.util import batch_fn
 from elisa.models import PowerLaw
 
 JAXNS_XFAIL_MARK = pytest.mark.xfail(
@@ -19,6 +25,7 @@ JAXNS_XFAIL_MARK = pytest.mark.xfail(
         pytest.param('minuit', id='iminuit'),
         pytest.param('lm', id='optimistix.LevenbergMarquardt'),
         pytest.param('ns', marks=JAXNS_XFAIL_MARK, id='JAXNS'),
+        pytest.param('multistart', id='multistart'),
     ],
 )
 def test_trivial_max_like_fit(simulation, method):
@@ -42,6 +49,75 @@ def test_trivial_max_like_fit(simulation, method):
     assert np.isclose(ci[1], err_analytic, rtol=5e-3, atol=0)
 
 
+def test_compiled_functions_shared_by_fits():
+    egrid = np.linspace(1.0, 100.0, 101)
+    model = PowerLaw()
+    results = []
+    for i in range(2):
+        data = (
+            PowerLaw(K=[10.0], alpha=0.0)
+            .compile()
+            .simulate(
+                photon_egrid=egrid,
+                channel_emin=egrid[:-1],
+                channel_emax=egrid[1:],
+                response_matrix=np.eye(100),
+                spec_exposure=10.0 * (i + 1),
+                spec_poisson=True,
+                seed=i,
+            )
+        )
+        results.append(MaxLikeFit(data, model).mle())
+        if i == 0:
+            n_executables = len(_EXECUTABLES)
+
+    # the second fit reuses the executables of the first fit
+    assert len(_EXECUTABLES) == n_executables
+    assert results[0].mle['PowerLaw.K'] != results[1].mle['PowerLaw.K']
+    assert len(_EXECUTABLES) <= _EXECUTABLES_SIZE
+
+    clear_shared_executables()
+    assert not _EXECUTABLES
+    assert np.isclose(
+        MaxLikeFit(data, model).mle().mle['PowerLaw.K'][0],
+        results[1].mle['PowerLaw.K'][0],
+    )
+
+
+@pytest.mark.parametrize('shared_response', [True, False])
+def test_batch_max_like_fit(shared_response):
+    egrid = np.linspace(1.0, 100.0, 101)
+    batch = []
+    for i in range(3):
+        scale = 1.0 if shared_response or i == 0 else 0.5 + 0.2 * i
+        data = (
+            PowerLaw(K=[10.0], alpha=0.0)
+            .compile()
+            .simulate(
+                photon_egrid=egrid,
+                channel_emin=egrid[:-1],
+                channel_emax=egrid[1:],
+                response_matrix=scale * np.eye(100),
+                spec_exposure=20.0 * (i + 1),
+                spec_poisson=True,
+                seed=i,
+            )
+        )
+        batch.append(data)
+
+    model = PowerLaw()
+    result = MaxLikeFit(batch[0], model).batch_mle(batch, progress=False)
+    assert np.all(result.valid)
+    for i, data in enumerate(batch):
+        single = MaxLikeFit(data, model).mle()
+        for name, (mle, err) in single.mle.items():
+            assert np.isclose(result.mle[name][i], mle, rtol=1e-3, atol=1e-4)
+            assert np.isclose(result.error[name][i], err, rtol=1e-3)
+        assert np.isclose(
+            result.deviance['total'][i], single.deviance['total']
+        )
+
+
 @pytest.mark.parametrize(
     'method, options',
     [
@@ -59,8 +135,10 @@ def test_trivial_max_like_fit(simulation, method):
         # Non-JAX backends samplers
         pytest.param('emcee', {}, id='emcee'),
         pytest.param('emcee', {'n_parallel': 1}, id='emcee_1'),
+        pytest.param('emcee', {'backend': 'jax'}, id='emcee_jax'),
         pytest.param('zeus', {'steps': 2000}, id='zeus'),
         pytest.param('zeus', {'steps': 2000, 'n_parallel': 1}, id='zeus_1'),
+        pytest.param('zeus', {'steps': 2000, 'backend': 'jax'}, id='zeus_jax'),
         # Non-JAX backends nested samplers
         pytest.param('nautilus', {}, id='Nautilus'),
         pytest.param('ultranest', {}, id='UltraNest'),
@@ -102,3 +180,131 @@ def test_trivial_bayes_fit(simulation, method, options):
 
     # check the global random state of numpy is unaffected after the fit
     assert np.allclose(np.random.rand(), test_rand)
+
+
+def test_bayes_fit_run_length(simulation):
+    fit = BayesFit(simulation, PowerLaw())
+
+    # the chains continued in blocks are the same as a single run
+    result = fit.nuts(warmup=500, steps=1000, progress=False)
+    result_blocks = fit.nuts(
+        warmup=500,
+        steps=1000,
+        progress=False,
+        ess_target=10**9,
+        block_size=300,
+    )
+    posterior = result.idata['posterior']
+    posterior_blocks = result_blocks.idata['posterior']
+    assert posterior_blocks.draw.size == 1000
+    for k, v in posterior.data_vars.items():
+        assert np.allclose(posterior_blocks[k].values, v.values)
+
+    # stop once the targets are met
+    for method, options in [
+        ('nuts', {'warmup': 500}),
+        ('emcee', {'warmup': 1000, 'backend': 'jax'}),
+    ]:
+        result = getattr(fit, method)(
+            steps=20000,
+            progress=False,
+            block_size=500,
+            ess_target=1000,
+            rhat_target=1.05,
+            **options,
+        )
+        assert result.idata['posterior'].draw.size < 20000
+        assert all(i >= 1000 for i in result.ess.values())
+        assert all(i < 1.05 for i in result.rhat.values())
+
+    # the ensemble samplers are run in blocks only with the JAX backend
+    with pytest.raises(ValueError, match="backend='jax'"):
+        fit.emcee(steps=1000, progress=False, ess_target=1000)
+
+    # the scale factor tuned during warmup is kept between blocks
+    mu = []
+    for options in [{}, {'block_size': 200, 'ess_target': 10**9}]:
+        result = fit.zeus(
+            warmup=500, steps=600, progress=False, backend='jax', **options
+        )
+        mu.append([s.mu for s in result.sampler_state])
+    assert not np.allclose(mu[0], 1.0)
+    assert np.allclose(mu[1], mu[0])
+
+
+def test_bayes_fit_warm_start(simulation):
+    fit = BayesFit(simulation, PowerLaw())
+    names = sorted(fit._helper.params_names['free'])
+    mle = MaxLikeFit(simulation, PowerLaw()).mle().mle
+
+    for method, options in [
+        ('nuts', {}),
+        ('nuts', {'dense_mass': [(names[0],)]}),
+        ('blackjax_nuts', {'dense_mass': False}),
+    ]:
+        result = getattr(fit, method)(
+            warmup=200,
+            steps=1000,
+            progress=False,
+            warm_start=True,
+            **options,
+        )
+        assert all(i > 100 for i in result.ess.values())
+        assert all(i < 1.05 for i in result.rhat.values())
+        for k, v in result.idata['posterior'].data_vars.items():
+            if k in mle:
+                assert np.abs(v.values.mean() - mle[k][0]) < 2 * mle[k][1]
+
+    # the MLE is not searched if the sampler continues from a state
+    def warm_start_from_mle(*args, **kwargs):
+        raise AssertionError('MLE searched for warm start')
+
+    state = result.sampler_state
+    fit._warm_start_from_mle = warm_start_from_mle
+    result = fit.blackjax_nuts(
+        steps=100,
+        progress=False,
+        post_warmup_state=state,
+        warm_start=True,
+        dense_mass=False,
+    )
+    assert result.idata['posterior'].draw.size == 100
+
+
+def test_batch_fn():
+    sizes = []
+
+    def fn(x):
+        sizes.append(None)  # count the traces
+        return jnp.sum(x**2), jnp.append(x, -x)
+
+    # the batches are sharded across devices
+    assert jax.local_device_count() > 1
+    batched = batch_fn(fn, min_size=16)
+    for n, ntrace in [(1, 1), (5, 1), (16, 1), (17, 2), (32, 2), (100, 3)]:
+        x = np.random.default_rng(n).uniform(size=(n, 3))
+        # the batch is padded to buckets of size 16, 32, 128
+        norm, values = batched(x)
+        assert len(sizes) == ntrace
+        assert norm.shape == (n,) and values.shape == (n, 6)
+        assert np.allclose(norm, np.sum(x**2, axis=1))
+        assert np.allclose(values, np.hstack([x, -x]))
+        assert isinstance(norm, np.ndarray)
+
+    norm, values = batched(np.ones((0, 3)))
+    assert norm.shape == (0,) and values.shape == (0, 6)
+
+
+def test_ensemble_moves():
+    emcee = pytest.importorskip('emcee')
+    moves = [
+        (emcee.moves.DEMove(sigma=0.1, gamma0=0.5), 0.8),
+        (emcee.moves.DEMove(), 0.2),
+        (emcee.moves.StretchMove(a=3.0), 1.0),
+    ]
+    moves = get_moves({'moves': moves}, 'stretch', 3)
+    assert moves.kinds == (DE, DE, STRETCH)
+    assert np.allclose(moves.params[0], (0.1, 0.5))
+    assert np.allclose(moves.params[1], (1e-5, 2.38 / np.sqrt(6.0)))
+    assert np.allclose(moves.params[2][0], 3.0)
+    assert np.allclose(moves.weights, (0.4, 0.1, 0.5))
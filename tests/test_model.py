@@ -5,7 +5,22 @@ from astropy.cosmology import Planck18
 from astropy.units import Unit
 
 from elisa import ConstantValue, ParamConfig, PyAnaInt, PyNumInt, models
-from elisa.models import PhAbs, PLPhFlux, PowerLaw, ZAShift
+from elisa.models import (
+    EnFlux,
+    PhAbs,
+    PhFlux,
+    PLPhFlux,
+    PowerLaw,
+    TBAbs,
+    ZAShift,
+)
+from elisa.models.model import compile_shared_eval, get_model_info
+from elisa.models.mul import (
+    _XSECT_CACHE_SIZE,
+    _XSECT_ON_EGRID,
+    _xsect_interp,
+    _xsect_on_egrid,
+)
 
 
 def test_name():
@@ -193,3 +208,90 @@ def test_model_eval(model, kwargs):
     values = model(**kwargs).compile().eval(egrid)
     assert not np.any(np.isnan(values))
     assert not np.any(np.isinf(values))
+
+
+def test_xsect_lazy_loading():
+    egrid = np.geomspace(0.1, 10.0, 11)
+    model = PhAbs(abund='wilm', xsect='bcmc').compile()
+    assert np.all(np.diff(model.eval(egrid, [1.0])) > 0.0)
+
+    # the cross-section table is loaded once and cached
+    interp = _xsect_interp('phabs', 'bcmc', 'wilm')
+    assert _xsect_interp('phabs', 'bcmc', 'wilm') is interp
+
+
+@pytest.mark.parametrize('method', ['trapz', 'simpson'])
+def test_absorption_at_egrid(method):
+    egrid = np.geomspace(0.3, 10.0, 101)
+    model = PhAbs(method=method) * TBAbs(method=method) * PowerLaw()
+    compiled = model.compile()
+    fixed = compiled.at_egrid(egrid)
+    params = [[0.5, 1.0, 2.0, 1.0], [2.0, 0.1, 1.5, 3.0]]
+    assert np.allclose(
+        fixed.eval(egrid, params), compiled.eval(egrid, params), rtol=1e-12
+    )
+
+    # the cross-sections are precomputed on the grid and its midpoints
+    shapes = {(k[0], k[3]) for k in _XSECT_ON_EGRID}
+    assert {('phabs', (101,)), ('tbabs', (101,))} <= shapes
+    if method == 'simpson':
+        assert {('phabs', (100,)), ('tbabs', (100,))} <= shapes
+
+
+def test_xsect_on_egrid_cache_bounded():
+    egrid = np.geomspace(0.3, 10.0, 11)
+    sigma = _xsect_on_egrid('phabs', 'vern', 'wilm', egrid)
+    for i in range(_XSECT_CACHE_SIZE + 5):
+        _xsect_on_egrid('phabs', 'vern', 'wilm', egrid * (1.0 + 1e-3 * i))
+        # the first entry is the most recently used one after each access
+        assert _xsect_on_egrid('phabs', 'vern', 'wilm', egrid) is sigma
+    assert len(_XSECT_ON_EGRID) == _XSECT_CACHE_SIZE
+
+
+@pytest.mark.parametrize('norm', [PhFlux, EnFlux])
+@pytest.mark.parametrize(
+    'egrid',
+    [
+        np.geomspace(0.5, 20.0, 1001),  # edges inside bins
+        np.geomspace(1.0, 10.0, 1001),  # edges on the grid
+        np.geomspace(2.0, 20.0, 1001),  # not covering the band
+    ],
+)
+def test_norm_convolution_at_egrid(norm, egrid):
+    model = norm(1.0, 10.0)(PowerLaw()).compile()
+    ref = norm(1.0, 10.0, ngrid=100000)(PowerLaw()).compile()
+    params = [[1.0, 2.0, 1.0], [0.5, 1.5, 3.0]]
+    assert np.allclose(
+        model.at_egrid(egrid).eval(egrid, params),
+        ref.eval(egrid, params),
+        rtol=1e-5,
+    )
+
+
+def test_phflux_at_egrid_single_bin():
+    # the band is inside one energy bin, the flux is integrated exactly
+    egrid = np.array([0.9, 10.3])
+    model = PhFlux(1.0, 10.0)(PowerLaw()).compile()
+    assert np.allclose(model.at_egrid(egrid).eval(egrid), model.eval(egrid))
+
+
+def test_compile_shared_eval():
+    egrid = np.geomspace(0.3, 10.0, 101)
+    base = TBAbs() * (PowerLaw() + models.BlackbodyRad())
+    model_list = [base, models.Constant() * base, models.Constant() * base]
+    comps = list({c._id: c for m in model_list for c in m._comps}.values())
+    cid_to_name = {c._id: f'{c.name}_{i}' for i, c in enumerate(comps)}
+    cid_to_latex = {c._id: c.latex for c in comps}
+    info = get_model_info(comps, cid_to_name, cid_to_latex)
+    compiled = [m.compile(model_info=info) for m in model_list]
+
+    # the 5 nodes of the shared subexpression base are registered once
+    nodes = {}
+    keys = [m._eval_nodes(egrid, nodes) for m in model_list]
+    assert len(nodes) == 5 + 2 + 2
+    assert keys[0] in keys[1] and keys[0] in keys[2]
+
+    params = {name: 1.5 for m in compiled for name in m.params_name}
+    values = compile_shared_eval(compiled, egrid)(egrid, params)
+    for v, m in zip(values, compiled, strict=True):
+        assert np.allclose(v, m.eval(egrid, params))
@@ -1,7 +1,10 @@
+import h5py
+import jax
 import jax.numpy as jnp
 import numpy as np
 import pytest
 
+from elisa.infer.fit import BayesFit, MaxLikeFit
 from elisa.models.add import PowerLaw
 
 
@@ -67,6 +70,128 @@ def test_mle_result(simulation, mle_result):
     result.load('mle.pkl.xz', 'lzma')
 
 
+def test_mle_boot_chunked(simulation, tmp_path):
+    result = MaxLikeFit(simulation, PowerLaw(K=[10.0], alpha=0.0)).mle()
+    result.boot(1009, seed=1)
+    boot = result._boot
+
+    # chunks are drawn from the same random stream as a single batch
+    result._boot = None
+    store = tmp_path / 'boot.h5'
+    result.boot(1009, seed=1, chunk_size=300, store=str(store))
+    boot_chunked = result._boot
+    assert boot_chunked.n_valid == boot.n_valid
+    assert not boot_chunked.models
+    assert 'point' not in boot_chunked.deviance
+    assert_allclose = np.testing.assert_allclose
+    jax.tree.map(assert_allclose, boot_chunked.params, boot.params)
+    assert_allclose(boot_chunked.deviance['total'], boot.deviance['total'])
+    jax.tree.map(assert_allclose, boot_chunked.p_value, boot.p_value)
+
+    # the store holds the full result of all fits
+    with h5py.File(store) as f:
+        valid = f['valid'][:]
+        assert len(valid) == boot.n
+        dev = f['deviance/point'][simulation.name][:][valid]
+        models = f['models'][simulation.name][:][valid]
+    assert np.allclose(dev, boot.deviance['point'][simulation.name])
+    assert np.allclose(models, boot.models[simulation.name])
+
+    # plots fall back to the MLE when per-channel simulations are absent
+    result.plot('data rd gof')
+
+
+def test_mle_boot_resume(simulation, tmp_path):
+    result = MaxLikeFit(simulation, PowerLaw(K=[10.0], alpha=0.0)).mle()
+    result.boot(1009, seed=1)
+    boot = result._boot
+
+    # a run interrupted after 600 fits, with a partially written chunk
+    store = str(tmp_path / 'boot.h5')
+    result.boot(600, seed=1, chunk_size=300, store=store)
+    with h5py.File(store, 'a') as f:
+        f['valid'].resize(605, axis=0)
+
+    # resume and extend the run to the same result of a single run
+    result.boot(1009, seed=1, chunk_size=300, store=store)
+    boot_resumed = result._boot
+    assert boot_resumed.n_valid == boot.n_valid
+    assert_allclose = np.testing.assert_allclose
+    jax.tree.map(assert_allclose, boot_resumed.params, boot.params)
+    jax.tree.map(assert_allclose, boot_resumed.p_value, boot.p_value)
+    with h5py.File(store) as f:
+        assert f.attrs['n'] == len(f['valid']) == boot.n
+
+    # a smaller run reuses the leading fits in the store
+    result.boot(400, seed=1, chunk_size=300, store=store)
+    k = result._boot.n_valid
+    for name, v in result._boot.params.items():
+        assert_allclose(v, boot.params[name][:k])
+
+    # the store cannot be resumed with a different seed
+    with pytest.raises(ValueError):
+        result.boot(1009, seed=2, chunk_size=300, store=store)
+
+    # a run interrupted within the first chunk starts afresh
+    store = str(tmp_path / 'boot_first.h5')
+    result.boot(300, seed=1, chunk_size=300, store=store)
+    with h5py.File(store, 'a') as f:
+        del f['params_rep']
+        f.attrs['n'] = 0
+    result.boot(1009, seed=1, chunk_size=300, store=store)
+    assert result._boot.n_valid == boot.n_valid
+    jax.tree.map(assert_allclose, result._boot.params, boot.params)
+
+
+def test_mle_boot_adaptive(mle_result):
+    result = mle_result
+    result.boot(10000, seed=1, p_tol=0.02, chunk_size=200)
+    boot = result._boot
+
+    # stop early once the p-value error is within tolerance
+    assert boot.n < 10000
+    assert boot.p_value_error['total'] < 0.02
+    assert set(boot.ci_error) == {'PowerLaw.K'}
+    assert all(i > 0.05 for i in result.gof.values())
+
+    # also require the precision of interval endpoints
+    result.boot(10000, seed=1, p_tol=0.02, ci_tol=0.05, chunk_size=200)
+    assert result._boot.n >= boot.n
+    assert result._boot.ci_error['PowerLaw.K'] < 0.05
+
+
+def test_mle_boot_adaptive_invalid_fits(mle_result, monkeypatch):
+    result = mle_result
+    helper = result._helper
+    simulate_and_fit = helper.simulate_and_fit
+
+    def fail(r):
+        # mark every 10th fit as failed, with a parameter far from others
+        r = dict(r, valid=r['valid'].copy(), params=dict(r['params']))
+        r['valid'][::10] = False
+        for k, v in r['params'].items():
+            r['params'][k] = v.copy()
+            r['params'][k][::10] = 1e10
+        return r
+
+    def simulate_and_fit_with_failures(*args):
+        *args, stop_fn = args
+        r = simulate_and_fit(*args, lambda r: stop_fn(fail(r)))
+        return fail(r)
+
+    monkeypatch.setattr(
+        result,
+        '_helper',
+        helper._replace(simulate_and_fit=simulate_and_fit_with_failures),
+    )
+    result.boot(10000, seed=1, ci_tol=0.05, chunk_size=200)
+    boot = result._boot
+    assert boot.n < 10000
+    assert boot.n_valid <= boot.n - len(range(0, boot.n, 10))
+    assert boot.ci_error['PowerLaw.K'] < 0.05
+    assert np.all(boot.params['PowerLaw.K'] < 1e10)
+
+
 @pytest.mark.parametrize(
     'method, rtol',
     [
@@ -136,6 +261,52 @@ def test_mle_ci_fn(mle_result2, powerlaw_flux):
     assert np.allclose(ci2.errors['fn'], ci3.errors['fn'])
 
 
+def test_mle_ci_profile(mle_result2, powerlaw_flux):
+    result = mle_result2
+    fn = lambda params: powerlaw_flux(
+        params['PowerLaw.alpha'], params['PowerLaw.K'], 1.0, 10.0
+    )
+
+    ci1 = result.ci(fn={'fn': fn}, parallel=False)
+    ci2 = result.ci(fn={'fn': fn}, parallel=True)
+    ci3 = result.ci(fn={'fn': fn}, method='profile_batch')
+    assert ci3.method == 'profile_batch'
+    for k, v in ci1.errors.items():
+        assert np.allclose(v, ci2.errors[k], rtol=1e-3, atol=0.0)
+        # Minos of fn is slightly biased by the penalty in the joint loss
+        assert np.allclose(v, ci3.errors[k], rtol=1e-2, atol=0.0)
+        assert all(ci3.status[k]['valid'])
+
+
+def test_mle_profile_contour(mle_result2):
+    result = mle_result2
+    ci = result.ci(params=['PowerLaw.alpha', 'PowerLaw.K'])
+    alpha_mle, alpha_err = result.mle['PowerLaw.alpha']
+    K_mle, K_err = result.mle['PowerLaw.K']
+
+    alpha_grid = alpha_mle + np.linspace(-2.0, 2.0, 201) * alpha_err
+    profile = result.profile('PowerLaw.alpha', alpha_grid)
+    assert np.allclose(profile.params['PowerLaw.alpha'], alpha_grid)
+    assert np.nanmin(profile.delta) > -1e-3
+    lower = np.interp(1.0, profile.delta[:100][::-1], alpha_grid[:100][::-1])
+    upper = np.interp(1.0, profile.delta[100:], alpha_grid[100:])
+    interval = ci.intervals['PowerLaw.alpha']
+    atol = 1e-2 * alpha_err
+    assert np.allclose((lower, upper), interval, rtol=0.0, atol=atol)
+
+    K_grid = K_mle + np.linspace(-3.0, 3.0, 31) * K_err
+    contour = result.contour(
+        'PowerLaw.alpha', 'PowerLaw.K', alpha_grid[::10], K_grid, cl=1
+    )
+    assert contour.delta.shape == (21, 31)
+    assert np.allclose(contour.levels, 2.2957489)
+    # the 1-sigma contour is closed and within the 2D confidence region
+    (line,) = contour.contours[contour.cl[0]]
+    assert np.allclose(line[0], line[-1])
+    assert np.all(np.abs(line[:, 0] - alpha_mle) < 2.0 * alpha_err)
+    assert np.all(np.abs(line[:, 1] - K_mle) < 2.0 * K_err)
+
+
 def test_mle_flux(mle_result2, powerlaw_fn, powerlaw_flux):
     result = mle_result2
     result.boot(4000)
@@ -287,6 +458,52 @@ def test_posterior_result(simulation, posterior_result):
     plotter.plot_qq('rq', detrend=False)
 
 
+def test_posterior_stream(simulation, tmp_path):
+    fit = BayesFit(simulation, PowerLaw(K=[10.0]))
+    result = fit.nuts(warmup=500, steps=1000, progress=False)
+
+    # the blocks continue the chains as a single run
+    store = str(tmp_path / 'posterior.h5')
+    name = simulation.name
+    result_stream = fit.nuts(
+        warmup=500,
+        steps=1000,
+        progress=False,
+        store=store,
+        sites=[f'{name}_Non_model', f'{name}_loglike'],
+        sites_thinning=7,
+        block_size=300,
+    )
+    idata = result.idata
+    idata_stream = result_stream.idata
+    for group in ['posterior', 'log_likelihood', 'sample_stats']:
+        ds = idata_stream[group]
+        for k, v in ds.data_vars.items():
+            assert np.allclose(v.values, idata[group][k].values)
+    assert result_stream.ess == result.ess
+    assert result_stream.deviance == result.deviance
+
+    # the deterministic sites are recorded for every 7 draws
+    det = idata_stream['deterministic']
+    assert np.all(det['draw'].values == np.arange(0, 1000, 7))
+    model = idata['posterior'][f'{name}_Non_model'].values[:, ::7]
+    assert np.allclose(det[f'{name}_Non_model'].values, model)
+
+    # point-wise quantities are not available
+    result_stream.summary()
+    with pytest.raises(RuntimeError):
+        _ = result_stream.loo
+
+    # posterior predictive check uses models given by posterior parameters
+    result.ppc(1009, seed=1, progress=False)
+    result_stream.ppc(1009, seed=1, progress=False)
+    assert result_stream.gof == result.gof
+    result_stream.plot('corner trace')
+
+    with pytest.raises(ValueError):
+        fit.nuts(warmup=0, steps=10, store=store, sites=['foo'])
+
+
 def test_posterior_covar(
     posterior_result, mle_result2_covar, powerlaw_fn, powerlaw_flux
 ):
@@ -1,8 +1,13 @@
+import jax
+import jax.numpy as jnp
 import numpy as np
 import pytest
+from scipy.sparse import csr_array
 
 from elisa import MaxLikeFit
+from elisa.infer.likelihood import _resp_matrix_format
 from elisa.models import PowerLaw
+from elisa.util.banded import BandedMatrix
 
 
 def _simulate_data(stat: str):
@@ -222,3 +227,48 @@ def test_cstat_is_invalid_with_background():
     data = _simulate_data('wstat')
     with pytest.raises(ValueError):
         MaxLikeFit(data, PowerLaw(alpha=0.0), stat='cstat')
+
+
+@pytest.mark.parametrize('width', [1, 5, 40])
+def test_banded_matrix_folding(width: int):
+    rng = np.random.default_rng(42)
+    nrows, ncols = 30, 40
+    dense = np.zeros((nrows, ncols))
+    for i in range(nrows):
+        start = min(i, ncols - width)
+        dense[i, start : start + width] = rng.uniform(size=width)
+    banded = BandedMatrix.from_scipy_sparse(csr_array(dense))
+    assert banded.width == width
+    assert np.allclose(banded.todense(), dense)
+
+    x = jnp.asarray(rng.uniform(size=ncols))
+    assert np.allclose(jax.jit(lambda m, x: m @ x)(banded, x), dense @ x)
+
+    def loss(m, x):
+        return jnp.sum(jnp.log(m @ x + 1.0))
+
+    grad = jax.grad(loss, argnums=1)
+    assert np.allclose(grad(banded, x), grad(jnp.asarray(dense), x))
+
+
+def test_banded_matrix_input_unchanged():
+    # the explicit zeros of the input are kept
+    mat = csr_array(
+        (np.array([1.0, 0.0, 2.0]), np.array([0, 2, 1]), np.array([0, 2, 3])),
+        shape=(2, 3),
+    )
+    offsets, width = BandedMatrix.band_structure(mat)
+    assert width == 1 and np.array_equal(offsets, [0, 1])
+    assert mat.nnz == 3 and np.array_equal(mat.indices, [0, 2, 1])
+    banded = BandedMatrix.from_scipy_sparse(mat, (offsets, width))
+    assert np.allclose(banded.todense(), mat.toarray())
+
+
+def test_resp_matrix_format():
+    assert _resp_matrix_format(np.eye(100)) == 'banded'
+    assert _resp_matrix_format(np.ones((100, 50))) == 'dense'
+    assert _resp_matrix_format(csr_array(np.ones((100, 50))), True) != 'dense'
+    scattered = np.zeros((100, 100))
+    scattered[np.arange(100), (np.arange(100) * 37) % 100] = 1.0
+    scattered[:, 0] = 1.0
+    assert _resp_matrix_format(scattered) == 'bcsr'